@@ -522,23 +522,23 @@ void mmNewAcctDialog::OnOk(wxCommandEvent& /*event*/)
 
     if (this->m_account)
     {
-        const Model_Checking::Data_Set all_trans_check1 = Model_Checking::instance().find(DB_Table_CHECKINGACCOUNT_V1::TRANSDATE(openingDate, LESS)
+        const int64 all_trans_check1 = Model_Checking::instance().count(DB_Table_CHECKINGACCOUNT_V1::TRANSDATE(openingDate, LESS)
                                                                             ,DB_Table_CHECKINGACCOUNT_V1::ACCOUNTID(m_account->ACCOUNTID, EQUAL));
-        const Model_Checking::Data_Set all_trans_check2 = Model_Checking::instance().find(DB_Table_CHECKINGACCOUNT_V1::TRANSDATE(openingDate, LESS)
+        const int64 all_trans_check2 = Model_Checking::instance().count(DB_Table_CHECKINGACCOUNT_V1::TRANSDATE(openingDate, LESS)
                                                                             ,DB_Table_CHECKINGACCOUNT_V1::TOACCOUNTID(m_account->ACCOUNTID, EQUAL));
-        if (!all_trans_check1.empty() || !all_trans_check2.empty())
+        if (all_trans_check1 > 0 || all_trans_check2 > 0)
             return mmErrorDialogs::ToolTip4Object(m_initdate_ctrl, _t("Transactions for this account already exist before this date"), _t("Invalid Date"));
         
-        const Model_Stock::Data_Set all_trans_stock = Model_Stock::instance().find(DB_Table_STOCK_V1::PURCHASEDATE(openingDate, LESS)
+        const int64 all_trans_stock = Model_Stock::instance().count(DB_Table_STOCK_V1::PURCHASEDATE(openingDate, LESS)
                                                    ,DB_Table_STOCK_V1::HELDAT(m_account->ACCOUNTID, EQUAL));
-        if (!all_trans_stock.empty())
+        if (all_trans_stock > 0)
             return mmErrorDialogs::ToolTip4Object(m_initdate_ctrl, _t("Stock purchases for this account already exist before this date"), _t("Invalid Date"));
         
-        const Model_Billsdeposits::Data_Set all_trans_bd1 = Model_Billsdeposits::instance().find(DB_Table_BILLSDEPOSITS_V1::TRANSDATE(openingDate, LESS)
+        const int64 all_trans_bd1 = Model_Billsdeposits::instance().count(DB_Table_BILLSDEPOSITS_V1::TRANSDATE(openingDate, LESS)
                                                    ,DB_Table_BILLSDEPOSITS_V1::ACCOUNTID(m_account->ACCOUNTID, EQUAL));
-        const Model_Billsdeposits::Data_Set all_trans_bd2 = Model_Billsdeposits::instance().find(DB_Table_BILLSDEPOSITS_V1::TRANSDATE(openingDate, LESS)
+        const int64 all_trans_bd2 = Model_Billsdeposits::instance().count(DB_Table_BILLSDEPOSITS_V1::TRANSDATE(openingDate, LESS)
                                                    ,DB_Table_BILLSDEPOSITS_V1::TOACCOUNTID(m_account->ACCOUNTID, EQUAL));
-        if (!all_trans_bd1.empty() || !all_trans_bd2.empty())
+        if (all_trans_bd1 > 0 || all_trans_bd2 > 0)
             return mmErrorDialogs::ToolTip4Object(m_initdate_ctrl, _t("Scheduled transactions for this account are scheduled before this date."), _t("Invalid Date"));
     } else
         this->m_account = Model_Account::instance().create();
@@ -1,7 +1,7 @@
 // -*- C++ -*-
 //=============================================================================
 /**
- *      Copyright: (c) 2013 - 2025 Guan Lisheng (guanlisheng@gmail.com)
+ *      Copyright: (c) 2013 - 2026 Guan Lisheng (guanlisheng@gmail.com)
  *      Copyright: (c) 2017 - 2018 Stefano Giorgio (stef145g)
  *      Copyright: (c) 2022 Mark Whalley (mark@ipx.co.uk)
  *
@@ -12,7 +12,7 @@
  *      @brief
  *
  *      Revision History:
- *          AUTO GENERATED at 2025-05-08 09:16:56.228434.
+ *          AUTO GENERATED from tables_v1.sql.
  *          DO NOT EDIT!
  */
 //=============================================================================
@@ -20,12 +20,30 @@
 
 #include <vector>
 #include <map>
+#include <unordered_map>
+#include <unordered_set>
+#include <tuple>
+#include <memory>
+#include <array>
+#include <utility>
 #include <random>
 #include <algorithm>
 #include <functional>
 #include <cwchar>
+#include <cstdint>
+#include <chrono>
+#include <mutex>
+#include <atomic>
+#include <condition_variable>
+#include <typeindex>
 #include <wx/wxsqlite3.h>
 #include <wx/intl.h>
+#include <wx/file.h>
+#if __has_include(<sqlite3mc_amalgamation.h>)
+#include <sqlite3mc_amalgamation.h>
+#elif __has_include(<sqlite3.h>)
+#include <sqlite3.h>
+#endif
 
 #include "rapidjson/document.h"
 #include "rapidjson/pointer.h"
@@ -44,24 +62,580 @@ enum OP { EQUAL = 0, GREATER, LESS, GREATER_OR_EQUAL, LESS_OR_EQUAL, NOT_EQUAL }
 template<class V>
 struct DB_Column
 {
+    typedef V value_type;
     V v_;
     OP op_;
     DB_Column(const V& v, OP op = EQUAL): v_(v), op_(op)
     {}
 };
 
-static int64 ticks_last_ = 0;
-    
+/**
+* Ordering and paging for the generated find_page(): sorted by col_, at most limit_ records (-1 for all)
+* skipping offset_ records, or with after_ set, the records following that one (keyset pagination).
+* find_page() sets after_null_ when col_ is NULL in the last record it returns, so after_ is pointed
+* at that record to read the next page.
+*/
+template<class COLUMN, class DATA>
+struct DB_Page
+{
+    COLUMN col_;
+    bool asc_;
+    int limit_;
+    int offset_;
+    const DATA* after_;
+    bool after_null_;
+    DB_Page(COLUMN col = COLUMN(0), bool asc = true, int limit = -1, int offset = 0, const DATA* after = nullptr, bool after_null = false)
+        : col_(col), asc_(asc), limit_(limit), offset_(offset), after_(after), after_null_(after_null)
+    {}
+};
+
+/**
+* Slab allocator for the Data records of one table. Records are carved from slabs of SLAB
+* records and recycled through a free list, the slabs are released once no record is alive
+* (after destroy_cache() on a table whose records are all cached).
+* The pool is shared by the tables of the writer and of the DB_Reader, so it is locked.
+*/
+template<class DATA, size_t SLAB = 256>
+struct DB_Pool
+{
+    union Slot
+    {
+        Slot* next_;
+        alignas(DATA) unsigned char data_[sizeof(DATA)];
+    };
+
+    std::vector<std::unique_ptr<Slot[]>> slabs_;
+    Slot* free_ = nullptr;
+    size_t used_ = SLAB; // slots handed out from the last slab
+    size_t live_ = 0;
+    std::mutex mutex_;
+
+    /** The pool lives until the process ends, records may be deleted during static destruction */
+    static DB_Pool& instance()
+    {
+        static DB_Pool* pool = new DB_Pool();
+        return *pool;
+    }
+
+    void* allocate()
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        ++ live_;
+        if (free_)
+        {
+            Slot* slot = free_;
+            free_ = slot->next_;
+            return slot;
+        }
+        if (used_ == SLAB)
+        {
+            slabs_.emplace_back(new Slot[SLAB]);
+            used_ = 0;
+        }
+        return &slabs_.back()[used_++];
+    }
+
+    void deallocate(void* p)
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        Slot* slot = static_cast<Slot*>(p);
+        slot->next_ = free_;
+        free_ = slot;
+        if (-- live_ == 0)
+        {
+            slabs_.clear();
+            free_ = nullptr;
+            used_ = SLAB;
+        }
+    }
+
+    /** Bytes reserved by the slabs */
+    size_t capacity() const { return slabs_.size() * SLAB * sizeof(Slot); }
+};
+
+/** Bytes a string keeps on the heap, none while it fits in the string object itself */
+inline size_t db_string_heap(const wxString& s)
+{
+    static const size_t inline_capacity = wxString().capacity();
+    return s.capacity() > inline_capacity ? (s.capacity() + 1) * sizeof(wxStringCharType) : 0;
+}
+
+/** Hash for the int64 (wxLongLong) keys of the in-memory indexes */
+struct DB_Hash_Int64
+{
+    size_t operator()(const int64& v) const
+    {
+        return std::hash<wxLongLong_t>()(v.GetValue());
+    }
+};
+
+/** In-memory secondary index over the cached records of a table, kept in key order */
+template<class KEY, class DATA>
+struct DB_Index
+{
+    typedef std::multimap<KEY, DATA*> Map;
+    Map map_;
+    std::unordered_map<const DATA*, typename Map::iterator> pos_; // where each record is stored
+
+    void insert(const KEY& key, DATA* data)
+    {
+        erase(data);
+        pos_[data] = map_.emplace(key, data);
+    }
+
+    void erase(const DATA* data)
+    {
+        auto it = pos_.find(data);
+        if (it == pos_.end()) return;
+        map_.erase(it->second);
+        pos_.erase(it);
+    }
+
+    void clear()
+    {
+        map_.clear();
+        pos_.clear();
+    }
+
+    std::pair<typename Map::const_iterator, typename Map::const_iterator> equal_range(const KEY& key) const
+    {
+        return map_.equal_range(key);
+    }
+
+    size_t size() const { return map_.size(); }
+};
+
+/**
+* Date ordered values of a history table for each key (as the rates of a currency),
+* loaded a key at a time and kept up to date by the save() and remove() of the table.
+*/
+template<class KEY>
+struct DB_Series
+{
+    struct Point
+    {
+        wxString date_;
+        double value_;
+        int64 id_;
+    };
+    typedef std::vector<Point> Points;
+
+    std::map<KEY, Points> series_;
+    std::unordered_map<int64, KEY, DB_Hash_Int64> key_; // key of each loaded id
+
+    /** The points of the key, nullptr until load() */
+    const Points* find(const KEY& key) const
+    {
+        auto it = series_.find(key);
+        return it == series_.end() ? nullptr : &it->second;
+    }
+
+    /** Start the empty series of the key, to be filled by add() in date order */
+    Points& load(const KEY& key)
+    {
+        Points& points = series_[key];
+        points.clear();
+        return points;
+    }
+
+    void add(Points& points, const KEY& key, const wxString& date, double value, int64 id)
+    {
+        points.push_back({date, value, id});
+        key_[id] = key;
+    }
+
+    /** Move the saved record to its place, in the series of its key when that one is loaded */
+    void update(const KEY& key, const wxString& date, double value, int64 id)
+    {
+        erase(id);
+        auto it = series_.find(key);
+        if (it == series_.end()) return;
+        Points& points = it->second;
+        auto pos = std::upper_bound(points.begin(), points.end(), date,
+            [](const wxString& d, const Point& p) { return d < p.date_; });
+        points.insert(pos, {date, value, id});
+        key_[id] = key;
+    }
+
+    void erase(int64 id)
+    {
+        auto it = key_.find(id);
+        if (it == key_.end()) return;
+        auto series = series_.find(it->second);
+        if (series != series_.end())
+        {
+            Points& points = series->second;
+            points.erase(std::remove_if(points.begin(), points.end(),
+                [id](const Point& p) { return p.id_ == id; }), points.end());
+        }
+        key_.erase(it);
+    }
+
+    void clear()
+    {
+        series_.clear();
+        key_.clear();
+    }
+
+    /** Number of points dated on or before date, the point on or before date is the one before them */
+    static size_t upper(const Points& points, const wxString& date)
+    {
+        return std::upper_bound(points.begin(), points.end(), date,
+            [](const wxString& d, const Point& p) { return d < p.date_; }) - points.begin();
+    }
+
+    /** upper() of each of the dates, in one pass over the points once the dates are sorted */
+    static std::vector<size_t> upper(const Points& points, const std::vector<wxString>& dates)
+    {
+        std::vector<size_t> order(dates.size());
+        for (size_t i = 0; i < order.size(); ++ i) order[i] = i;
+        std::sort(order.begin(), order.end(), [&dates](size_t a, size_t b) { return dates[a] < dates[b]; });
+
+        std::vector<size_t> result(dates.size());
+        size_t n = 0;
+        for (const auto i : order)
+        {
+            while (n < points.size() && !(dates[i] < points[n].date_)) ++ n;
+            result[i] = n;
+        }
+        return result;
+    }
+
+    /** The point dated on or before date, nullptr when the series starts later */
+    static const Point* on_or_before(const Points& points, const wxString& date)
+    {
+        size_t n = upper(points, date);
+        return n > 0 ? &points[n - 1] : nullptr;
+    }
+
+    size_t memory_usage() const
+    {
+        size_t bytes = key_.size() * (sizeof(int64) + sizeof(KEY) + 2 * sizeof(void*));
+        for (const auto& [key, points] : series_)
+        {
+            bytes += sizeof(KEY) + 4 * sizeof(void*) + points.capacity() * sizeof(Point);
+            for (const auto& p : points)
+                bytes += db_string_heap(p.date_);
+        }
+        return bytes;
+    }
+};
+
+/** Resets a cached statement when leaving scope, so it holds no read lock between calls */
+struct DB_Statement_Reset
+{
+    wxSQLite3Statement& stmt_;
+    explicit DB_Statement_Reset(wxSQLite3Statement& stmt): stmt_(stmt) {}
+    ~DB_Statement_Reset()
+    {
+        try { stmt_.Reset(); } catch (const wxSQLite3Exception&) {}
+    }
+};
+
+/** Operations of the generated tables timed by DB_Op_Timer */
+enum DB_OP { DB_OP_GET = 0, DB_OP_FIND, DB_OP_ALL, DB_OP_SAVE, DB_OP_REMOVE, DB_OP_ENSURE, DB_OP_SELECT, DB_OP_size };
+
+inline const char* db_op_name(int op)
+{
+    static const char* names[DB_OP_size] = { "get", "find_by", "all", "save", "remove", "ensure", "select" };
+    return names[op];
+}
+
+/** Calls, rows and wall time of one operation, with a histogram of the latencies */
+struct DB_Op_Stats
+{
+    /** Bucket i counts the calls faster than 2^i microseconds, the last bucket all the slower ones */
+    static const size_t BUCKETS = 24;
+
+    size_t calls_ = 0;
+    size_t rows_returned_ = 0; // records handed to the caller
+    size_t rows_decoded_ = 0; // records built from a result set row
+    long long total_ns_ = 0;
+    long long max_ns_ = 0;
+    std::array<size_t, BUCKETS> histogram_ = {};
+
+    void add(long long ns, size_t returned, size_t decoded)
+    {
+        ++ calls_;
+        rows_returned_ += returned;
+        rows_decoded_ += decoded;
+        total_ns_ += ns;
+        if (ns > max_ns_) max_ns_ = ns;
+        size_t bucket = 0;
+        while (bucket < BUCKETS - 1 && (1000LL << bucket) <= ns) ++ bucket;
+        ++ histogram_[bucket];
+    }
+
+    template<typename W>
+    void as_json(W& json_writer) const
+    {
+        json_writer.StartObject();
+        json_writer.Key("calls");
+        json_writer.Uint64(calls_);
+        json_writer.Key("rows_returned");
+        json_writer.Uint64(rows_returned_);
+        json_writer.Key("rows_decoded");
+        json_writer.Uint64(rows_decoded_);
+        json_writer.Key("total_ns");
+        json_writer.Int64(total_ns_);
+        json_writer.Key("max_ns");
+        json_writer.Int64(max_ns_);
+        json_writer.Key("histogram_us");
+        json_writer.StartArray();
+        for (const auto& count : histogram_) json_writer.Uint64(count);
+        json_writer.EndArray();
+        json_writer.EndObject();
+    }
+};
+
+/**
+* Process wide recorder of the timed operations of the tables and, attached to a connection,
+* of its SQL statement timings reported through sqlite3_trace_v2.
+* The recording is saved as JSON statistics or as a Chrome trace (chrome://tracing, Perfetto).
+*/
+struct DB_Trace
+{
+    struct Event
+    {
+        wxString name_;
+        const char* cat_;
+        long long ts_ns_, dur_ns_;
+    };
+    /** Events recorded at most, the statistics keep counting afterwards */
+    static const size_t MAX_EVENTS = 1000000;
+
+    std::atomic<bool> enabled_{false}; // read by the tables of the DB_Reader from their threads
+    std::chrono::steady_clock::time_point start_ = std::chrono::steady_clock::now();
+    std::vector<Event> events_;
+    std::map<wxString, DB_Op_Stats> sql_; // statement timings keyed by their SQL
+    std::map<void*, size_t> rows_; // rows stepped by the statements still running
+    std::mutex mutex_; // guards events_, the tables of the DB_Reader record from their threads
+
+    static DB_Trace& instance()
+    {
+        static DB_Trace trace;
+        return trace;
+    }
+
+    long long now_ns() const
+    {
+        return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now() - start_).count();
+    }
+
+    void event(const wxString& name, const char* cat, long long ts_ns, long long dur_ns)
+    {
+        if (!enabled_) return;
+        std::lock_guard<std::mutex> lock(mutex_);
+        if (events_.size() < MAX_EVENTS)
+            events_.push_back({name, cat, ts_ns, dur_ns});
+    }
+
+    /** Start recording, with the statement timings of db when sqlite3_trace_v2 is available */
+    void attach(wxSQLite3Database* db)
+    {
+        enabled_ = true;
+#ifdef SQLITE_TRACE_PROFILE
+        sqlite3_trace_v2(static_cast<sqlite3*>(db->GetDatabaseHandle()), SQLITE_TRACE_PROFILE | SQLITE_TRACE_ROW, &DB_Trace::on_trace, this);
+#else
+        wxUnusedVar(db);
+#endif
+    }
+
+    /** Stop recording, must be done before the connection is closed */
+    void detach(wxSQLite3Database* db)
+    {
+        enabled_ = false;
+        rows_.clear();
+#ifdef SQLITE_TRACE_PROFILE
+        sqlite3_trace_v2(static_cast<sqlite3*>(db->GetDatabaseHandle()), 0, nullptr, nullptr);
+#else
+        wxUnusedVar(db);
+#endif
+    }
+
+#ifdef SQLITE_TRACE_PROFILE
+    static int on_trace(unsigned type, void* ctx, void* p, void* x)
+    {
+        DB_Trace* trace = static_cast<DB_Trace*>(ctx);
+        if (type == SQLITE_TRACE_ROW)
+            ++ trace->rows_[p];
+        else if (type == SQLITE_TRACE_PROFILE)
+        {
+            const long long ns = *static_cast<sqlite3_int64*>(x);
+            const wxString sql = wxString::FromUTF8(sqlite3_sql(static_cast<sqlite3_stmt*>(p)));
+            size_t rows = 0;
+            if (auto it = trace->rows_.find(p); it != trace->rows_.end())
+            {
+                rows = it->second;
+                trace->rows_.erase(it);
+            }
+            trace->sql_[sql].add(ns, rows, rows);
+            trace->event(sql, "sql", trace->now_ns() - ns, ns);
+        }
+        return 0;
+    }
+#endif
+
+    /** Return the statement timings as a json string */
+    wxString to_json() const
+    {
+        StringBuffer json_buffer;
+        PrettyWriter<StringBuffer> json_writer(json_buffer);
+        json_writer.StartObject();
+        for (const auto& [sql, stats] : sql_)
+        {
+            json_writer.Key(sql.utf8_str());
+            stats.as_json(json_writer);
+        }
+        json_writer.EndObject();
+        return wxString::FromUTF8(json_buffer.GetString());
+    }
+
+    /** Return the events in the Chrome trace event format */
+    wxString to_chrome_trace()
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        StringBuffer json_buffer;
+        Writer<StringBuffer> json_writer(json_buffer);
+        json_writer.StartObject();
+        json_writer.Key("traceEvents");
+        json_writer.StartArray();
+        for (const auto& e : events_)
+        {
+            json_writer.StartObject();
+            json_writer.Key("name");
+            json_writer.String(e.name_.utf8_str());
+            json_writer.Key("cat");
+            json_writer.String(e.cat_);
+            json_writer.Key("ph");
+            json_writer.String("X");
+            json_writer.Key("ts");
+            json_writer.Double(e.ts_ns_ / 1000.0);
+            json_writer.Key("dur");
+            json_writer.Double(e.dur_ns_ / 1000.0);
+            json_writer.Key("pid");
+            json_writer.Int(1);
+            json_writer.Key("tid");
+            json_writer.Int(1);
+            json_writer.EndObject();
+        }
+        json_writer.EndArray();
+        json_writer.EndObject();
+        return wxString::FromUTF8(json_buffer.GetString());
+    }
+
+    static bool save(const wxString& path, const wxString& json)
+    {
+        wxFile file;
+        if (!file.Create(path, true)) return false;
+        return file.Write(json, wxConvUTF8);
+    }
+};
+
 struct DB_Table
 {
-    DB_Table(): hit_(0), miss_(0), skip_(0) {};
+    /** Number of ids bound to each IN list of get_many() */
+    static const size_t GET_MANY_CHUNK = 500;
+
+    DB_Table(): hit_(0), miss_(0), skip_(0), stmt_hit_(0), stmt_compile_(0)
+        , max_records_(0), max_bytes_(0), resident_bytes_(0), evict_(0), stmt_db_(nullptr) {};
     virtual ~DB_Table() {};
     wxString query_;
     size_t hit_, miss_, skip_;
+    size_t stmt_hit_, stmt_compile_;
+    size_t max_records_, max_bytes_; // budget of the memory table (cache), 0 for unbounded
+    size_t resident_bytes_; // estimated bytes of the records in the id index
+    size_t evict_;
+    std::array<DB_Op_Stats, DB_OP_size> op_stats_;
+    wxSQLite3Database* stmt_db_; // connection the cached statements belong to
+    std::map<wxString, wxSQLite3Statement> stmt_cache_; // prepared statements keyed by their SQL
     virtual wxString query() const { return this->query_; }
     virtual size_t num_columns() const = 0;
     virtual wxString name() const = 0;
 
+    /**
+    * Return the prepared statement for sql, compiled once per connection.
+    * A cached statement is reset, the caller binds all of its parameters again.
+    */
+    wxSQLite3Statement& statement(wxSQLite3Database* db, const wxString& sql)
+    {
+        if (db != stmt_db_)
+        {
+            finalize_statements();
+            stmt_db_ = db;
+        }
+
+        auto it = stmt_cache_.find(sql);
+        if (it != stmt_cache_.end())
+        {
+            ++ stmt_hit_;
+            it->second.Reset();
+            return it->second;
+        }
+
+        ++ stmt_compile_;
+        wxSQLite3Statement stmt = db->PrepareStatement(sql);
+        return stmt_cache_.emplace(sql, stmt).first->second;
+    }
+
+    /**
+    * Bound the memory table (cache) by record count and/or estimated bytes, 0 for unbounded.
+    * The budget is enforced on the next load from the database.
+    */
+    void cache_budget(size_t max_records, size_t max_bytes = 0)
+    {
+        max_records_ = max_records;
+        max_bytes_ = max_bytes;
+    }
+
+    bool over_budget(size_t resident) const
+    {
+        return (max_records_ > 0 && resident > max_records_) || (max_bytes_ > 0 && resident_bytes_ > max_bytes_);
+    }
+
+    /** Return " WHERE column IN (?, ...)" with GET_MANY_CHUNK parameters */
+    static wxString where_in(const wxString& column)
+    {
+        wxString where = " WHERE " + column + " IN (?";
+        for (size_t i = 1; i < GET_MANY_CHUNK; ++ i) where += ", ?";
+        return where + ")";
+    }
+
+    /**
+    * Return the FTS5 query of the records holding words starting with each word of text.
+    * The words are quoted, FTS5 operators and punctuation in text are searched as they are.
+    */
+    static wxString match_query(const wxString& text)
+    {
+        wxString query, word;
+        auto add = [&]()
+        {
+            if (word.empty()) return;
+            if (!query.empty()) query += " ";
+            query += "\"" + word + "\"*";
+            word.clear();
+        };
+        for (const auto& c : text)
+        {
+            if (wxIsspace(c)) add();
+            else if (c == '"') word += "\"\"";
+            else word += c;
+        }
+        add();
+        return query;
+    }
+
+    /** Finalize the cached statements, must be done before their connection is closed */
+    void finalize_statements()
+    {
+        for (auto& [_, stmt] : stmt_cache_)
+        {
+            try { stmt.Finalize(); } catch (const wxSQLite3Exception&) {}
+        }
+        stmt_cache_.clear();
+        stmt_db_ = nullptr;
+    }
+
     bool exists(wxSQLite3Database* db) const
     {
        return db->TableExists(this->name()); 
@@ -74,19 +648,286 @@ struct DB_Table
 
     static int64 newId()
     {
+        return newIds(1);
+    }
+
+    /**
+    * Reserve a block of count consecutive ids and return the first one.
+    * Later ids are generated from a following millisecond, so they never fall inside the block.
+    * The last millisecond used is shared by all the tables and threads of the process.
+    */
+    static int64 newIds(size_t count)
+    {
+        static std::mutex mutex;
+        static int64 ticks_last_ = 0;
+        std::lock_guard<std::mutex> lock(mutex);
         // Get the current time in milliseconds as wxLongLong/int64
         int64 ticks = wxDateTime::UNow().GetValue();
         // Ensure uniqueness from last generated value
         if (ticks <= ticks_last_)
             ticks = ticks_last_ + 1;
-        ticks_last_ = ticks;
-        // Generate a random 3-digit number (0 to 999)
-        std::random_device rd;
-        std::mt19937 gen(rd());
+        // Generate a random 3-digit number (0 to 999), the generator is seeded once
+        static std::mt19937 gen{std::random_device{}()};
         std::uniform_int_distribution<int> dist(0, 999);
         int randomSuffix = dist(gen);
         // Combine ticks and randomSuffix
-        return (ticks * 1000) + randomSuffix;
+        int64 first = (ticks * 1000) + randomSuffix;
+        ticks_last_ = (first + int64(static_cast<wxLongLong_t>(count)) - 1) / 1000;
+        return first;
+    }
+};
+
+/** Times one operation of a table, the operation counts its rows while it runs */
+struct DB_Op_Timer
+{
+    DB_Table* table_;
+    DB_OP op_;
+    size_t returned_ = 0, decoded_ = 0;
+    long long start_ns_;
+
+    DB_Op_Timer(DB_Table* table, DB_OP op): table_(table), op_(op), start_ns_(DB_Trace::instance().now_ns()) {}
+    ~DB_Op_Timer()
+    {
+        DB_Trace& trace = DB_Trace::instance();
+        const long long ns = trace.now_ns() - start_ns_;
+        table_->op_stats_[op_].add(ns, returned_, decoded_);
+        if (trace.enabled_)
+            trace.event(table_->name() + "." + db_op_name(op_), "table", start_ns_, ns);
+    }
+};
+
+/**
+* Read-only connections to the database of the writer, handed to the worker threads.
+* With the writer in WAL mode the readers neither block it nor each other; the connections are
+* opened on demand up to max_size, acquire() waits for a free one beyond.
+*/
+struct DB_Reader_Pool
+{
+    typedef std::function<wxSQLite3Database*()> Opener;
+
+    DB_Reader_Pool(const Opener& opener, size_t max_size): opener_(opener), max_size_(std::max<size_t>(max_size, 1)) {}
+    ~DB_Reader_Pool() { close(); }
+    DB_Reader_Pool(const DB_Reader_Pool&) = delete;
+    DB_Reader_Pool& operator=(const DB_Reader_Pool&) = delete;
+
+    /** Switch the journal of the writer to WAL, return false when the database does not support it (in memory) */
+    static bool enable_wal(wxSQLite3Database* writer)
+    {
+        try
+        {
+            wxSQLite3ResultSet q = writer->ExecuteQuery("PRAGMA journal_mode=WAL");
+            return q.NextRow() && q.GetAsString(0).Lower() == "wal";
+        }
+        catch(const wxSQLite3Exception &e)
+        {
+            wxLogError("DB_Reader_Pool::enable_wal: Exception %s", e.GetMessage().utf8_str());
+        }
+        return false;
+    }
+
+    /** Checkpoint and switch the journal of the writer back to DELETE, leaving a single database file */
+    static void disable_wal(wxSQLite3Database* writer)
+    {
+        try
+        {
+            // a read first, so the writer checkpoints and removes the WAL the readers may have made
+            writer->ExecuteScalar("SELECT COUNT(*) FROM sqlite_master");
+            writer->ExecuteQuery("PRAGMA journal_mode=DELETE");
+        }
+        catch(const wxSQLite3Exception &e)
+        {
+            wxLogError("DB_Reader_Pool::disable_wal: Exception %s", e.GetMessage().utf8_str());
+        }
+    }
+
+    /** Return an idle connection, opening one while below max_size, nullptr when closed or opening failed */
+    wxSQLite3Database* acquire()
+    {
+        std::unique_lock<std::mutex> lock(mutex_);
+        released_.wait(lock, [this] { return closed_ || !idle_.empty() || opened_.size() + opening_ < max_size_; });
+        if (closed_) return nullptr;
+        if (!idle_.empty())
+        {
+            wxSQLite3Database* db = idle_.back();
+            idle_.pop_back();
+            return db;
+        }
+
+        ++ opening_;
+        lock.unlock();
+        std::unique_ptr<wxSQLite3Database> db(opener_());
+        lock.lock();
+        -- opening_;
+        if (!db || closed_)
+        {
+            released_.notify_all();
+            return nullptr;
+        }
+        opened_.push_back(std::move(db));
+        return opened_.back().get();
+    }
+
+    void release(wxSQLite3Database* db)
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        idle_.push_back(db);
+        released_.notify_all();
+    }
+
+    /** Wait for the connections in use to be released and close all of them, acquire() fails from then on */
+    void close()
+    {
+        std::unique_lock<std::mutex> lock(mutex_);
+        closed_ = true;
+        released_.notify_all();
+        released_.wait(lock, [this] { return opening_ == 0 && idle_.size() == opened_.size(); });
+        for (auto& db : opened_)
+        {
+            try { db->Close(); } catch (const wxSQLite3Exception&) {}
+        }
+        opened_.clear();
+        idle_.clear();
+    }
+
+    size_t size() const { return max_size_; }
+
+private:
+    Opener opener_;
+    const size_t max_size_;
+    std::mutex mutex_;
+    std::condition_variable released_;
+    std::vector<std::unique_ptr<wxSQLite3Database>> opened_;
+    std::vector<wxSQLite3Database*> idle_;
+    size_t opening_ = 0;
+    bool closed_ = false;
+};
+
+/**
+* One snapshot of the database read through a connection of a DB_Reader_Pool, for use by a single thread.
+* The read transaction is held until the reader is destroyed, so every read sees the same committed state.
+* The shared instance() of the tables and their memory tables belong to the writer (UI) thread;
+* a reader works on tables of its own from table(), whose records live as long as the reader.
+*/
+struct DB_Reader
+{
+    explicit DB_Reader(DB_Reader_Pool& pool): pool_(pool), db_(pool.acquire())
+    {
+        if (!db_) return;
+        try
+        {
+            db_->Begin();
+            db_->ExecuteScalar("SELECT COUNT(*) FROM sqlite_master"); // the first read starts the snapshot
+        }
+        catch(const wxSQLite3Exception &e)
+        {
+            wxLogError("DB_Reader: Exception %s", e.GetMessage().utf8_str());
+            end();
+        }
+    }
+    ~DB_Reader() { end(); }
+    DB_Reader(const DB_Reader&) = delete;
+    DB_Reader& operator=(const DB_Reader&) = delete;
+
+    /** Return false when no connection could be acquired */
+    bool ok() const { return db_ != nullptr; }
+    wxSQLite3Database* db() const { return db_; }
+
+    /** Return the instance of TABLE bound to this reader, created on first use */
+    template<class TABLE>
+    TABLE& table()
+    {
+        auto& table = tables_[std::type_index(typeid(TABLE))];
+        if (!table) table.reset(new TABLE());
+        return static_cast<TABLE&>(*table);
+    }
+
+private:
+    void end()
+    {
+        tables_.clear(); // the cached statements are finalized with their tables
+        if (!db_) return;
+        try
+        {
+            if (!db_->GetAutoCommit()) db_->Rollback();
+        }
+        catch(const wxSQLite3Exception &e)
+        {
+            wxLogError("DB_Reader: Exception %s", e.GetMessage().utf8_str());
+        }
+        pool_.release(db_);
+        db_ = nullptr;
+    }
+
+    DB_Reader_Pool& pool_;
+    wxSQLite3Database* db_;
+    std::map<std::type_index, std::unique_ptr<DB_Table>> tables_;
+};
+
+/** SHA-1 of the tables_v1.sql the tables were generated from and of the statements creating their full-text indexes and balance summaries */
+static const char DB_SCHEMA_FINGERPRINT[] = "105aaa1d738f578b5252cacb38fbe7de89cda2ed";
+
+/**
+* The schema fingerprint stored in INFOTABLE_V1 as SCHEMA_FINGERPRINT.
+* A database holding the current fingerprint has all the tables and indexes of the generated code,
+* the ensure() of every table then returns at once for that connection.
+*/
+struct DB_Schema
+{
+    /** The connection found up to date by check() */
+    static wxSQLite3Database*& verified()
+    {
+        static wxSQLite3Database* db = nullptr;
+        return db;
+    }
+
+    /** Set by a failing ensure(), the fingerprint is not stored then */
+    static bool& failed()
+    {
+        static bool failed = false;
+        return failed;
+    }
+
+    /** Return true when the fingerprint stored in db is current, ensure() is skipped on db from then on */
+    static bool check(wxSQLite3Database* db)
+    {
+        verified() = nullptr;
+        failed() = false;
+        try
+        {
+            if (!db->TableExists("INFOTABLE_V1")) return false;
+            wxSQLite3Statement stmt = db->PrepareStatement("SELECT INFOVALUE FROM INFOTABLE_V1 WHERE INFONAME = 'SCHEMA_FINGERPRINT'");
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            if (q.NextRow() && q.GetString(0) == DB_SCHEMA_FINGERPRINT) verified() = db;
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("INFOTABLE_V1: Exception %s", e.GetMessage().utf8_str());
+        }
+        return verified() == db;
+    }
+
+    /** Store the fingerprint once the ensure() of every table succeeded */
+    static void stamp(wxSQLite3Database* db)
+    {
+        if (failed() || db->IsReadOnly()) return;
+        try
+        {
+            wxSQLite3Statement stmt = db->PrepareStatement("INSERT INTO INFOTABLE_V1 (INFOID, INFONAME, INFOVALUE) VALUES (?, 'SCHEMA_FINGERPRINT', ?)"
+                " ON CONFLICT(INFONAME) DO UPDATE SET INFOVALUE = excluded.INFOVALUE");
+            stmt.Bind(1, DB_Table::newId());
+            stmt.Bind(2, DB_SCHEMA_FINGERPRINT);
+            stmt.ExecuteUpdate();
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("INFOTABLE_V1: Exception %s", e.GetMessage().utf8_str());
+        }
+    }
+
+    /** Forget the connection, before it is closed */
+    static void reset()
+    {
+        verified() = nullptr;
     }
 };
 
@@ -138,14 +979,16 @@ void bind(wxSQLite3Statement& stmt, int index, const Arg1& arg1, const Args&...
 }
 
 template<typename TABLE, typename... Args>
-const typename TABLE::Data_Set find_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+typename TABLE::Data_Set find_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
 {
+    DB_Op_Timer timer(table, DB_OP_FIND);
     typename TABLE::Data_Set result;
     try
     {
         wxString query = table->query() + " WHERE ";
         condition(query, op_and, args...);
-        wxSQLite3Statement stmt = db->PrepareStatement(query);
+        wxSQLite3Statement& stmt = table->statement(db, query);
+        DB_Statement_Reset reset(stmt);
         bind(stmt, 1, args...);
 
         wxSQLite3ResultSet q = stmt.ExecuteQuery();
@@ -153,19 +996,295 @@ const typename TABLE::Data_Set find_by(TABLE* table, wxSQLite3Database* db, bool
         while(q.NextRow())
         {
             typename TABLE::Data entity(q, table);
+            ++ timer.decoded_;
             result.push_back(std::move(entity));
         }
-
-        q.Finalize();
     }
     catch(const wxSQLite3Exception &e) 
     { 
         wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
     }
  
+    timer.returned_ = result.size();
     return result;
 }
 
+/**
+* Pass the Data records matching the conditions to the visitor one at a time,
+* without building a Data_Set. The visitor returns false to stop the scan.
+*/
+template<typename TABLE, typename VISITOR, typename... Args>
+void find_by_each(TABLE* table, wxSQLite3Database* db, bool op_and, VISITOR visitor, const Args&... args)
+{
+    DB_Op_Timer timer(table, DB_OP_FIND);
+    try
+    {
+        wxString query = table->query() + " WHERE ";
+        condition(query, op_and, args...);
+        // not taken from the statement cache, the visitor may query this table again
+        wxSQLite3Statement stmt = db->PrepareStatement(query);
+        bind(stmt, 1, args...);
+
+        wxSQLite3ResultSet q = stmt.ExecuteQuery();
+
+        while(q.NextRow())
+        {
+            const typename TABLE::Data entity(q, table);
+            ++ timer.decoded_;
+            ++ timer.returned_;
+            if (!visitor(entity)) break;
+        }
+    }
+    catch(const wxSQLite3Exception &e) 
+    { 
+        wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+    }
+}
+
+inline void db_value(wxSQLite3ResultSet& q, int index, int64& v) { v = q.GetInt64(index); }
+inline void db_value(wxSQLite3ResultSet& q, int index, double& v) { v = q.GetDouble(index); }
+inline void db_value(wxSQLite3ResultSet& q, int index, wxString& v) { v = q.GetString(index); }
+
+/**
+* Partial records holding only the columns COLS, in the order given.
+* Only those columns are selected and decoded, each row is a std::tuple of their values.
+* Example: DB_Projection<TRANSID, TRANSAMOUNT>::find(table, db, true, ACCOUNTID(id))
+* produces SQL statement: SELECT TRANSID, TRANSAMOUNT FROM CHECKINGACCOUNT_V1 WHERE ACCOUNTID = ?
+*/
+template<class... COLS>
+struct DB_Projection
+{
+    typedef std::tuple<typename COLS::value_type...> Row;
+    typedef std::vector<Row> Row_Set;
+
+    template<class TABLE>
+    static wxString query(const TABLE* table)
+    {
+        wxString columns;
+        ((columns += (columns.empty() ? "" : ", ") + COLS::name()), ...);
+        return "SELECT " + columns + " FROM " + table->name() + " ";
+    }
+
+    template<size_t... I>
+    static void read(wxSQLite3ResultSet& q, Row& row, std::index_sequence<I...>)
+    {
+        (db_value(q, static_cast<int>(I), std::get<I>(row)), ...);
+    }
+
+    static Row row(wxSQLite3ResultSet& q)
+    {
+        Row row;
+        read(q, row, std::index_sequence_for<COLS...>());
+        return row;
+    }
+
+    /** Return the projection of all records of the table */
+    template<class TABLE>
+    static Row_Set all(TABLE* table, wxSQLite3Database* db)
+    {
+        DB_Op_Timer timer(table, DB_OP_SELECT);
+        Row_Set result;
+        try
+        {
+            wxSQLite3Statement& stmt = table->statement(db, query(table));
+            DB_Statement_Reset reset(stmt);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+                result.push_back(row(q));
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = timer.decoded_ = result.size();
+        return result;
+    }
+
+    /** Return the projection of the records matching the conditions */
+    template<class TABLE, typename... Args>
+    static Row_Set find(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+    {
+        DB_Op_Timer timer(table, DB_OP_SELECT);
+        Row_Set result;
+        try
+        {
+            wxString sql = query(table) + " WHERE ";
+            condition(sql, op_and, args...);
+            wxSQLite3Statement& stmt = table->statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            bind(stmt, 1, args...);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+                result.push_back(row(q));
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = timer.decoded_ = result.size();
+        return result;
+    }
+};
+
+/** Return "SELECT select FROM table [WHERE conditions] [GROUP BY group]" */
+template<typename TABLE, typename... Args>
+wxString aggregate_query(const TABLE* table, const wxString& select, const wxString& group, bool op_and, const Args&... args)
+{
+    wxString query = "SELECT " + select + " FROM " + table->name();
+    if constexpr (sizeof...(Args) > 0)
+    {
+        query += " WHERE ";
+        condition(query, op_and, args...);
+    }
+    if (!group.empty()) query += " GROUP BY " + group;
+    return query;
+}
+
+/** Return the single value of the aggregate expression over the records matching the conditions (all records without) */
+template<typename V, typename TABLE, typename... Args>
+V aggregate_by(TABLE* table, wxSQLite3Database* db, const wxString& expression, bool op_and, const Args&... args)
+{
+    DB_Op_Timer timer(table, DB_OP_SELECT);
+    V value = V();
+    try
+    {
+        wxSQLite3Statement& stmt = table->statement(db, aggregate_query(table, expression, "", op_and, args...));
+        DB_Statement_Reset reset(stmt);
+        if constexpr (sizeof...(Args) > 0)
+            bind(stmt, 1, args...);
+
+        wxSQLite3ResultSet q = stmt.ExecuteQuery();
+        if (q.NextRow())
+        {
+            db_value(q, 0, value);
+            timer.returned_ = timer.decoded_ = 1;
+        }
+    }
+    catch(const wxSQLite3Exception &e) 
+    { 
+        wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+    }
+
+    return value;
+}
+
+/** Return the number of records matching the conditions */
+template<typename TABLE, typename... Args>
+int64 count_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+{
+    return aggregate_by<int64>(table, db, "COUNT(*)", op_and, args...);
+}
+
+/** Return the sum of the column over the records matching the conditions, 0 when none */
+template<class COL, typename TABLE, typename... Args>
+double sum_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+{
+    return aggregate_by<double>(table, db, "TOTAL(" + COL::name() + ")", op_and, args...);
+}
+
+/** Return the smallest value of the column over the records matching the conditions */
+template<class COL, typename TABLE, typename... Args>
+typename COL::value_type min_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+{
+    return aggregate_by<typename COL::value_type>(table, db, "MIN(" + COL::name() + ")", op_and, args...);
+}
+
+/** Return the largest value of the column over the records matching the conditions */
+template<class COL, typename TABLE, typename... Args>
+typename COL::value_type max_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+{
+    return aggregate_by<typename COL::value_type>(table, db, "MAX(" + COL::name() + ")", op_and, args...);
+}
+
+/**
+* Aggregates per group of records sharing the values of the columns GROUPS (GROUP BY).
+* Example: DB_Group<ACCOUNTID>::sum<TRANSAMOUNT>(table, db, true, TRANSCODE("Deposit"))
+* produces SQL statement: SELECT ACCOUNTID, TOTAL(TRANSAMOUNT) FROM CHECKINGACCOUNT_V1 WHERE TRANSCODE = ? GROUP BY ACCOUNTID
+*/
+template<class... GROUPS>
+struct DB_Group
+{
+    typedef std::tuple<typename GROUPS::value_type...> Key;
+
+    static wxString columns()
+    {
+        wxString columns;
+        ((columns += (columns.empty() ? "" : ", ") + GROUPS::name()), ...);
+        return columns;
+    }
+
+    template<size_t... I>
+    static Key key(wxSQLite3ResultSet& q, std::index_sequence<I...>)
+    {
+        Key key;
+        (db_value(q, static_cast<int>(I), std::get<I>(key)), ...);
+        return key;
+    }
+
+    /** Return the number of records per group */
+    template<class TABLE, typename... Args>
+    static std::map<Key, int64> count(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+    {
+        DB_Op_Timer timer(table, DB_OP_SELECT);
+        std::map<Key, int64> result;
+        try
+        {
+            wxSQLite3Statement& stmt = table->statement(db, aggregate_query(table, columns() + ", COUNT(*)", columns(), op_and, args...));
+            DB_Statement_Reset reset(stmt);
+            if constexpr (sizeof...(Args) > 0)
+                bind(stmt, 1, args...);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+                result[key(q, std::index_sequence_for<GROUPS...>())] += q.GetInt64(sizeof...(GROUPS));
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = timer.decoded_ = result.size();
+        return result;
+    }
+
+    /** Return the sums of the columns COLS per group, in the order of COLS */
+    template<class... COLS, class TABLE, typename... Args>
+    static std::map<Key, std::array<double, sizeof...(COLS)>> sum(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+    {
+        DB_Op_Timer timer(table, DB_OP_SELECT);
+        std::map<Key, std::array<double, sizeof...(COLS)>> result;
+        try
+        {
+            wxString sums;
+            ((sums += ", TOTAL(" + COLS::name() + ")"), ...);
+            wxSQLite3Statement& stmt = table->statement(db, aggregate_query(table, columns() + sums, columns(), op_and, args...));
+            DB_Statement_Reset reset(stmt);
+            if constexpr (sizeof...(Args) > 0)
+                bind(stmt, 1, args...);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+            {
+                // keys read alike (a NULL and an empty text) add up in the same group
+                auto& total = result.emplace(key(q, std::index_sequence_for<GROUPS...>()), std::array<double, sizeof...(COLS)>()).first->second;
+                for (size_t i = 0; i < sizeof...(COLS); ++ i)
+                    total[i] += q.GetDouble(static_cast<int>(sizeof...(GROUPS) + i));
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = timer.decoded_ = result.size();
+        return result;
+    }
+};
+
 template<class DATA, typename Arg1>
 bool match(const DATA* data, const Arg1& arg1)
 {
@@ -1,7 +1,7 @@
 ﻿// -*- C++ -*-
 //=============================================================================
 /**
- *      Copyright: (c) 2013 - 2025 Guan Lisheng (guanlisheng@gmail.com)
+ *      Copyright: (c) 2013 - 2026 Guan Lisheng (guanlisheng@gmail.com)
  *      Copyright: (c) 2017 - 2018 Stefano Giorgio (stef145g)
  *      Copyright: (c) 2022 Mark Whalley (mark@ipx.co.uk)
  *
@@ -12,7 +12,7 @@
  *      @brief
  *
  *      Revision History:
- *          AUTO GENERATED at 2025-05-08 09:16:56.228434.
+ *          AUTO GENERATED from tables_v1.sql.
  *          DO NOT EDIT!
  */
 //=============================================================================
@@ -48,40 +48,62 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
     };
 
     /** A container to hold a list of Data record pointers for the table in memory*/
-    typedef std::vector<Self::Data*> Cache;
-    typedef std::map<int64, Self::Data*> Index_By_Id;
+    typedef std::unordered_set<Self::Data*> Cache;
+    typedef std::unordered_map<int64, Self::Data*, DB_Hash_Int64> Index_By_Id;
     Cache cache_;
     Index_By_Id index_by_id_;
+    std::vector<int64> clock_; // ids in index_by_id_ in load order, swept by shrink()
+    size_t clock_hand_ = 0;
+    std::vector<Self::Data*> evicted_; // out of the cache but maybe still held by callers
     Data* fake_; // in case the entity not found
+    DB_Index<std::tuple<int64, int64>, Self::Data> index_by_accountid_toaccountid_; // ACCOUNTID, TOACCOUNTID
 
     /** Destructor: clears any data records stored in memory */
     ~DB_Table_BILLSDEPOSITS_V1() 
     {
-        delete this->fake_;
         destroy_cache();
     }
      
-    /** Removes all records stored in memory (cache) for the table*/ 
+    /** Removes all records and prepared statements stored in memory (cache) for the table*/ 
     void destroy_cache()
     {
+        finalize_statements();
         std::for_each(cache_.begin(), cache_.end(), std::mem_fn(&Data::destroy));
         cache_.clear();
         index_by_id_.clear(); // no memory release since it just stores pointer and the according objects are in cache
+        clock_.clear();
+        clock_hand_ = 0;
+        resident_bytes_ = 0;
+        release_evicted();
+        index_by_accountid_toaccountid_.clear();
     }
 
     /** Creates the database table if the table does not exist*/
     bool ensure(wxSQLite3Database* db)
     {
+        DB_Op_Timer timer(this, DB_OP_ENSURE);
+        if (DB_Schema::verified() == db) return true;
+
         if (!exists(db))
         {
+            // the table and its seed data are created atomically
+            db->Savepoint("ensure");
             try
             {
                 db->ExecuteUpdate("CREATE TABLE BILLSDEPOSITS_V1(BDID integer primary key, ACCOUNTID integer NOT NULL, TOACCOUNTID integer, PAYEEID integer NOT NULL, TRANSCODE TEXT NOT NULL /* Withdrawal, Deposit, Transfer */, TRANSAMOUNT numeric NOT NULL, STATUS TEXT /* None, Reconciled, Void, Follow up, Duplicate */, TRANSACTIONNUMBER TEXT, NOTES TEXT, CATEGID integer, TRANSDATE TEXT, FOLLOWUPID integer, TOTRANSAMOUNT numeric, REPEATS integer, NEXTOCCURRENCEDATE TEXT, NUMOCCURRENCES integer, COLOR integer DEFAULT -1)");
                 this->ensure_data(db);
+                db->ReleaseSavepoint("ensure");
             }
             catch(const wxSQLite3Exception &e) 
             { 
                 wxLogError("BILLSDEPOSITS_V1: Exception %s", e.GetMessage().utf8_str());
+                try
+                {
+                    db->RollbackToSavepoint("ensure");
+                    db->ReleaseSavepoint("ensure");
+                }
+                catch(const wxSQLite3Exception &) {}
+                DB_Schema::failed() = true;
                 return false;
             }
         }
@@ -100,16 +122,15 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
         catch(const wxSQLite3Exception &e) 
         { 
             wxLogError("BILLSDEPOSITS_V1: Exception %s", e.GetMessage().utf8_str());
+            DB_Schema::failed() = true;
             return false;
         }
 
         return true;
     }
 
-    void ensure_data(wxSQLite3Database* db)
+    void ensure_data(wxSQLite3Database* /* db */)
     {
-        db->Begin();
-        db->Commit();
     }
     
     struct BDID : public DB_Column<int64>
@@ -287,6 +308,30 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
 
         return COLUMN(-1);
     }
+
+    /** Returns the column as ORDER BY term, text columns other than dates sort case-insensitive */
+    static wxString column_to_order(const COLUMN col)
+    {
+        switch(col)
+        {
+            case COL_TRANSCODE:
+            case COL_STATUS:
+            case COL_TRANSACTIONNUMBER:
+            case COL_NOTES:
+                return column_to_name(col) + " COLLATE NOCASE";
+            default: break;
+        }
+
+        return column_to_name(col);
+    }
+
+    /** Returns the ORDER BY clause for the column */
+    static wxString order_by(const COLUMN col, const bool asc = true)
+    {
+        return " ORDER BY " + column_to_order(col) + (asc ? " ASC " : " DESC ");
+    }
+
+    typedef DB_Page<COLUMN, Self::Data> Page;
     
     /** Data is a single record in the database table*/
     struct Data
@@ -294,6 +339,8 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
         friend struct DB_Table_BILLSDEPOSITS_V1;
         /** This is a instance pointer to itself in memory. */
         Self* table_;
+        /** Set when the record is used from the cache, cleared by the CLOCK hand of shrink() */
+        bool referenced_ = true;
     
         int64 BDID;//  primary key
         int64 ACCOUNTID;
@@ -354,6 +401,29 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
             if(COLOR != r->COLOR) return false;
             return true;
         }
+
+        /** Return the columns whose values differ from r, bit i for the i-th column after the primary key */
+        uint64_t diff(const Data* r) const
+        {
+            uint64_t changed = 0;
+            if(ACCOUNTID != r->ACCOUNTID) changed |= uint64_t(1) << 0;
+            if(TOACCOUNTID != r->TOACCOUNTID) changed |= uint64_t(1) << 1;
+            if(PAYEEID != r->PAYEEID) changed |= uint64_t(1) << 2;
+            if(!TRANSCODE.IsSameAs(r->TRANSCODE)) changed |= uint64_t(1) << 3;
+            if(TRANSAMOUNT != r->TRANSAMOUNT) changed |= uint64_t(1) << 4;
+            if(!STATUS.IsSameAs(r->STATUS)) changed |= uint64_t(1) << 5;
+            if(!TRANSACTIONNUMBER.IsSameAs(r->TRANSACTIONNUMBER)) changed |= uint64_t(1) << 6;
+            if(!NOTES.IsSameAs(r->NOTES)) changed |= uint64_t(1) << 7;
+            if(CATEGID != r->CATEGID) changed |= uint64_t(1) << 8;
+            if(!TRANSDATE.IsSameAs(r->TRANSDATE)) changed |= uint64_t(1) << 9;
+            if(FOLLOWUPID != r->FOLLOWUPID) changed |= uint64_t(1) << 10;
+            if(TOTRANSAMOUNT != r->TOTRANSAMOUNT) changed |= uint64_t(1) << 11;
+            if(REPEATS != r->REPEATS) changed |= uint64_t(1) << 12;
+            if(!NEXTOCCURRENCEDATE.IsSameAs(r->NEXTOCCURRENCEDATE)) changed |= uint64_t(1) << 13;
+            if(NUMOCCURRENCES != r->NUMOCCURRENCES) changed |= uint64_t(1) << 14;
+            if(COLOR != r->COLOR) changed |= uint64_t(1) << 15;
+            return changed;
+        }
         
         explicit Data(Self* table = nullptr ) 
         {
@@ -512,6 +582,86 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
             return this->COLOR == in.v_;
         }
 
+        void assign(const Self::ACCOUNTID &in)
+        {
+            this->ACCOUNTID = in.v_;
+        }
+
+        void assign(const Self::TOACCOUNTID &in)
+        {
+            this->TOACCOUNTID = in.v_;
+        }
+
+        void assign(const Self::PAYEEID &in)
+        {
+            this->PAYEEID = in.v_;
+        }
+
+        void assign(const Self::TRANSCODE &in)
+        {
+            this->TRANSCODE = in.v_;
+        }
+
+        void assign(const Self::TRANSAMOUNT &in)
+        {
+            this->TRANSAMOUNT = in.v_;
+        }
+
+        void assign(const Self::STATUS &in)
+        {
+            this->STATUS = in.v_;
+        }
+
+        void assign(const Self::TRANSACTIONNUMBER &in)
+        {
+            this->TRANSACTIONNUMBER = in.v_;
+        }
+
+        void assign(const Self::NOTES &in)
+        {
+            this->NOTES = in.v_;
+        }
+
+        void assign(const Self::CATEGID &in)
+        {
+            this->CATEGID = in.v_;
+        }
+
+        void assign(const Self::TRANSDATE &in)
+        {
+            this->TRANSDATE = in.v_;
+        }
+
+        void assign(const Self::FOLLOWUPID &in)
+        {
+            this->FOLLOWUPID = in.v_;
+        }
+
+        void assign(const Self::TOTRANSAMOUNT &in)
+        {
+            this->TOTRANSAMOUNT = in.v_;
+        }
+
+        void assign(const Self::REPEATS &in)
+        {
+            this->REPEATS = in.v_;
+        }
+
+        void assign(const Self::NEXTOCCURRENCEDATE &in)
+        {
+            this->NEXTOCCURRENCEDATE = in.v_;
+        }
+
+        void assign(const Self::NUMOCCURRENCES &in)
+        {
+            this->NUMOCCURRENCES = in.v_;
+        }
+
+        void assign(const Self::COLOR &in)
+        {
+            this->COLOR = in.v_;
+        }
+
         // Return the data record as a json string
         wxString to_json() const
         {
@@ -637,6 +787,32 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
         {
             delete this;
         }
+
+        /** Records are allocated from the slabs of the table's DB_Pool */
+        static void* operator new(size_t size)
+        {
+            return size == sizeof(Data) ? DB_Pool<Data>::instance().allocate() : ::operator new(size);
+        }
+
+        static void operator delete(void* p, size_t size)
+        {
+            if (size == sizeof(Data))
+                DB_Pool<Data>::instance().deallocate(p);
+            else
+                ::operator delete(p);
+        }
+
+        /** Estimated bytes held by the record, including the heap buffers of its strings */
+        size_t memory_usage() const
+        {
+            return sizeof(Data)
+                + db_string_heap(TRANSCODE)
+                + db_string_heap(STATUS)
+                + db_string_heap(TRANSACTIONNUMBER)
+                + db_string_heap(NOTES)
+                + db_string_heap(TRANSDATE)
+                + db_string_heap(NEXTOCCURRENCEDATE);
+        }
     };
 
     enum
@@ -649,7 +825,9 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
     /** Name of the table*/    
     wxString name() const { return "BILLSDEPOSITS_V1"; }
 
-    DB_Table_BILLSDEPOSITS_V1() : fake_(new Data())
+    Data fake_record_; // outside of the DB_Pool, so the slabs are released with the cache
+
+    DB_Table_BILLSDEPOSITS_V1() : fake_(&fake_record_)
     {
         query_ = "SELECT BDID, ACCOUNTID, TOACCOUNTID, PAYEEID, TRANSCODE, TRANSAMOUNT, STATUS, TRANSACTIONNUMBER, NOTES, CATEGID, TRANSDATE, FOLLOWUPID, TOTRANSAMOUNT, REPEATS, NEXTOCCURRENCEDATE, NUMOCCURRENCES, COLOR FROM BILLSDEPOSITS_V1 ";
     }
@@ -658,7 +836,7 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
     Self::Data* create()
     {
         Self::Data* entity = new Self::Data(this);
-        cache_.push_back(entity);
+        cache_.insert(entity);
         return entity;
     }
     
@@ -671,55 +849,99 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
         return entity;
     }
 
+    /** Return "UPDATE BILLSDEPOSITS_V1 SET <the columns in changed> = ? WHERE BDID = ?", all of them for ~0 */
+    static wxString update_sql(uint64_t changed)
+    {
+        static const char* columns[] = { "ACCOUNTID", "TOACCOUNTID", "PAYEEID", "TRANSCODE", "TRANSAMOUNT", "STATUS", "TRANSACTIONNUMBER", "NOTES", "CATEGID", "TRANSDATE", "FOLLOWUPID", "TOTRANSAMOUNT", "REPEATS", "NEXTOCCURRENCEDATE", "NUMOCCURRENCES", "COLOR" };
+        wxString sql = "UPDATE BILLSDEPOSITS_V1 SET ";
+        wxString separator;
+        for (size_t i = 0; i < sizeof(columns) / sizeof(columns[0]); ++ i)
+        {
+            if (!(changed & (uint64_t(1) << i))) continue;
+            sql += separator + columns[i] + " = ?";
+            separator = ", ";
+        }
+        return sql + " WHERE BDID = ?";
+    }
+
+    /** Return the cached record of the id of entity holding the values stored in the database, unless it is entity itself */
+    const Self::Data* cached_other(const Self::Data* entity) const
+    {
+        if (entity->id() <= 0) return nullptr;
+        auto it = index_by_id_.find(entity->id());
+        return (it != index_by_id_.end() && it->second != entity) ? it->second : nullptr;
+    }
+
     /**
     * Saves the Data record to the database table.
     * Either create a new record or update the existing record.
+    * A copy of a cached record only writes the columns it changed, nothing when it equals() the cached one.
     * Remove old record from the memory table (cache)
     */
     bool save(Self::Data* entity, wxSQLite3Database* db, bool force_insert = false)
     {
+        DB_Op_Timer timer(this, DB_OP_SAVE);
+        timer.returned_ = 1;
+        uint64_t changed = ~uint64_t(0);
+        if (entity->id() > 0 && !force_insert)
+        {
+            // the cached record holds the values stored in the database
+            auto it = index_by_id_.find(entity->id());
+            if (it != index_by_id_.end() && it->second != entity)
+            {
+                changed = it->second->diff(entity);
+                if (!changed)
+                {
+                    timer.returned_ = 0;
+                    return true;
+                }
+            }
+        }
+
+        const bool insert = entity->id() <= 0 || force_insert;
         wxString sql = wxEmptyString;
-        if (entity->id() <= 0 || force_insert) //  new & insert
+        if (insert) //  new & insert
         {
             sql = "INSERT INTO BILLSDEPOSITS_V1(ACCOUNTID, TOACCOUNTID, PAYEEID, TRANSCODE, TRANSAMOUNT, STATUS, TRANSACTIONNUMBER, NOTES, CATEGID, TRANSDATE, FOLLOWUPID, TOTRANSAMOUNT, REPEATS, NEXTOCCURRENCEDATE, NUMOCCURRENCES, COLOR, BDID) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)";
         }
         else
         {
-            sql = "UPDATE BILLSDEPOSITS_V1 SET ACCOUNTID = ?, TOACCOUNTID = ?, PAYEEID = ?, TRANSCODE = ?, TRANSAMOUNT = ?, STATUS = ?, TRANSACTIONNUMBER = ?, NOTES = ?, CATEGID = ?, TRANSDATE = ?, FOLLOWUPID = ?, TOTRANSAMOUNT = ?, REPEATS = ?, NEXTOCCURRENCEDATE = ?, NUMOCCURRENCES = ?, COLOR = ? WHERE BDID = ?";
+            sql = update_sql(changed);
         }
 
         try
         {
-            wxSQLite3Statement stmt = db->PrepareStatement(sql);
-
-            stmt.Bind(1, entity->ACCOUNTID);
-            stmt.Bind(2, entity->TOACCOUNTID);
-            stmt.Bind(3, entity->PAYEEID);
-            stmt.Bind(4, entity->TRANSCODE);
-            stmt.Bind(5, entity->TRANSAMOUNT);
-            stmt.Bind(6, entity->STATUS);
-            stmt.Bind(7, entity->TRANSACTIONNUMBER);
-            stmt.Bind(8, entity->NOTES);
-            stmt.Bind(9, entity->CATEGID);
-            stmt.Bind(10, entity->TRANSDATE);
-            stmt.Bind(11, entity->FOLLOWUPID);
-            stmt.Bind(12, entity->TOTRANSAMOUNT);
-            stmt.Bind(13, entity->REPEATS);
-            stmt.Bind(14, entity->NEXTOCCURRENCEDATE);
-            stmt.Bind(15, entity->NUMOCCURRENCES);
-            stmt.Bind(16, entity->COLOR);
-            stmt.Bind(17, entity->id() > 0 ? entity->BDID : newId());
+            wxSQLite3Statement& stmt = statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            int index = 1;
+
+            if (insert || (changed & (uint64_t(1) << 0))) stmt.Bind(index++, entity->ACCOUNTID);
+            if (insert || (changed & (uint64_t(1) << 1))) stmt.Bind(index++, entity->TOACCOUNTID);
+            if (insert || (changed & (uint64_t(1) << 2))) stmt.Bind(index++, entity->PAYEEID);
+            if (insert || (changed & (uint64_t(1) << 3))) stmt.Bind(index++, entity->TRANSCODE);
+            if (insert || (changed & (uint64_t(1) << 4))) stmt.Bind(index++, entity->TRANSAMOUNT);
+            if (insert || (changed & (uint64_t(1) << 5))) stmt.Bind(index++, entity->STATUS);
+            if (insert || (changed & (uint64_t(1) << 6))) stmt.Bind(index++, entity->TRANSACTIONNUMBER);
+            if (insert || (changed & (uint64_t(1) << 7))) stmt.Bind(index++, entity->NOTES);
+            if (insert || (changed & (uint64_t(1) << 8))) stmt.Bind(index++, entity->CATEGID);
+            if (insert || (changed & (uint64_t(1) << 9))) stmt.Bind(index++, entity->TRANSDATE);
+            if (insert || (changed & (uint64_t(1) << 10))) stmt.Bind(index++, entity->FOLLOWUPID);
+            if (insert || (changed & (uint64_t(1) << 11))) stmt.Bind(index++, entity->TOTRANSAMOUNT);
+            if (insert || (changed & (uint64_t(1) << 12))) stmt.Bind(index++, entity->REPEATS);
+            if (insert || (changed & (uint64_t(1) << 13))) stmt.Bind(index++, entity->NEXTOCCURRENCEDATE);
+            if (insert || (changed & (uint64_t(1) << 14))) stmt.Bind(index++, entity->NUMOCCURRENCES);
+            if (insert || (changed & (uint64_t(1) << 15))) stmt.Bind(index++, entity->COLOR);
+            stmt.Bind(index, entity->id() > 0 ? entity->BDID : newId());
 
             stmt.ExecuteUpdate();
-            stmt.Finalize();
 
             if (entity->id() > 0) // existent
             {
-                for(Cache::iterator it = cache_.begin(); it != cache_.end(); ++ it)
+                auto it = index_by_id_.find(entity->id());
+                if (it != index_by_id_.end())
                 {
-                    Self::Data* e = *it;
-                    if (e->id() == entity->id()) 
-                        *e = *entity;  // in-place update
+                    if (it->second != entity) *(it->second) = *entity;  // in-place update
+                    reindex(it->second);
                 }
             }
         }
@@ -732,39 +954,164 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
         if (entity->id() <= 0)
         {
             entity->id(db->GetLastRowId());
-            index_by_id_.insert(std::make_pair(entity->id(), entity));
+            // only records owned by the cache are indexed, copies held by callers are not
+            if (cache_.count(entity))
+            {
+                track(entity);
+                reindex(entity);
+            }
         }
         return true;
     }
 
-    /** Remove the Data record from the database and the memory table (cache) */
-    bool remove(const int64 id, wxSQLite3Database* db)
+    /**
+    * Saves the Data records to the database table in a single transaction,
+    * with one prepared statement for the inserts and one for each set of changed columns of the updates.
+    * As save(), a copy of a cached record only writes the columns it changed from the cached one.
+    * New records take their ids from one block reserved by newIds()
+    * and the memory table (cache) is brought up to date in one pass afterwards.
+    */
+    bool save_all(std::vector<Self::Data*>& entities, wxSQLite3Database* db, bool force_insert = false)
     {
-        if (id <= 0) return false;
+        std::vector<const Self::Data*> stored(entities.size(), nullptr);
+        if (!force_insert)
+        {
+            for (size_t i = 0; i < entities.size(); ++ i)
+                stored[i] = cached_other(entities[i]);
+        }
+        return save_all(entities, db, stored, force_insert);
+    }
+
+    /**
+    * As save_all(), with stored[i] the record entities[i] as held by the database (nullptr if unknown):
+    * only the columns each record changed from it are written, the records equal to it are skipped.
+    */
+    bool save_all(std::vector<Self::Data*>& entities, wxSQLite3Database* db, const std::vector<const Self::Data*>& stored, bool force_insert = false)
+    {
+        DB_Op_Timer timer(this, DB_OP_SAVE);
+        timer.returned_ = entities.size();
+        if (db->IsReadOnly()) return false;
+
+        size_t count = 0;
+        for (const auto* entity : entities)
+            if (entity->id() <= 0) ++ count;
+        int64 next_id = count > 0 ? newIds(count) : int64(0);
+        std::vector<int64> ids; // id of each entity once saved
+        ids.reserve(entities.size());
+
+        db->Savepoint("save_all");
         try
         {
-            wxString sql = "DELETE FROM BILLSDEPOSITS_V1 WHERE BDID = ?";
-            wxSQLite3Statement stmt = db->PrepareStatement(sql);
-            stmt.Bind(1, id);
-            stmt.ExecuteUpdate();
-            stmt.Finalize();
+            wxSQLite3Statement& insert = statement(db, "INSERT INTO BILLSDEPOSITS_V1(ACCOUNTID, TOACCOUNTID, PAYEEID, TRANSCODE, TRANSAMOUNT, STATUS, TRANSACTIONNUMBER, NOTES, CATEGID, TRANSDATE, FOLLOWUPID, TOTRANSAMOUNT, REPEATS, NEXTOCCURRENCEDATE, NUMOCCURRENCES, COLOR, BDID) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)");
+            wxSQLite3Statement* update = nullptr;
+            uint64_t update_changed = 0; // the columns update writes
+
+            for (size_t i = 0; i < entities.size(); ++ i)
+            {
+                const Self::Data* entity = entities[i];
+                if (entity->id() > 0)
+                    ids.push_back(entity->BDID);
+                else
+                {
+                    ids.push_back(next_id);
+                    next_id += 1;
+                }
+
+                const bool is_insert = entity->id() <= 0 || force_insert;
+                uint64_t changed = ~uint64_t(0);
+                if (!is_insert && i < stored.size() && stored[i] && stored[i] != entity)
+                {
+                    changed = stored[i]->diff(entity);
+                    if (!changed)
+                    {
+                        -- timer.returned_;
+                        continue;
+                    }
+                }
+                if (!is_insert && (!update || changed != update_changed))
+                {
+                    update = &statement(db, update_sql(changed));
+                    update_changed = changed;
+                }
+
+                wxSQLite3Statement& stmt = is_insert ? insert : *update;
+                DB_Statement_Reset reset(stmt);
+                int index = 1;
+                if (is_insert || (changed & (uint64_t(1) << 0))) stmt.Bind(index++, entity->ACCOUNTID);
+                if (is_insert || (changed & (uint64_t(1) << 1))) stmt.Bind(index++, entity->TOACCOUNTID);
+                if (is_insert || (changed & (uint64_t(1) << 2))) stmt.Bind(index++, entity->PAYEEID);
+                if (is_insert || (changed & (uint64_t(1) << 3))) stmt.Bind(index++, entity->TRANSCODE);
+                if (is_insert || (changed & (uint64_t(1) << 4))) stmt.Bind(index++, entity->TRANSAMOUNT);
+                if (is_insert || (changed & (uint64_t(1) << 5))) stmt.Bind(index++, entity->STATUS);
+                if (is_insert || (changed & (uint64_t(1) << 6))) stmt.Bind(index++, entity->TRANSACTIONNUMBER);
+                if (is_insert || (changed & (uint64_t(1) << 7))) stmt.Bind(index++, entity->NOTES);
+                if (is_insert || (changed & (uint64_t(1) << 8))) stmt.Bind(index++, entity->CATEGID);
+                if (is_insert || (changed & (uint64_t(1) << 9))) stmt.Bind(index++, entity->TRANSDATE);
+                if (is_insert || (changed & (uint64_t(1) << 10))) stmt.Bind(index++, entity->FOLLOWUPID);
+                if (is_insert || (changed & (uint64_t(1) << 11))) stmt.Bind(index++, entity->TOTRANSAMOUNT);
+                if (is_insert || (changed & (uint64_t(1) << 12))) stmt.Bind(index++, entity->REPEATS);
+                if (is_insert || (changed & (uint64_t(1) << 13))) stmt.Bind(index++, entity->NEXTOCCURRENCEDATE);
+                if (is_insert || (changed & (uint64_t(1) << 14))) stmt.Bind(index++, entity->NUMOCCURRENCES);
+                if (is_insert || (changed & (uint64_t(1) << 15))) stmt.Bind(index++, entity->COLOR);
+                stmt.Bind(index, ids.back());
+
+                stmt.ExecuteUpdate();
+            }
+            db->ReleaseSavepoint("save_all");
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+            try
+            {
+                db->RollbackToSavepoint("save_all");
+                db->ReleaseSavepoint("save_all");
+            }
+            catch(const wxSQLite3Exception &) {}
+            return false;
+        }
 
-            Cache c;
-            for(Cache::iterator it = cache_.begin(); it != cache_.end(); ++ it)
+        for (size_t i = 0; i < entities.size(); ++ i)
+        {
+            Self::Data* entity = entities[i];
+            if (entity->id() > 0)
             {
-                Self::Data* entity = *it;
-                if (entity->id() == id) 
+                auto it = index_by_id_.find(entity->id());
+                if (it != index_by_id_.end())
                 {
-                    index_by_id_.erase(entity->id());
-                    delete entity;
+                    if (it->second != entity) *(it->second) = *entity;  // in-place update
+                    reindex(it->second);
                 }
-                else 
+            }
+            else
+            {
+                entity->id(ids[i]);
+                // only records owned by the cache are indexed, copies held by callers are not
+                if (cache_.count(entity))
                 {
-                    c.push_back(entity);
+                    track(entity);
+                    reindex(entity);
                 }
             }
-            cache_.clear();
-            cache_.swap(c);
+        }
+
+        return true;
+    }
+
+    /** Remove the Data record from the database and the memory table (cache) */
+    bool remove(const int64 id, wxSQLite3Database* db)
+    {
+        if (id <= 0) return false;
+        DB_Op_Timer timer(this, DB_OP_REMOVE);
+        timer.returned_ = 1;
+        try
+        {
+            wxString sql = "DELETE FROM BILLSDEPOSITS_V1 WHERE BDID = ?";
+            wxSQLite3Statement& stmt = statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            stmt.Bind(1, id);
+            stmt.ExecuteUpdate();
+            uncache(id);
         }
         catch(const wxSQLite3Exception &e) 
         { 
@@ -778,30 +1125,233 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
     /** Remove the Data record from the database and the memory table (cache) */
     bool remove(Self::Data* entity, wxSQLite3Database* db)
     {
+        // the cached instance is deleted together with its cache entry
+        auto it = index_by_id_.find(entity->id());
+        const bool cached = it != index_by_id_.end() && it->second == entity;
         if (remove(entity->id(), db))
         {
-            entity->id(-1);
+            if (!cached) entity->id(-1);
             return true;
         }
 
         return false;
     }
 
+    /** Drop the removed or changed record of id from the memory table (cache) */
+    void uncache(const int64 id)
+    {
+        if (auto it = index_by_id_.find(id); it != index_by_id_.end())
+        {
+            Self::Data* entity = it->second;
+            index_by_id_.erase(it);
+            unindex(entity);
+            resident_bytes_ -= std::min(resident_bytes_, entity->memory_usage());
+            if (cache_.erase(entity)) delete entity;
+        }
+    }
+
+    /**
+    * Remove the Data records matching the conditions from the database with one DELETE statement,
+    * then drop them from the memory table (cache) in one pass.
+    * Return the ids of the records removed.
+    */
+    template<typename... Args>
+    std::vector<int64> delete_by(wxSQLite3Database* db, bool op_and, const Args&... args)
+    {
+        static_assert(sizeof...(Args) > 0, "delete_by() without conditions would remove all the records");
+        DB_Op_Timer timer(this, DB_OP_REMOVE);
+        std::vector<int64> ids;
+        try
+        {
+            wxString sql = "DELETE FROM BILLSDEPOSITS_V1 WHERE ";
+            condition(sql, op_and, args...);
+            sql += " RETURNING BDID";
+            wxSQLite3Statement& stmt = statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            bind(stmt, 1, args...);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+                ids.push_back(q.GetInt64(0));
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("BILLSDEPOSITS_V1: Exception %s", e.GetMessage().utf8_str());
+            return ids;
+        }
+
+        for (const auto& id : ids)
+        {
+            uncache(id);
+        }
+        timer.returned_ = ids.size();
+
+        return ids;
+    }
+
+    /**
+    * Set the columns of set in the Data records matching the conditions with one UPDATE statement,
+    * then apply them to the cached records in one pass.
+    * Example: update_by(db, std::make_tuple(STATUS("R")), true, ACCOUNTID(2))
+    * produces SQL statement: UPDATE BILLSDEPOSITS_V1 SET STATUS = ? WHERE ACCOUNTID = ?
+    * Return the ids of the records changed.
+    */
+    template<typename... Sets, typename... Args>
+    std::vector<int64> update_by(wxSQLite3Database* db, const std::tuple<Sets...>& set, bool op_and, const Args&... args)
+    {
+        static_assert(sizeof...(Sets) > 0, "update_by() without columns to set");
+        static_assert(sizeof...(Args) > 0, "update_by() without conditions would change all the records");
+        DB_Op_Timer timer(this, DB_OP_SAVE);
+        std::vector<int64> ids;
+        try
+        {
+            wxString sql = "UPDATE BILLSDEPOSITS_V1 SET ";
+            wxString separator;
+            ((sql += separator + Sets::name() + " = ?", separator = ", "), ...);
+            sql += " WHERE ";
+            condition(sql, op_and, args...);
+            sql += " RETURNING BDID";
+            wxSQLite3Statement& stmt = statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            std::apply([&stmt](const auto&... column) { bind(stmt, 1, column...); }, set);
+            bind(stmt, static_cast<int>(sizeof...(Sets) + 1), args...);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+                ids.push_back(q.GetInt64(0));
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("BILLSDEPOSITS_V1: Exception %s", e.GetMessage().utf8_str());
+            return ids;
+        }
+
+        for (const auto& id : ids)
+        {
+            if (auto it = index_by_id_.find(id); it != index_by_id_.end())
+            {
+                Self::Data* entity = it->second;
+                std::apply([entity](const auto&... column) { (entity->assign(column), ...); }, set);
+                reindex(entity);
+            }
+        }
+        timer.returned_ = ids.size();
+
+        return ids;
+    }
+
+    /** Return the cached record matching args with the smallest id, 0 if none */
     template<typename... Args>
     Self::Data* get_one(const Args& ... args)
     {
+        Self::Data* found = 0;
         for (auto& [_, item] : index_by_id_)
         {
-            if (item->id() > 0 && match(item, args...)) 
+            if (item->id() > 0 && (!found || item->id() < found->id()) && match(item, args...))
+                found = item;
+        }
+
+        if (!found)
+        {
+            ++ miss_;
+            return 0;
+        }
+
+        ++ hit_;
+        found->referenced_ = true;
+        return found;
+    }
+
+    /** Search the cached records through the in-memory index over ACCOUNTID, TOACCOUNTID, the match with the smallest id is returned */
+    template<typename... Args>
+    Self::Data* get_one(const ACCOUNTID& c0, const TOACCOUNTID& c1, const Args& ... args)
+    {
+        Self::Data* found = 0;
+        auto range = index_by_accountid_toaccountid_.equal_range(std::make_tuple(c0.v_, c1.v_));
+        for (auto it = range.first; it != range.second; ++ it)
+        {
+            Self::Data* item = it->second;
+            if (item->id() > 0 && (!found || item->id() < found->id()) && match(item, c0, c1, args...))
+                found = item;
+        }
+
+        if (!found)
+        {
+            ++ miss_;
+            return 0;
+        }
+
+        ++ hit_;
+        found->referenced_ = true;
+        return found;
+    }
+
+    /** Add or move the cached record in the in-memory indexes */
+    void reindex(Self::Data* entity)
+    {
+        index_by_accountid_toaccountid_.insert(std::make_tuple(entity->ACCOUNTID, entity->TOACCOUNTID), entity);
+    }
+
+    /** Remove the cached record from the in-memory indexes */
+    void unindex(Self::Data* entity)
+    {
+        index_by_accountid_toaccountid_.erase(entity);
+    }
+
+    /** Add the cached record to the id index and the CLOCK ring */
+    void track(Self::Data* entity)
+    {
+        index_by_id_.insert(std::make_pair(entity->id(), entity));
+        resident_bytes_ += entity->memory_usage();
+        entity->referenced_ = true;
+        if (clock_.size() > 2 * index_by_id_.size() + 64)
+        {
+            // drop the ids of removed records
+            clock_.clear();
+            clock_hand_ = 0;
+            for (const auto& [id, _] : index_by_id_) clock_.push_back(id);
+        }
+        else
+            clock_.push_back(entity->id());
+    }
+
+    /**
+    * Evict records from the memory table (cache) until it fits the budget set by cache_budget().
+    * The CLOCK hand gives a second chance to the records used since its last sweep.
+    * Evicted records stay allocated until release_evicted(), callers may still hold them.
+    */
+    void shrink()
+    {
+        while (over_budget(index_by_id_.size()) && !clock_.empty())
+        {
+            if (clock_hand_ >= clock_.size()) clock_hand_ = 0;
+            auto it = index_by_id_.find(clock_[clock_hand_]);
+            if (it != index_by_id_.end() && it->second->referenced_)
             {
-                ++ hit_;
-                return item;
+                it->second->referenced_ = false;
+                ++ clock_hand_;
+                continue;
             }
-        }
 
-        ++ miss_;
+            clock_[clock_hand_] = clock_.back();
+            clock_.pop_back();
+            if (it == index_by_id_.end()) continue; // removed from the database
+
+            Self::Data* entity = it->second;
+            index_by_id_.erase(it);
+            unindex(entity);
+            cache_.erase(entity);
+            resident_bytes_ -= std::min(resident_bytes_, entity->memory_usage());
+            evicted_.push_back(entity);
+            ++ evict_;
+        }
+    }
 
-        return 0;
+    /** Free the evicted records, only when no caller holds a pointer to them anymore */
+    void release_evicted()
+    {
+        std::for_each(evicted_.begin(), evicted_.end(), std::mem_fn(&Data::destroy));
+        evicted_.clear();
     }
     
     /**
@@ -810,6 +1360,7 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
     */
     Self::Data* get(const int64 id, wxSQLite3Database* db)
     {
+        DB_Op_Timer timer(this, DB_OP_GET);
         if (id <= 0) 
         {
             ++ skip_;
@@ -819,6 +1370,8 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
         if (auto it = index_by_id_.find(id); it != index_by_id_.end())
         {
             ++ hit_;
+            it->second->referenced_ = true;
+            timer.returned_ = 1;
             return it->second;
         }
         
@@ -827,22 +1380,26 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
         wxString where = wxString::Format(" WHERE %s = ?", PRIMARY::name().utf8_str());
         try
         {
-            wxSQLite3Statement stmt = db->PrepareStatement(this->query() + where);
+            wxSQLite3Statement& stmt = statement(db, this->query() + where);
+            DB_Statement_Reset reset(stmt);
             stmt.Bind(1, id);
 
             wxSQLite3ResultSet q = stmt.ExecuteQuery();
             if(q.NextRow())
             {
                 entity = new Self::Data(q, this);
-                cache_.push_back(entity);
-                index_by_id_.insert(std::make_pair(id, entity));
+                ++ timer.decoded_;
+                timer.returned_ = 1;
+                cache_.insert(entity);
+                track(entity);
+                reindex(entity);
             }
-            stmt.Finalize();
         }
         catch(const wxSQLite3Exception &e) 
         { 
             wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
         }
+        shrink();
         
         if (!entity) 
         {
@@ -854,9 +1411,11 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
     }
     /**
     * Search the database for the data record, bypassing the cache.
+    * The caller owns the record returned, nullptr when not found.
     */
     Self::Data* get_record(const int64 id, wxSQLite3Database* db)
     {
+        DB_Op_Timer timer(this, DB_OP_GET);
         if (id <= 0) 
         {
             ++ skip_;
@@ -867,55 +1426,426 @@ struct DB_Table_BILLSDEPOSITS_V1 : public DB_Table
         wxString where = wxString::Format(" WHERE %s = ?", PRIMARY::name().utf8_str());
         try
         {
-            wxSQLite3Statement stmt = db->PrepareStatement(this->query() + where);
+            wxSQLite3Statement& stmt = statement(db, this->query() + where);
+            DB_Statement_Reset reset(stmt);
             stmt.Bind(1, id);
 
             wxSQLite3ResultSet q = stmt.ExecuteQuery();
             if(q.NextRow())
             {
                 entity = new Self::Data(q, this);
+                ++ timer.decoded_;
+                timer.returned_ = 1;
             }
-            stmt.Finalize();
         }
         catch(const wxSQLite3Exception &e) 
         { 
             wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
         }
-        
-        if (!entity) 
-        {
-            entity = this->fake_;
-            // wxLogError("%s: %d not found", this->name().utf8_str(), id);
-        }
  
         return entity;
     }
 
+    /**
+    * Load the Data records for the ids into the memory table (cache).
+    * The ids not cached yet are read with IN lists of GET_MANY_CHUNK ids, one round trip per chunk.
+    * Return the records in the order of the ids, as get() would.
+    */
+    std::vector<Self::Data*> get_many(const std::vector<int64>& ids, wxSQLite3Database* db)
+    {
+        DB_Op_Timer timer(this, DB_OP_GET);
+        std::vector<int64> missing;
+        for (const auto& id : ids)
+        {
+            if (id <= 0)
+                ++ skip_;
+            else if (auto it = index_by_id_.find(id); it != index_by_id_.end())
+            {
+                ++ hit_;
+                it->second->referenced_ = true;
+            }
+            else
+                missing.push_back(id);
+        }
+        std::sort(missing.begin(), missing.end());
+        missing.erase(std::unique(missing.begin(), missing.end()), missing.end());
+        miss_ += missing.size();
+
+        static const wxString where = where_in(PRIMARY::name());
+        for (size_t first = 0; first < missing.size(); first += GET_MANY_CHUNK)
+        {
+            try
+            {
+                wxSQLite3Statement& stmt = statement(db, this->query() + where);
+                DB_Statement_Reset reset(stmt);
+                // a short chunk repeats its last id, so all chunks share one statement
+                for (size_t i = 0; i < GET_MANY_CHUNK; ++ i)
+                    stmt.Bind(static_cast<int>(i + 1), missing[std::min(first + i, missing.size() - 1)]);
+
+                wxSQLite3ResultSet q = stmt.ExecuteQuery();
+                while(q.NextRow())
+                {
+                    Self::Data* entity = new Self::Data(q, this);
+                    ++ timer.decoded_;
+                    cache_.insert(entity);
+                    track(entity);
+                    reindex(entity);
+                }
+            }
+            catch(const wxSQLite3Exception &e) 
+            { 
+                wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+            }
+        }
+
+        std::vector<Self::Data*> result;
+        result.reserve(ids.size());
+        for (const auto& id : ids)
+        {
+            if (id <= 0)
+                result.push_back(nullptr);
+            else if (auto it = index_by_id_.find(id); it != index_by_id_.end())
+                result.push_back(it->second);
+            else
+                result.push_back(this->fake_);
+        }
+        shrink();
+        timer.returned_ = result.size();
+
+        return result;
+    }
+
+    /**
+    * Return the records of the ids as stored in the database, keyed by id, bypassing the memory table (cache).
+    * The ids are read with IN lists of GET_MANY_CHUNK ids as get_many() does, the ids not found are left out.
+    */
+    std::map<int64, Self::Data> get_records(const std::vector<int64>& ids, wxSQLite3Database* db)
+    {
+        DB_Op_Timer timer(this, DB_OP_GET);
+        std::vector<int64> wanted;
+        for (const auto& id : ids)
+        {
+            if (id <= 0)
+                ++ skip_;
+            else
+                wanted.push_back(id);
+        }
+        std::sort(wanted.begin(), wanted.end());
+        wanted.erase(std::unique(wanted.begin(), wanted.end()), wanted.end());
+
+        std::map<int64, Self::Data> result;
+        static const wxString where = where_in(PRIMARY::name());
+        for (size_t first = 0; first < wanted.size(); first += GET_MANY_CHUNK)
+        {
+            try
+            {
+                wxSQLite3Statement& stmt = statement(db, this->query() + where);
+                DB_Statement_Reset reset(stmt);
+                // a short chunk repeats its last id, so all chunks share one statement
+                for (size_t i = 0; i < GET_MANY_CHUNK; ++ i)
+                    stmt.Bind(static_cast<int>(i + 1), wanted[std::min(first + i, wanted.size() - 1)]);
+
+                wxSQLite3ResultSet q = stmt.ExecuteQuery();
+                while(q.NextRow())
+                {
+                    Self::Data entity(q, this);
+                    ++ timer.decoded_;
+                    result.emplace(entity.id(), std::move(entity));
+                }
+            }
+            catch(const wxSQLite3Exception &e) 
+            { 
+                wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+            }
+        }
+        timer.returned_ = result.size();
+
+        return result;
+    }
+
+    /**
+    * Fill the memory table (cache) from a single scan of up to max_num records (-1 for all).
+    * Records already in the cache are kept as they are.
+    */
+    void preload(wxSQLite3Database* db, int max_num = -1)
+    {
+        DB_Op_Timer timer(this, DB_OP_ALL);
+        try
+        {
+            wxSQLite3Statement& stmt = statement(db, this->query() + " LIMIT ?");
+            DB_Statement_Reset reset(stmt);
+            stmt.Bind(1, max_num);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+            {
+                if (index_by_id_.find(q.GetInt64(0)) != index_by_id_.end()) continue;
+                if (max_records_ > 0 && index_by_id_.size() >= max_records_) break;
+                if (max_bytes_ > 0 && resident_bytes_ >= max_bytes_) break;
+
+                Self::Data* entity = new Self::Data(q, this);
+                ++ timer.decoded_;
+                cache_.insert(entity);
+                track(entity);
+                reindex(entity);
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+    }
+
+    /** The parent id of a record, defined only for the columns find_children() accepts */
+    static int64 parent_id(const Self::Data& entity, const ACCOUNTID*) { return entity.ACCOUNTID; }
+    static int64 parent_id(const Self::Data& entity, const PAYEEID*) { return entity.PAYEEID; }
+    static int64 parent_id(const Self::Data& entity, const CATEGID*) { return entity.CATEGID; }
+
+    /**
+    * Return the Data records of all the parent ids, grouped by parent id, where PARENT
+    * is a column referring to another table (ACCOUNTID, PAYEEID, CATEGID).
+    * The ids are read with IN lists of GET_MANY_CHUNK ids, one round trip per chunk instead of
+    * one find() per parent, the conditions args are added to each query.
+    * Example: find_children<ACCOUNTID>(ids, db) produces SQL statement: SELECT ... FROM BILLSDEPOSITS_V1 WHERE ACCOUNTID IN (?, ...)
+    */
+    template<class PARENT, typename... Args>
+    std::map<int64, Data_Set> find_children(const std::vector<int64>& parent_ids, wxSQLite3Database* db, const Args&... args)
+    {
+        DB_Op_Timer timer(this, DB_OP_FIND);
+        std::vector<int64> ids(parent_ids);
+        std::sort(ids.begin(), ids.end());
+        ids.erase(std::unique(ids.begin(), ids.end()), ids.end());
+
+        std::map<int64, Data_Set> result;
+        wxString sql = this->query() + where_in(PARENT::name());
+        if constexpr (sizeof...(Args) > 0)
+        {
+            sql += " AND ";
+            condition(sql, true, args...);
+        }
+        for (size_t first = 0; first < ids.size(); first += GET_MANY_CHUNK)
+        {
+            try
+            {
+                wxSQLite3Statement& stmt = statement(db, sql);
+                DB_Statement_Reset reset(stmt);
+                // a short chunk repeats its last id, so all chunks share one statement
+                for (size_t i = 0; i < GET_MANY_CHUNK; ++ i)
+                    stmt.Bind(static_cast<int>(i + 1), ids[std::min(first + i, ids.size() - 1)]);
+                if constexpr (sizeof...(Args) > 0)
+                    bind(stmt, static_cast<int>(GET_MANY_CHUNK + 1), args...);
+
+                wxSQLite3ResultSet q = stmt.ExecuteQuery();
+                while(q.NextRow())
+                {
+                    Self::Data entity(q, this);
+                    ++ timer.decoded_;
+                    ++ timer.returned_;
+                    result[parent_id(entity, static_cast<const PARENT*>(nullptr))].push_back(std::move(entity));
+                }
+            }
+            catch(const wxSQLite3Exception &e) 
+            { 
+                wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+            }
+        }
+
+        return result;
+    }
+
+    /** Estimated bytes held by the memory table (cache): the records, their strings, the id index and the evicted records */
+    size_t memory_usage() const
+    {
+        size_t bytes = cache_.size() * 2 * sizeof(void*) + index_by_id_.size() * (sizeof(int64) + 3 * sizeof(void*))
+            + clock_.capacity() * sizeof(int64) + evicted_.capacity() * sizeof(void*);
+        for (const auto* entity : cache_)
+            bytes += entity->memory_usage();
+        for (const auto* entity : evicted_)
+            bytes += entity->memory_usage();
+        return bytes;
+    }
+
     /**
     * Return a list of Data records (Data_Set) derived directly from the database.
     * The Data_Set is sorted based on the column number.
     */
-    const Data_Set all(wxSQLite3Database* db, const COLUMN col = COLUMN(0), const bool asc = true)
+    Data_Set all(wxSQLite3Database* db, const COLUMN col = COLUMN(0), const bool asc = true)
     {
+        DB_Op_Timer timer(this, DB_OP_ALL);
         Data_Set result;
         try
         {
-            wxSQLite3ResultSet q = db->ExecuteQuery(col == COLUMN(0) ? this->query() : this->query() + " ORDER BY " + column_to_name(col) + " COLLATE NOCASE " + (asc ? " ASC " : " DESC "));
+            wxSQLite3Statement& stmt = statement(db, col == COLUMN(0) ? this->query() : this->query() + order_by(col, asc));
+            DB_Statement_Reset reset(stmt);
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
 
             while(q.NextRow())
             {
                 Self::Data entity(q, this);
+                ++ timer.decoded_;
                 result.push_back(std::move(entity));
             }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = result.size();
+        return result;
+    }
+
+    /** Binds the value of the column of the Data record to the statement parameter */
+    static void bind_column(wxSQLite3Statement& stmt, int index, const COLUMN col, const Self::Data& entity)
+    {
+        switch(col)
+        {
+            case COL_BDID: stmt.Bind(index, entity.BDID); break;
+            case COL_ACCOUNTID: stmt.Bind(index, entity.ACCOUNTID); break;
+            case COL_TOACCOUNTID: stmt.Bind(index, entity.TOACCOUNTID); break;
+            case COL_PAYEEID: stmt.Bind(index, entity.PAYEEID); break;
+            case COL_TRANSCODE: stmt.Bind(index, entity.TRANSCODE); break;
+            case COL_TRANSAMOUNT: stmt.Bind(index, entity.TRANSAMOUNT); break;
+            case COL_STATUS: stmt.Bind(index, entity.STATUS); break;
+            case COL_TRANSACTIONNUMBER: stmt.Bind(index, entity.TRANSACTIONNUMBER); break;
+            case COL_NOTES: stmt.Bind(index, entity.NOTES); break;
+            case COL_CATEGID: stmt.Bind(index, entity.CATEGID); break;
+            case COL_TRANSDATE: stmt.Bind(index, entity.TRANSDATE); break;
+            case COL_FOLLOWUPID: stmt.Bind(index, entity.FOLLOWUPID); break;
+            case COL_TOTRANSAMOUNT: stmt.Bind(index, entity.TOTRANSAMOUNT); break;
+            case COL_REPEATS: stmt.Bind(index, entity.REPEATS); break;
+            case COL_NEXTOCCURRENCEDATE: stmt.Bind(index, entity.NEXTOCCURRENCEDATE); break;
+            case COL_NUMOCCURRENCES: stmt.Bind(index, entity.NUMOCCURRENCES); break;
+            case COL_COLOR: stmt.Bind(index, entity.COLOR); break;
+            default: break;
+        }
+    }
+
+    /**
+    * Return one page of the Data records matching the conditions, sorted by the database.
+    * Records are ordered by the page column then by the primary key, so that
+    * keyset pagination (Page::after_, the last record of the previous page) is stable.
+    * NULLs in the page column sort first; as the Data record reads them as '' or 0,
+    * Page::after_null_ is set for the last record returned, and the keyset handles them apart:
+    * where the page crosses from the NULLs to the values (or back when descending) the records
+    * of each side are read by their own SELECT and merged in order, each of them searching the
+    * index over the column.
+    */
+    template<typename... Args>
+    Data_Set find_page(wxSQLite3Database* db, Page& page, bool op_and, const Args&... args)
+    {
+        DB_Op_Timer timer(this, DB_OP_FIND);
+        Data_Set result;
+        try
+        {
+            const bool by_id = page.col_ == COLUMN(0);
+            const wxString dir = page.asc_ ? " ASC" : " DESC";
+            wxString where;
+            if constexpr (sizeof...(Args) > 0)
+                condition(where, op_and, args...);
+            wxString sql = this->query();
+            wxString rest; // the records past the NULLs (or past the values when descending)
+            if (page.after_)
+            {
+                const wxString pk = PRIMARY::name(), name = column_to_name(page.col_), key = column_to_order(page.col_);
+                wxString keyset;
+                if (by_id)
+                    keyset = pk + (page.asc_ ? " > ?" : " < ?");
+                else if (page.after_null_)
+                {
+                    keyset = name + " IS NULL AND " + pk + (page.asc_ ? " > ?" : " < ?");
+                    if (page.asc_) rest = name + " IS NOT NULL";
+                }
+                else
+                {
+                    keyset = page.asc_
+                        ? key + " >= ? AND (" + key + " > ? OR " + pk + " > ?)"
+                        : key + " <= ? AND (" + key + " < ? OR " + pk + " < ?)";
+                    if (!page.asc_) rest = name + " IS NULL";
+                }
+                sql += " WHERE " + (where.empty() ? keyset : "(" + where + ") AND " + keyset);
+                if (!rest.empty())
+                    sql += " UNION ALL " + this->query() + " WHERE " + (where.empty() ? rest : "(" + where + ") AND " + rest);
+            }
+            else if (!where.empty())
+                sql += " WHERE " + where;
+            sql += " ORDER BY " + column_to_order(page.col_) + dir;
+            if (!by_id) sql += ", " + PRIMARY::name() + dir;
+            sql += " LIMIT ? OFFSET ?";
+
+            wxSQLite3Statement& stmt = statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            int index = 1;
+            if constexpr (sizeof...(Args) > 0)
+            {
+                bind(stmt, index, args...);
+                index += sizeof...(Args);
+            }
+            if (page.after_)
+            {
+                if (!by_id && !page.after_null_)
+                {
+                    bind_column(stmt, index++, page.col_, *page.after_);
+                    bind_column(stmt, index++, page.col_, *page.after_);
+                }
+                stmt.Bind(index++, page.after_->id());
+                if constexpr (sizeof...(Args) > 0)
+                {
+                    if (!rest.empty())
+                    {
+                        bind(stmt, index, args...);
+                        index += sizeof...(Args);
+                    }
+                }
+            }
+            stmt.Bind(index++, page.limit_);
+            stmt.Bind(index, page.offset_);
 
-            q.Finalize();
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+            {
+                Self::Data entity(q, this);
+                ++ timer.decoded_;
+                page.after_null_ = q.IsNull(static_cast<int>(page.col_));
+                result.push_back(std::move(entity));
+            }
         }
         catch(const wxSQLite3Exception &e) 
         { 
             wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
         }
 
+        timer.returned_ = result.size();
         return result;
     }
+
+    /**
+    * Pass the Data records derived directly from the database to the visitor one at a time,
+    * sorted based on the column number, without building a Data_Set.
+    * The visitor returns false to stop the scan.
+    */
+    template<class VISITOR>
+    void each(wxSQLite3Database* db, VISITOR visitor, const COLUMN col = COLUMN(0), const bool asc = true)
+    {
+        DB_Op_Timer timer(this, DB_OP_ALL);
+        try
+        {
+            // not taken from the statement cache, the visitor may query this table again
+            wxSQLite3Statement stmt = db->PrepareStatement(col == COLUMN(0) ? this->query() : this->query() + order_by(col, asc));
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+
+            while(q.NextRow())
+            {
+                const Self::Data entity(q, this);
+                ++ timer.decoded_;
+                ++ timer.returned_;
+                if (!visitor(entity)) break;
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+    }
 };
 
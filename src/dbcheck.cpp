@@ -30,6 +30,7 @@ bool dbCheck::checkDB()
 {
     bool result = true;
     result = checkAccounts();
+    result = checkTransactions() && result;
     
     return result;
 }
@@ -107,5 +108,6 @@ bool dbCheck::checkSubcategories()
 
 bool dbCheck::checkTransactions()
 {
-    return true;
+    // the balance summary kept by the triggers is recomputed when it differs from the transactions
+    return Model_Checking::instance().verify_balances(true) == 0;
 }
@@ -20,6 +20,7 @@
 #include "util.h"
 #include "paths.h"
 #include "constants.h"
+#include "db/DB_Table.h"
 //----------------------------------------------------------------------------
 #include "sqlite3mc_amalgamation.h"
 //----------------------------------------------------------------------------
@@ -130,3 +131,60 @@ wxSharedPtr<wxSQLite3Database> mmDBWrapper::Open(const wxString &dbpath, const w
 
 //----------------------------------------------------------------------------
 
+wxSQLite3Database* mmDBWrapper::OpenReadOnly(const wxString &dbpath, const wxString &password)
+{
+    std::unique_ptr<wxSQLite3Database> db(new wxSQLite3Database);
+    wxSQLite3CipherSQLCipher cipher;
+    cipher.InitializeVersionDefault(4);
+    cipher.SetLegacy(true);
+    wxSQLite3CipherAes128 cipherAes128;
+    cipherAes128.InitializeFromGlobalDefault();
+
+    for (wxSQLite3Cipher* c : { static_cast<wxSQLite3Cipher*>(&cipher), static_cast<wxSQLite3Cipher*>(&cipherAes128) })
+    {
+        try
+        {
+            db->Open(dbpath, *c, password, WXSQLITE_OPEN_READONLY);
+            db->ExecuteQuery("select * from INFOTABLE_V1;");
+            db->SetBusyTimeout(2000);
+            return db.release();
+        }
+        catch (const wxSQLite3Exception& e)
+        {
+            wxLogDebug("mmDBWrapper::OpenReadOnly: %s", e.GetMessage());
+            if (db->IsOpen()) db->Close();
+        }
+    }
+    return nullptr;
+}
+
+static std::unique_ptr<DB_Reader_Pool>& static_readers()
+{
+    static std::unique_ptr<DB_Reader_Pool> readers;
+    return readers;
+}
+
+void mmDBWrapper::OpenReaders(wxSQLite3Database* db, const wxString &dbpath, const wxString &password, int size)
+{
+    CloseReaders(db);
+    if (size <= 0 || !DB_Reader_Pool::enable_wal(db))
+        return;
+
+    static_readers().reset(new DB_Reader_Pool([dbpath, password]() { return OpenReadOnly(dbpath, password); }, size));
+}
+
+void mmDBWrapper::CloseReaders(wxSQLite3Database* db)
+{
+    if (!static_readers())
+        return;
+
+    static_readers().reset();
+    DB_Reader_Pool::disable_wal(db);
+}
+
+DB_Reader_Pool* mmDBWrapper::Readers()
+{
+    return static_readers().get();
+}
+
+//----------------------------------------------------------------------------
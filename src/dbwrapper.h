@@ -24,11 +24,20 @@
 #include <wx/sharedptr.h>
 
 class wxSQLite3Database;
+struct DB_Reader_Pool;
 
 namespace mmDBWrapper
 {
 
     wxSharedPtr<wxSQLite3Database> Open(const wxString &dbpath, const wxString &key = "", const bool debug = false);
+    // Open a read-only connection for a worker thread, nullptr on failure (no dialog is shown)
+    wxSQLite3Database* OpenReadOnly(const wxString &dbpath, const wxString &key = "");
+    // Switch db to WAL and provide up to size read-only connections through Readers(), none for 0
+    void OpenReaders(wxSQLite3Database* db, const wxString &dbpath, const wxString &key, int size);
+    // Close the read-only connections and return db to a rollback journal, before db is closed or rekeyed
+    void CloseReaders(wxSQLite3Database* db);
+    // The pool of read-only connections to the open database, nullptr when there is none
+    DB_Reader_Pool* Readers();
 
 } // namespace mmDBWrapper
 
@@ -20,6 +20,7 @@
 
 #include "general_report_manager.h"
 #include "constants.h"
+#include "dbwrapper.h"
 #include "minimal_editor.h"
 #include "mmpanelbase.h"
 #include "mmSimpleDialogs.h"
@@ -274,6 +275,7 @@ mmGeneralReportManager::mmGeneralReportManager(wxWindow* parent, wxSQLite3Databa
 
 mmGeneralReportManager::~mmGeneralReportManager()
 {
+    stopReport();
     clearVFprintedFiles("grm");
     Model_Infotable::instance().setSize("GRM_DIALOG_SIZE", GetSize());
 }
@@ -296,6 +298,7 @@ bool mmGeneralReportManager::Create(wxWindow* parent
     SetAcceleratorTable(accel);
 
     Connect(wxID_EXECUTE, wxEVT_COMMAND_MENU_SELECTED, wxCommandEventHandler(mmGeneralReportManager::OnRun), nullptr, this);
+    Bind(wxEVT_THREAD, &mmGeneralReportManager::OnReportDone, this, ID_REPORT_DONE);
 
     CreateControls();
     fillControls();
@@ -731,6 +734,12 @@ void mmGeneralReportManager::OnUpdateReport(wxCommandEvent& WXUNUSED(event))
 
 void mmGeneralReportManager::OnRun(wxCommandEvent& WXUNUSED(event))
 {
+    // Run cancels the report still running
+    if (m_runner) {
+        m_execution->cancel = true;
+        return;
+    }
+
     MyTreeItemData* iData = dynamic_cast<MyTreeItemData*>(m_treeCtrl->GetItemData(m_selectedItemID));
     if (!iData) return;
 
@@ -743,12 +752,56 @@ void mmGeneralReportManager::OnRun(wxCommandEvent& WXUNUSED(event))
         n->SetSelection(ID_TAB_OUT);
         browser_->ClearBackground();
 
-        mmGeneralReport gr(report); //TODO: limit 500 line
-        auto data = gr.getHTMLText();
-        const auto& name = getVFname4print("grm", data);
-        browser_->LoadURL(name);
+        m_execution = Model_Report::instance().prepare(report);
+        m_execution->done = [this]() {
+            wxQueueEvent(this, new wxThreadEvent(wxEVT_THREAD, ID_REPORT_DONE));
+        };
+        m_runner = Model_Report::start(m_execution, mmDBWrapper::Readers());
+        if (!m_runner) {
+            // the reader pool is opt-in (READER_POOL_SIZE), without it the report runs here
+            Model_Report::run(*m_execution, m_db);
+            showReport(*m_execution);
+            return;
+        }
+        m_buttonRun->SetLabel(_t("&Cancel"));
+        browser_->SetPage(wxString::Format("<h3>%s</h3>", _tu("Running the report…")), "");
     }
 }
+
+void mmGeneralReportManager::OnReportDone(wxThreadEvent& WXUNUSED(event))
+{
+    if (!m_runner) return;
+
+    m_runner->Wait();
+    delete m_runner;
+    m_runner = nullptr;
+    m_buttonRun->SetLabel(_t("&Run"));
+    showReport(*m_execution);
+}
+
+void mmGeneralReportManager::showReport(const Model_Report::Execution& execution)
+{
+    Model_Report::instance().record(execution);
+    const Model_Report::Timing* timing = Model_Report::instance().timing(execution.id);
+    mmToolTip(m_buttonRun, _t("Run selected report.") + "\n" + wxString::Format(
+        _t("Last run: %zu rows, query %.0f ms, rows %.0f ms, output %.0f ms"),
+        timing->rows, timing->query_ms, timing->rows_ms, timing->render_ms));
+
+    const wxString data = execution.status == 0 ? execution.out : mmGeneralReport::getErrorHTML(execution.out);
+    const auto& name = getVFname4print("grm", data);
+    browser_->LoadURL(name);
+}
+
+// Cancel the report still running and wait for its thread
+void mmGeneralReportManager::stopReport()
+{
+    if (!m_runner) return;
+
+    m_execution->cancel = true;
+    m_runner->Wait();
+    delete m_runner;
+    m_runner = nullptr;
+}
 void mmGeneralReportManager::OnRightClick(wxMouseEvent& event) {
     wxTreeItemId id = m_treeCtrl->HitTest(event.GetPosition());
     if (!id.IsOk())
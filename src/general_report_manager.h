@@ -25,6 +25,7 @@
 #include <vector>
 #include <wx/dataview.h>
 #include "mmpanelbase.h"
+#include "model/Model_Report.h"
 
 #ifndef _WIN32
 #include <sys/time.h>
@@ -83,6 +84,9 @@ private:
     void OnRightClick(wxMouseEvent& event);
     void OnSelChanged(wxTreeEvent& event);
     void OnSyncReportComplete(wxCommandEvent&);
+    void OnReportDone(wxThreadEvent& event);
+    void showReport(const Model_Report::Execution& execution);
+    void stopReport();
     //void OnLabelChanged(wxTreeEvent& event);
     void viewControls(bool enable);
     void renameReport(int64 id);
@@ -107,6 +111,10 @@ private:
 
     std::vector <std::vector <wxString> > m_sqlQueryData;
 
+    // the report running on a worker thread, cancelled by Run
+    std::shared_ptr<Model_Report::Execution> m_execution;
+    wxThread* m_runner = nullptr;
+
     wxSQLite3Database* m_db = nullptr;
     wxWebView* browser_ = nullptr;
 
@@ -152,7 +160,8 @@ private:
         ID_DESCRIPTION,
         ID_REPORT_LIST,
         ID_GITHUB_SYNC,
-        ID_ACTIVE
+        ID_ACTIVE,
+        ID_REPORT_DONE
     };
 
 };
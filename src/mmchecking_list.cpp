@@ -1999,6 +1999,14 @@ void TransactionListCtrl::doSearchText(const wxString& value)
     if (selectedItem < 0 || selectedItem > last) //nothing selected
         selectedItem = getSortAsc(0) ? last + 1  : -1;
 
+    // words of the notes, number, payee and category are looked up once in the full-text
+    // indexes, so they also match inside the text; wildcards are matched on the columns below
+    std::set<int64> found;
+    if (!value.Contains("*") && !value.Contains("?")) {
+        const wxArrayInt64 ids = Model_Checking::searchText(value);
+        found.insert(ids.begin(), ids.end());
+    }
+
     while (true) {
         getSortAsc(0) ? selectedItem-- : selectedItem++;
         if (selectedItem < 0 || selectedItem >= static_cast<long>(m_trans.size()))
@@ -2020,6 +2028,10 @@ void TransactionListCtrl::doSearchText(const wxString& value)
 
         }
 
+        if (!m_trans.at(selectedItem).m_repeat_num && found.count(m_trans.at(selectedItem).TRANSID)) {
+            return markItem(selectedItem);
+        }
+
         for (const auto& t : {
             LIST_ID_NOTES, LIST_ID_NUMBER, LIST_ID_PAYEE_STR, LIST_ID_CATEGORY,
             LIST_ID_DATE, LIST_ID_TAGS, LIST_ID_DELETEDTIME, LIST_ID_UDFC01,
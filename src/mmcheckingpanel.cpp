@@ -618,9 +618,22 @@ void mmCheckingPanel::filterList()
     const auto trans = m_account ?
         Model_Account::transactionsByDateTimeId(m_account) :
         Model_Checking::instance().allByDateTimeId();
-    const auto trans_splits = Model_Splittransaction::instance().get_all();
-    const auto trans_tags = Model_Taglink::instance().get_all(tranRefType);
-    const auto trans_attachments = Model_Attachment::instance().get_all(Model_Checking::refTypeName);
+    // the children of one account's transactions are read by id, all of them otherwise
+    std::vector<int64> trans_ids;
+    if (m_account) {
+        trans_ids.reserve(trans.size());
+        for (const auto& tran : trans)
+            trans_ids.push_back(tran.TRANSID);
+    }
+    const auto trans_splits = m_account ?
+        Model_Splittransaction::instance().find_children<Model_Splittransaction::TRANSID>(trans_ids) :
+        Model_Splittransaction::instance().get_all();
+    const auto trans_tags = m_account ?
+        Model_Taglink::instance().find_children<Model_Taglink::REFID>(trans_ids, Model_Taglink::REFTYPE(tranRefType)) :
+        Model_Taglink::instance().get_all(tranRefType);
+    const auto trans_attachments = m_account ?
+        Model_Attachment::instance().find_children<Model_Attachment::REFID>(trans_ids, Model_Attachment::REFTYPE(Model_Checking::refTypeName)) :
+        Model_Attachment::instance().get_all(Model_Checking::refTypeName);
 
     std::map<int64, Model_Budgetsplittransaction::Data_Set> bills_splits;
     std::map<int64, Model_Taglink::Data_Set> bills_tags;
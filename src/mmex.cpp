@@ -449,6 +449,8 @@ bool mmGUIApp::OnInit()
         db = GetSettingDB();
         if (db)
         {
+            Model_Setting::instance().destroyCache();
+            Model_Usage::instance().destroyCache();
             db->Close();
         }
     }
@@ -473,6 +475,9 @@ int mmGUIApp::OnExit()
     Model_Usage::instance().save(usage);
 
     if (m_setting_db) {
+        // cached prepared statements must be finalized before the connection is closed
+        Model_Setting::instance().destroyCache();
+        Model_Usage::instance().destroyCache();
         m_setting_db->Close();
         m_setting_db->ShutdownSQLite();
     }
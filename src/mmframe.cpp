@@ -416,10 +416,24 @@ void mmGUIFrame::ShutdownDatabase()
             Model_Infotable::instance().setBool("ISUSED", false);
     }
     m_db->SetCommitHook(nullptr);
-    m_db->Close();
-    m_db.reset();
+    if (DB_Trace::instance().enabled_) {
+        DB_Trace& trace = DB_Trace::instance();
+        trace.detach(m_db.get());
+        wxFileName path(m_filename);
+        path.SetExt("trace.json");
+        DB_Trace::save(path.GetFullPath(), trace.to_chrome_trace());
+        path.SetExt("sql.json");
+        DB_Trace::save(path.GetFullPath(), trace.to_json());
+        trace.events_.clear();
+        trace.sql_.clear();
+    }
+    mmDBWrapper::CloseReaders(m_db.get());
+    // cached prepared statements must be finalized before the connection is closed
     for (auto& model : m_all_models)
         model->destroyCache();
+    DB_Schema::reset();
+    m_db->Close();
+    m_db.reset();
 }
 
 void mmGUIFrame::resetNavTreeControl()
@@ -2221,6 +2235,9 @@ void mmGUIFrame::createToolBar()
 
 void mmGUIFrame::InitializeModelTables()
 {
+    // a database already holding the generated schema skips the ensure() of every table
+    const bool schema_current = DB_Schema::check(m_db.get());
+
     m_all_models.push_back(&Model_Infotable::instance(m_db.get()));
     m_all_models.push_back(&Model_Asset::instance(m_db.get()));
     m_all_models.push_back(&Model_Stock::instance(m_db.get()));
@@ -2244,6 +2261,20 @@ void mmGUIFrame::InitializeModelTables()
     m_all_models.push_back(&Model_Taglink::instance(m_db.get()));
     m_all_models.push_back(&Model_Translink::instance(m_db.get()));
     m_all_models.push_back(&Model_Shareinfo::instance(m_db.get()));
+    if (!schema_current)
+        DB_Schema::stamp(m_db.get());
+
+    // bound the caches of the tables growing with the ledger, see refreshPanelData()
+    const size_t max_records = std::max(0, Model_Setting::instance().getInt("CACHE_MAX_RECORDS", 100000));
+    const size_t max_bytes = std::max(0, Model_Setting::instance().getInt("CACHE_MAX_BYTES", 0));
+    Model_Checking::instance().cacheBudget(max_records, max_bytes);
+    Model_Splittransaction::instance().cacheBudget(max_records, max_bytes);
+    Model_Taglink::instance().cacheBudget(max_records, max_bytes);
+    Model_CustomFieldData::instance().cacheBudget(max_records, max_bytes);
+
+    // record the queries, saved next to the database when it is closed
+    if (Model_Setting::instance().getBool("DB_PROFILE", false))
+        DB_Trace::instance().attach(m_db.get());
 }
 
 bool mmGUIFrame::createDataStore(const wxString& fileName, const wxString& pwd, bool openingNew)
@@ -2448,6 +2479,9 @@ void mmGUIFrame::SetDataBaseParameters(const wxString& fileName)
         m_filename = fileName;
         /* Set InfoTable Options into memory */
         Option::instance().load();
+        /* Read-only connections for the reports run on worker threads, only when enabled as they switch the database to WAL */
+        mmDBWrapper::OpenReaders(m_db.get(), fileName, m_password
+            , Model_Setting::instance().getInt("READER_POOL_SIZE", 0));
     }
     else {
         m_filename.Clear();
@@ -2628,7 +2662,12 @@ void mmGUIFrame::OnChangeEncryptPassword(wxCommandEvent& /*event*/)
                     cipher.InitializeVersionDefault(4);
                     cipher.SetLegacy(true);
 
+                    // a database in WAL mode cannot be rekeyed
+                    mmDBWrapper::CloseReaders(m_db.get());
                     m_db->ReKey(cipher, confirm_password);
+                    m_password = confirm_password;
+                    mmDBWrapper::OpenReaders(m_db.get(), m_filename, m_password
+                        , Model_Setting::instance().getInt("READER_POOL_SIZE", 0));
                     wxMessageBox(_t("Password change completed"), password_change_heading);
                 }
                 else {
@@ -2690,6 +2729,11 @@ void mmGUIFrame::OnDebugDB(wxCommandEvent& /*event*/)
         }
     }
 
+    // the balance summary kept by the triggers of the transactions is recomputed when it differs
+    const int balanceDifferences = Model_Checking::instance().verify_balances(true);
+    if (balanceDifferences > 0)
+        resultMessage << wxString::Format(_t("Account balance summary rebuilt, %d differences found"), balanceDifferences) + wxTextFile::GetEOL();
+
     if (!resultMessage.IsEmpty()) {
         wxTextEntryDialog checkDlg(this, _t("Result of database integrity check:"), _t("Database Check"), resultMessage.Trim(), wxOK | wxTE_MULTILINE);
         checkDlg.SetIcon(mmex::getProgramIcon());
@@ -2962,6 +3006,10 @@ void mmGUIFrame::refreshPanelData(wxCommandEvent& /*event*/)
 }
 void mmGUIFrame::refreshPanelData()
 {
+    // the dialogs are closed, no record evicted from the caches is held anymore
+    for (auto& model : m_all_models)
+        model->releaseEvicted();
+
     int id = panelCurrent_ ? panelCurrent_->GetId() : mmID_HOMEPAGE;
     wxLogDebug("Panel ID: %d", id);
 
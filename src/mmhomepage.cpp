@@ -659,15 +659,30 @@ void htmlWidgetAccounts::get_account_stats()
     else
         date_range = new mmCurrentMonth;
 
+    // the balance summary holds whole days, with the time of the transactions
+    // those of today are read to leave out the ones later than now
+    Model_Checking::Balances balances;
     Model_Checking::Data_Set all_trans;
-    if (Option::instance().getIgnoreFutureTransactions())
+    if (!Option::instance().getIgnoreFutureTransactions())
+    {
+        balances = Model_Checking::instance().balances();
+    }
+    else if (!Option::instance().UseTransDateTime())
     {
-        all_trans = Model_Checking::instance().find(Model_Checking::TRANSDATE(
-            Option::instance().UseTransDateTime() ? wxDateTime::Now() : wxDateTime(23, 59, 59, 999), LESS_OR_EQUAL));
+        balances = Model_Checking::instance().balances(wxDateTime::Today().FormatISODate());
     }
     else
     {
-        all_trans = Model_Checking::instance().all();
+        balances = Model_Checking::instance().balances(wxDateTime::Today().Subtract(wxDateSpan::Day()).FormatISODate());
+        all_trans = Model_Checking::instance().find(
+            Model_Checking::TRANSDATE(wxDateTime::Today(), GREATER_OR_EQUAL),
+            Model_Checking::TRANSDATE(wxDateTime::Now(), LESS_OR_EQUAL));
+    }
+
+    for (const auto& [account_id, balance] : balances)
+    {
+        accountStats_[account_id].first = balance.reconciled_;
+        accountStats_[account_id].second = balance.flow_;
     }
 
     for (const auto& trx : all_trans)
@@ -724,7 +739,7 @@ const wxString htmlWidgetAccounts::displayAccounts(double& tBalance, double& tRe
         Model_Currency::Data* currency = Model_Account::currency(account);
 
         double currency_rate = Model_CurrencyHistory::getDayRate(account.CURRENCYID, today);
-        double bal = account.INITIALBAL + accountStats_[account.ACCOUNTID].second; //Model_Account::balance(account);
+        double bal = account.INITIALBAL + accountStats_[account.ACCOUNTID].second;
         double reconciledBal = account.INITIALBAL + accountStats_[account.ACCOUNTID].first;
         tBalance += bal * currency_rate;
         tReconciled += reconciledBal * currency_rate;
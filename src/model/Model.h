@@ -95,6 +95,8 @@ public:
     virtual wxString  GetTableStatsAsJson() const = 0;
     virtual void show_statistics() const = 0;
     virtual void destroyCache() = 0;
+    virtual void cacheBudget(size_t max_records, size_t max_bytes = 0) = 0;
+    virtual void releaseEvicted() = 0;
 
 protected:
     wxSQLite3Database* db_;
@@ -141,18 +143,31 @@ class Model : public ModelBase, public DB_TABLE
 public:
     using DB_TABLE::all;
     using DB_TABLE::get;
+    using DB_TABLE::get_many;
     using DB_TABLE::save;
     using DB_TABLE::get_record;
     using DB_TABLE::remove;
 
     typedef typename DB_TABLE::COLUMN COLUMN;
     /** Return a list of Data record addresses (Data_Set) derived directly from the database. */
-    const typename DB_TABLE::Data_Set all(COLUMN col = COLUMN(0), bool asc = true)
+    typename DB_TABLE::Data_Set all(COLUMN col = COLUMN(0), bool asc = true)
     {
         this->ensure(this->db_);
         return all(db_, col, asc);
     }
 
+    /**
+    * Pass each Data record derived directly from the database to the visitor,
+    * one at a time and without building a Data_Set.
+    * The visitor takes a const Data& and returns false to stop.
+    */
+    template<class VISITOR>
+    void each(VISITOR visitor, COLUMN col = COLUMN(0), bool asc = true)
+    {
+        this->ensure(this->db_);
+        DB_TABLE::each(this->db_, visitor, col, asc);
+    }
+
     template<typename... Args>
     /**
     Command: find(const Args&... args)
@@ -164,11 +179,22 @@ public:
     * Returns a Data_Set containing the addresses of the items found.
     * The Data_Set is empty when nothing found.
     */
-    const typename DB_TABLE::Data_Set find(const Args&... args)
+    typename DB_TABLE::Data_Set find(const Args&... args)
     {
         return find_by(this, db_, true, args...);
     }
 
+    template<class VISITOR, typename... Args>
+    /**
+    Command: find_each(visitor, const Args&... args)
+    As find(), but each Data record found is passed to the visitor instead of being
+    collected in a Data_Set. The visitor takes a const Data& and returns false to stop.
+    */
+    void find_each(VISITOR visitor, const Args&... args)
+    {
+        find_by_each(this, db_, true, visitor, args...);
+    }
+
     template<typename... Args>
     /**
     Command: find_or(const Args&... args)
@@ -180,11 +206,251 @@ public:
     * Returns a Data_Set containing the addresses of the items found.
     * The Data_Set is empty when nothing found.
     */
-    const typename DB_TABLE::Data_Set find_or(const Args&... args)
+    typename DB_TABLE::Data_Set find_or(const Args&... args)
     {
         return find_by(this, db_, false, args...);
     }
 
+    template<class VISITOR, typename... Args>
+    /**
+    Command: find_or_each(visitor, const Args&... args)
+    As find_or(), but each Data record found is passed to the visitor instead of being
+    collected in a Data_Set. The visitor takes a const Data& and returns false to stop.
+    */
+    void find_or_each(VISITOR visitor, const Args&... args)
+    {
+        find_by_each(this, db_, false, visitor, args...);
+    }
+
+    template<typename... Args>
+    /**
+    Command: count([const Args&... args])
+    Count the records matching the conditions of find(), all records without, in the database.
+    */
+    int64 count(const Args&... args)
+    {
+        return count_by(this, this->db_, true, args...);
+    }
+
+    template<typename... Args>
+    /** As count(), with the conditions of find_or(). */
+    int64 count_or(const Args&... args)
+    {
+        return count_by(this, this->db_, false, args...);
+    }
+
+    template<class COL, typename... Args>
+    /**
+    Command: sum<Column>([const Args&... args])
+    Sum the column over the records matching the conditions of find(), in the database.
+    */
+    double sum(const Args&... args)
+    {
+        return sum_by<COL>(this, this->db_, true, args...);
+    }
+
+    template<class COL, typename... Args>
+    /** The smallest value of the column over the records matching the conditions of find(). */
+    typename COL::value_type min_value(const Args&... args)
+    {
+        return min_by<COL>(this, this->db_, true, args...);
+    }
+
+    template<class COL, typename... Args>
+    /** The largest value of the column over the records matching the conditions of find(). */
+    typename COL::value_type max_value(const Args&... args)
+    {
+        return max_by<COL>(this, this->db_, true, args...);
+    }
+
+    template<class GROUP, class... COLS, typename... Args>
+    /**
+    Command: sum_group<DB_Group<Column[, ...]>, Column[, ...]>([const Args&... args])
+    Sum the columns per group over the records matching the conditions of find(), in the database.
+    * Returns a map from the group column values to the sums, in the order of the columns.
+    */
+    auto sum_group(const Args&... args)
+    {
+        return GROUP::template sum<COLS...>(this, this->db_, true, args...);
+    }
+
+    template<class GROUP, class... COLS, typename... Args>
+    /** As sum_group(), with the conditions of find_or(). */
+    auto sum_group_or(const Args&... args)
+    {
+        return GROUP::template sum<COLS...>(this, this->db_, false, args...);
+    }
+
+    template<typename... Args>
+    /**
+    Command: find_page(Page& page[, const Args&... args])
+    As find(), but sorted, limited and offset by the database as given by page.
+    Example: the transactions of an account 50 at a time
+    Model_Checking::Page page(Model_Checking::COL_TRANSDATE, true, 50);
+    auto rows = Model_Checking::instance().find_page(page, Model_Checking::ACCOUNTID(2));
+    page.after_ = &rows.back(); // then find_page(page, ...) again for the next 50
+    * Returns a Data_Set with the records of the page.
+    */
+    typename DB_TABLE::Data_Set find_page(typename DB_TABLE::Page& page, const Args&... args)
+    {
+        return DB_TABLE::find_page(this->db_, page, true, args...);
+    }
+
+    template<class PARENT, typename... Args>
+    /**
+    Command: find_children<PARENT>(const std::vector<int64>& parent_ids[, const Args&... args])
+    As find(PARENT(id), args...) for each of the parent ids, in one query per GET_MANY_CHUNK ids.
+    Example: the splits of the transactions shown
+    Model_Splittransaction::instance().find_children<Model_Splittransaction::TRANSID>(trans_ids)
+    * Returns a map from parent id to the Data_Set of its records, parents without records are absent.
+    */
+    std::map<int64, typename DB_TABLE::Data_Set> find_children(const std::vector<int64>& parent_ids, const Args&... args)
+    {
+        return DB_TABLE::template find_children<PARENT>(parent_ids, this->db_, args...);
+    }
+
+    template<typename... Args>
+    /**
+    Command: delete_by(const Args&... args)
+    Remove the records matching the conditions of find() with one statement.
+    Example: the splits of a transaction
+    Model_Splittransaction::instance().delete_by(Model_Splittransaction::TRANSID(id))
+    * Returns the ids of the records removed.
+    */
+    std::vector<int64> delete_by(const Args&... args)
+    {
+        return DB_TABLE::delete_by(this->db_, true, args...);
+    }
+
+    template<typename... Sets, typename... Args>
+    /**
+    Command: update_by(const std::tuple<Sets...>& set, const Args&... args)
+    Set the columns of set in the records matching the conditions of find() with one statement.
+    Example: move the scheduled transactions of a payee to another one
+    Model_Billsdeposits::instance().update_by(std::make_tuple(Model_Billsdeposits::PAYEEID(to)), Model_Billsdeposits::PAYEEID(from))
+    * Returns the ids of the records changed.
+    */
+    std::vector<int64> update_by(const std::tuple<Sets...>& set, const Args&... args)
+    {
+        return DB_TABLE::update_by(this->db_, set, true, args...);
+    }
+
+    template<class... COLS>
+    /**
+    Command: search<[Column[, Column[, ...]]]>(const wxString& text[, int limit])
+    For the tables with a full-text index: the records holding words starting with each word of text.
+    Example: the payees as "Super Market" or "Marks Supermarket"
+    Model_Payee::instance().search<Model_Payee::PAYEENAME>("super mark")
+    * Returns the ids of the records, best match first, at most limit of them when limit is not negative.
+    */
+    std::vector<int64> search(const wxString& text, int limit = -1)
+    {
+        return DB_TABLE::template search<COLS...>(text, this->db_, limit);
+    }
+
+    /**
+    Command: balances([const wxString& day])
+    For the tables with a balance summary: the sums of the flows per key, of all the records
+    or of the records up to and including the ISO day, without reading the records.
+    Example: the balances of the accounts at the end of 2024
+    Model_Checking::instance().balances("2024-12-31")
+    * Returns a map from key to its Balance, keys without records are absent.
+    */
+    auto balances(const wxString& day = wxEmptyString)
+    {
+        return DB_TABLE::balances(this->db_, day);
+    }
+
+    /**
+    Command: balance(int64 key)
+    For the tables with a balance summary: the Balance of all the records of the key, one summary row read.
+    */
+    auto balance(int64 key)
+    {
+        return DB_TABLE::balance(key, this->db_);
+    }
+
+    /**
+    Command: running_balances(int64 key)
+    For the tables with a balance summary: the running Balance of the key at the end of each day it has records.
+    */
+    auto running_balances(int64 key)
+    {
+        return DB_TABLE::running_balances(key, this->db_);
+    }
+
+    /**
+    Command: verify_balances([bool repair])
+    For the tables with a balance summary: compare it with a full recompute from the records,
+    and recompute it when repair is set.
+    * Returns the number of differences found, -1 when the check failed.
+    */
+    int verify_balances(bool repair = false)
+    {
+        return DB_TABLE::verify_balances(this->db_, repair);
+    }
+
+    template<class KEY>
+    /**
+    Command: series(const KEY& key)
+    For the history tables: the date ordered values of the key, read once and kept up to date.
+    Example: the rates of a currency
+    Model_CurrencyHistory::instance().series(currencyID)
+    * Returns the Series::Points of the key.
+    */
+    const auto& series(const KEY& key)
+    {
+        return DB_TABLE::series(key, this->db_);
+    }
+
+    template<class KEY>
+    /**
+    Command: on_or_before(const KEY& key, const wxString& date)
+    For the history tables: the value of the key on the ISO date or the last one before it.
+    * Returns the Series::Point, nullptr when the history of the key starts later.
+    */
+    auto on_or_before(const KEY& key, const wxString& date)
+    {
+        return DB_TABLE::on_or_before(key, date, this->db_);
+    }
+
+    template<class KEY>
+    /** As on_or_before() for each of the dates, returning missing where the history starts later. */
+    std::vector<double> on_or_before(const KEY& key, const std::vector<wxString>& dates, double missing)
+    {
+        return DB_TABLE::on_or_before(key, dates, missing, this->db_);
+    }
+
+    template<class... COLS, typename... Args>
+    /**
+    Command: select<Column[, Column[, ...]]>([const Args&... args])
+    As find(), but only the given columns are read. Without conditions all records are read.
+    Example:
+    Model_Checking::instance().select<Model_Checking::TRANSID, Model_Checking::TRANSAMOUNT>(Model_Checking::ACCOUNTID(2))
+    produces SQL statement: SELECT TRANSID, TRANSAMOUNT FROM CHECKINGACCOUNT_V1 WHERE ACCOUNTID = 2
+    * Returns a list of std::tuple rows holding the column values in the order given.
+    */
+    typename DB_Projection<COLS...>::Row_Set select(const Args&... args)
+    {
+        if constexpr (sizeof...(Args) == 0)
+        {
+            this->ensure(this->db_);
+            return DB_Projection<COLS...>::all(this, this->db_);
+        }
+        else
+            return DB_Projection<COLS...>::find(this, this->db_, true, args...);
+    }
+
+    template<class... COLS, typename... Args>
+    /**
+    Command: select_or<Column[, Column[, ...]]>(const Args&... args)
+    As find_or(), but only the given columns are read.
+    */
+    typename DB_Projection<COLS...>::Row_Set select_or(const Args&... args)
+    {
+        return DB_Projection<COLS...>::find(this, this->db_, false, args...);
+    }
+
     /**
     * Return the Data record pointer for the given ID
     * from either memory cache or the database.
@@ -198,8 +464,18 @@ public:
         return this->get(int64(id));
     }
 
+    /**
+    * Return the Data record pointers for the given IDs, reading all
+    * records missing from the memory cache in batched queries.
+    */
+    std::vector<typename DB_TABLE::Data*> get_many(const std::vector<int64>& ids)
+    {
+        return this->get_many(ids, this->db_);
+    }
+
     /**
     * Return the Data record for the given ID directly from the database, bypassing the cache.
+    * The caller owns the record, nullptr is returned when not found.
     */
     typename DB_TABLE::Data* get_record(int64 id)
     {
@@ -215,29 +491,28 @@ public:
 
     /**
     * Save all Data record memory instances contained
-    * in the record list (Data_Set) to the database.
+    * in the record list (Data_Set) to the database,
+    * in one transaction with one prepared statement.
     */
     template<class DATA>
     int save(std::vector<DATA>& rows)
     {
-        this->Savepoint();
+        std::vector<DATA*> entities;
+        entities.reserve(rows.size());
         for (auto& r : rows)
         {
             if (r.id() < 0)
                 wxLogDebug("Incorrect function call to save %s", r.to_json().utf8_str());
-            this->save(&r);
+            entities.push_back(&r);
         }
-        this->ReleaseSavepoint();
 
-        return rows.size();
+        return this->save(entities);
     }
 
     template<class DATA>
     int save(std::vector<DATA*>& rows)
     {
-        this->Savepoint();
-        for (auto& r : rows) this->save(r);
-        this->ReleaseSavepoint();
+        this->save_all(rows, this->db_);
 
         return rows.size();
     }
@@ -249,14 +524,11 @@ public:
     }
 
 public:
+    /** Fill the memory cache with up to max_num records, read in a single scan. */
     void preload(int max_num = 1000)
     {
-        int i = 0;
-        for (const auto & item : all())
-        {
-            get(item.id());
-            if (++i >= max_num) break;
-        }
+        this->ensure(this->db_);
+        DB_TABLE::preload(this->db_, max_num);
     }
 
     // Return accomulated table stats as a json string
@@ -277,6 +549,33 @@ public:
         json_writer.Int(this->miss_);
         json_writer.Key("skip");
         json_writer.Int(this->skip_);
+        json_writer.Key("stmt_hit");
+        json_writer.Int(this->stmt_hit_);
+        json_writer.Key("stmt_compile");
+        json_writer.Int(this->stmt_compile_);
+        json_writer.Key("memory");
+        json_writer.Uint64(this->memory_usage());
+        json_writer.Key("pool");
+        json_writer.Uint64(DB_Pool<typename DB_TABLE::Data>::instance().capacity());
+        json_writer.Key("resident_bytes");
+        json_writer.Uint64(this->resident_bytes_);
+        json_writer.Key("max_records");
+        json_writer.Uint64(this->max_records_);
+        json_writer.Key("max_bytes");
+        json_writer.Uint64(this->max_bytes_);
+        json_writer.Key("evict");
+        json_writer.Uint64(this->evict_);
+        json_writer.Key("evicted");
+        json_writer.Uint64(this->evicted_.size());
+        json_writer.Key("ops");
+        json_writer.StartObject();
+        for (int op = 0; op < DB_OP_size; ++op)
+        {
+            if (this->op_stats_[op].calls_ == 0) continue;
+            json_writer.Key(db_op_name(op));
+            this->op_stats_[op].as_json(json_writer);
+        }
+        json_writer.EndObject();
         json_writer.EndObject();
 
         wxLogDebug("======== Model.h : GetTableStatsAsJson =======");
@@ -287,16 +586,32 @@ public:
 
     void destroyCache()
     {
-        if (this->cache_.size() > 0) this->destroy_cache();
+        if (this->cache_.size() > 0 || this->stmt_cache_.size() > 0 || this->evicted_.size() > 0) this->destroy_cache();
+    }
+
+    /** Bound the memory cache by record count and/or estimated bytes, 0 for unbounded */
+    void cacheBudget(size_t max_records, size_t max_bytes = 0)
+    {
+        this->cache_budget(max_records, max_bytes);
+    }
+
+    /** Free the records evicted from the memory cache, call it where no record pointer is held */
+    void releaseEvicted()
+    {
+        this->release_evicted();
     }
 
     /** Show table statistics*/
     void show_statistics() const
     {
-        wxLogDebug("%s : (cache %zu, index_by_id %zu, hit %zu, miss %zu, skip %zu)",
+        wxLogDebug("%s : (cache %zu, index_by_id %zu, hit %zu, miss %zu, skip %zu, stmt_hit %zu, stmt_compile %zu, memory %zu, per record %zu, resident_bytes %zu, evict %zu)",
             this->name(),
             this->cache_.size(),
             this->index_by_id_.size(),
-            this->hit_, this->miss_, this->skip_);
+            this->hit_, this->miss_, this->skip_,
+            this->stmt_hit_, this->stmt_compile_,
+            this->memory_usage(),
+            this->cache_.empty() ? 0 : this->memory_usage() / this->cache_.size(),
+            this->resident_bytes_, this->evict_);
     }
 };
@@ -220,13 +220,8 @@ const Model_Billsdeposits::Data_Set Model_Account::billsdeposits(const Data& r)
 
 double Model_Account::balance(const Data* r)
 {
-    double sum = r->INITIALBAL;
-    for (const auto& tran: transactionsByDateTimeId(r))
-    {
-        sum += Model_Checking::account_flow(tran, r->ACCOUNTID); 
-    }
-
-    return sum;
+    // the summary kept by the triggers of CHECKINGACCOUNT_V1 holds the sum of account_flow()
+    return r->INITIALBAL + Model_Checking::instance().balance(r->ACCOUNTID).flow_;
 }
 
 double Model_Account::balance(const Data& r)
@@ -290,10 +285,9 @@ bool Model_Account::FAVORITEACCT(const Data& r)
 bool Model_Account::is_used(const Model_Currency::Data* c)
 {
     if (!c) return false;
-    const auto &accounts = Model_Account::instance().find(
+    return Model_Account::instance().count(
         CURRENCYID(c->CURRENCYID),
-        STATUS(STATUS_ID_CLOSED, NOT_EQUAL));
-    return !accounts.empty();
+        STATUS(STATUS_ID_CLOSED, NOT_EQUAL)) > 0;
 }
 
 bool Model_Account::is_used(const Model_Currency::Data& c)
@@ -303,21 +297,19 @@ bool Model_Account::is_used(const Model_Currency::Data& c)
 
 int Model_Account::money_accounts_num()
 {
-    return
-        Model_Account::instance().find(ACCOUNTTYPE(TYPE_NAME_CASH)).size()
-        + Model_Account::instance().find(ACCOUNTTYPE(TYPE_NAME_CHECKING)).size()
-        + Model_Account::instance().find(ACCOUNTTYPE(TYPE_NAME_CREDIT_CARD)).size()
-        + Model_Account::instance().find(ACCOUNTTYPE(TYPE_NAME_LOAN)).size()
-        + Model_Account::instance().find(ACCOUNTTYPE(TYPE_NAME_TERM)).size()
-        + Model_Account::instance().find(ACCOUNTTYPE(TYPE_NAME_ASSET)).size()
-        + Model_Account::instance().find(ACCOUNTTYPE(TYPE_NAME_SHARES)).size();
+    return static_cast<int>(Model_Account::instance().count_or(
+        ACCOUNTTYPE(TYPE_NAME_CASH),
+        ACCOUNTTYPE(TYPE_NAME_CHECKING),
+        ACCOUNTTYPE(TYPE_NAME_CREDIT_CARD),
+        ACCOUNTTYPE(TYPE_NAME_LOAN),
+        ACCOUNTTYPE(TYPE_NAME_TERM),
+        ACCOUNTTYPE(TYPE_NAME_ASSET),
+        ACCOUNTTYPE(TYPE_NAME_SHARES)).GetValue());
 }
 
 bool Model_Account::Exist(const wxString& account_name)
 {
-    Data_Set list = instance().find(ACCOUNTNAME(account_name));
-
-    return !list.empty();
+    return instance().count(ACCOUNTNAME(account_name)) > 0;
 }
 
 wxDateTime Model_Account::DateOf(const wxString& date_str)
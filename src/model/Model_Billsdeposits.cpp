@@ -103,8 +103,8 @@ Model_Checking::STATUS_ID Model_Billsdeposits::status_id(const Data& r)
 */
 bool Model_Billsdeposits::remove(int64 id)
 {
-    for (auto &item : Model_Billsdeposits::split(get(id)))
-        Model_Budgetsplittransaction::instance().remove(item.SPLITTRANSID);
+    for (const auto& split_id : Model_Budgetsplittransaction::instance().delete_by(Model_Budgetsplittransaction::TRANSID(id)))
+        Model_Taglink::instance().DeleteAllTags(Model_Budgetsplittransaction::refTypeName, split_id);
     // Delete tags for the scheduled transaction
     Model_Taglink::instance().DeleteAllTags(this->refTypeName, id);
     return this->remove(id, db_);
@@ -228,25 +228,28 @@ bool Model_Category::has_income(int64 id)
 {
     double sum = 0.0;
     auto splits = Model_Splittransaction::instance().get_all();
-    for (const auto& tran: Model_Checking::instance().find(Model_Checking::CATEGID(id)))
+    const auto trans = Model_Checking::instance().select<DB_Table_CHECKINGACCOUNT_V1::TRANSID
+        , DB_Table_CHECKINGACCOUNT_V1::TRANSCODE, DB_Table_CHECKINGACCOUNT_V1::TRANSAMOUNT
+        , DB_Table_CHECKINGACCOUNT_V1::DELETEDTIME>(Model_Checking::CATEGID(id));
+    for (const auto& [trans_id, trans_code, trans_amount, deleted_time] : trans)
     {
-        if (!tran.DELETEDTIME.IsEmpty()) continue;
+        if (!deleted_time.IsEmpty()) continue;
 
-        switch (Model_Checking::type_id(tran))
+        switch (Model_Checking::type_id(trans_code))
         {
         case Model_Checking::TYPE_ID_WITHDRAWAL:
-            sum -= tran.TRANSAMOUNT;
+            sum -= trans_amount;
             break;
         case Model_Checking::TYPE_ID_DEPOSIT:
-            sum += tran.TRANSAMOUNT;
+            sum += trans_amount;
         case Model_Checking::TYPE_ID_TRANSFER:
         default:
             break;
         }
 
-        for (const auto& split: splits[tran.id()])
+        for (const auto& split: splits[trans_id])
         {
-            switch (Model_Checking::type_id(tran))
+            switch (Model_Checking::type_id(trans_code))
             {
             case Model_Checking::TYPE_ID_WITHDRAWAL:
                 sum -= split.SPLITTRANSAMOUNT;
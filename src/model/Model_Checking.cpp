@@ -23,6 +23,7 @@
 #include "Model_Payee.h"
 #include "Model_Category.h"
 #include <queue>
+#include <set>
 #include "Model_Tag.h"
 #include "Model_Translink.h"
 #include "Model_CustomFieldData.h"
@@ -95,10 +96,9 @@ Model_Checking& Model_Checking::instance()
 
 bool Model_Checking::remove(int64 id)
 {
-    //TODO: remove all split at once
-    //Model_Splittransaction::instance().remove(Model_Splittransaction::instance().find(Model_Splittransaction::TRANSID(id)));
-    for (const auto& r : Model_Splittransaction::instance().find(Model_Splittransaction::TRANSID(id)))
-        Model_Splittransaction::instance().remove(r.SPLITTRANSID);
+    // remove all splits at once, then their tags
+    for (const auto& split_id : Model_Splittransaction::instance().delete_by(Model_Splittransaction::TRANSID(id)))
+        Model_Taglink::instance().DeleteAllTags(Model_Splittransaction::refTypeName, split_id);
     if(foreignTransaction(*instance().get(id))) Model_Translink::RemoveTranslinkEntry(id);
 
     const wxString& RefType = Model_Checking::refTypeName;
@@ -110,39 +110,65 @@ bool Model_Checking::remove(int64 id)
     return this->remove(id, db_);
 }
 
-int64 Model_Checking::save(Data* r)
+// Stamp LASTUPDATEDTIME on a new record or a changed record which is not deleted
+static void touch(Model_Checking::Data* r, const Model_Checking::Data* oldData)
 {
-    wxSharedPtr<Data> oldData(instance().get_record(r->TRANSID));
     if (!oldData || (!oldData->equals(r) && oldData->DELETEDTIME.IsEmpty() && r->DELETEDTIME.IsEmpty()))
         r->LASTUPDATEDTIME = wxDateTime::Now().ToUTC().FormatISOCombined();
-    this->save(r, db_);
+}
+
+int64 Model_Checking::save(Data* r)
+{
+    // the cached record holds the stored values of r, unless r is that record edited in place
+    const Data* stored = cached_other(r);
+    wxSharedPtr<Data> oldData;
+    if (!stored)
+    {
+        oldData.reset(this->get_record(r->TRANSID, db_));
+        stored = oldData.get();
+    }
+    touch(r, stored);
+    this->save(r, db_, stored);
     return r->TRANSID;
 }
 
 int Model_Checking::save(std::vector<Data>& rows)
 {
-    this->Savepoint();
+    std::vector<Data*> entities;
+    entities.reserve(rows.size());
     for (auto& r : rows)
-    {
-        if (r.id() < 0)
-            wxLogDebug("Incorrect function call to save %s", r.to_json().utf8_str());
-        save(&r);
-    }
-    this->ReleaseSavepoint();
+        entities.push_back(&r);
 
-    return rows.size();
+    return save(entities);
 }
 
 int Model_Checking::save(std::vector<Data*>& rows)
 {
-    this->Savepoint();
+    // the stored values of the records not cached apart from them are read with one query per chunk of ids
+    std::vector<int64> ids;
+    for (const auto& r : rows)
+    {
+        if (!cached_other(r))
+            ids.push_back(r->TRANSID);
+    }
+    const auto records = this->get_records(ids, db_);
+
+    std::vector<const Data*> stored;
+    stored.reserve(rows.size());
     for (auto& r : rows)
     {
         if (r->id() < 0)
             wxLogDebug("Incorrect function call to save %s", r->to_json().utf8_str());
-        save(r);
+        const Data* oldData = cached_other(r);
+        if (!oldData)
+        {
+            auto it = records.find(r->TRANSID);
+            oldData = it != records.end() ? &it->second : nullptr;
+        }
+        touch(r, oldData);
+        stored.push_back(oldData);
     }
-    this->ReleaseSavepoint();
+    this->save_all(rows, db_, stored);
 
     return rows.size();
 }
@@ -158,6 +184,50 @@ const Model_Checking::Data_Set Model_Checking::allByDateTimeId()
     return trans;
 }
 
+/**
+* Return the ids of the transactions with words starting with each word of text in their
+* notes or number, then of the transactions of the payees and categories so named,
+* looked up in the full-text indexes. The best matches of each come first.
+*/
+const wxArrayInt64 Model_Checking::searchText(const wxString& text)
+{
+    wxArrayInt64 trans_ids = instance().search(text);
+    std::set<int64> found(trans_ids.begin(), trans_ids.end());
+    auto add = [&](int64 id) {
+        if (found.insert(id).second)
+            trans_ids.push_back(id);
+    };
+
+    const wxArrayInt64 payee_ids = Model_Payee::instance().search(text);
+    auto payee_trans = instance().find_children<PAYEEID>(payee_ids);
+    for (const auto& payee_id : payee_ids)
+    {
+        for (const auto& tran : payee_trans[payee_id])
+            add(tran.TRANSID);
+    }
+
+    wxArrayInt64 categ_ids;
+    for (const auto& categ_id : Model_Category::instance().search(text))
+    {
+        const Model_Category::Data* category = Model_Category::instance().get(categ_id);
+        if (!category) continue;
+        categ_ids.push_back(categ_id);
+        for (const auto& sub : Model_Category::sub_tree(category))
+            categ_ids.push_back(sub.CATEGID);
+    }
+    auto categ_trans = instance().find_children<CATEGID>(categ_ids);
+    auto categ_splits = Model_Splittransaction::instance().find_children<Model_Splittransaction::CATEGID>(categ_ids);
+    for (const auto& categ_id : categ_ids)
+    {
+        for (const auto& tran : categ_trans[categ_id])
+            add(tran.TRANSID);
+        for (const auto& split : categ_splits[categ_id])
+            add(split.TRANSID);
+    }
+
+    return trans_ids;
+}
+
 const Model_Splittransaction::Data_Set Model_Checking::split(const Data* r)
 {
     return Model_Splittransaction::instance().find(Model_Splittransaction::TRANSID(r->TRANSID));
@@ -505,11 +575,11 @@ void Model_Checking::getEmptyData(Data &data, int64 accountID)
     wxString max_trx_date;
     if (Option::instance().getTransDateDefault() != Option::NONE)
     {
-        auto trans = instance().find_or(ACCOUNTID(accountID), TOACCOUNTID(accountID));
+        const auto trans = instance().select_or<DB_Table_CHECKINGACCOUNT_V1::TRANSDATE, DB_Table_CHECKINGACCOUNT_V1::DELETEDTIME>(ACCOUNTID(accountID), TOACCOUNTID(accountID));
 
-        for (const auto& t: trans) {
-            if (t.DELETEDTIME.IsNull() && max_trx_date < t.TRANSDATE && today_date >= t.TRANSDATE) {
-                max_trx_date = t.TRANSDATE;
+        for (const auto& [trans_date, deleted_time] : trans) {
+            if (deleted_time.IsNull() && max_trx_date < trans_date && today_date >= trans_date) {
+                max_trx_date = trans_date;
             }
         }
     }
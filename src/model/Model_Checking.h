@@ -210,8 +210,8 @@ public:
     int save(std::vector<Data>& rows);
     int save(std::vector<Data*>& rows);
     void updateTimestamp(int64 id);
-public:
     static const Model_Checking::Data_Set allByDateTimeId();
+    static const wxArrayInt64 searchText(const wxString& text);
     static const Split_Data_Set split(const Data* r);
     static const Split_Data_Set split(const Data& r);
 
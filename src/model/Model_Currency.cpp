@@ -162,13 +162,14 @@ std::map<wxDateTime, int> Model_Currency::DateUsed(int64 CurrencyID)
         }
         else
         {
-            for (const auto& tran : Model_Checking::instance()
-                .find_or(Model_Checking::ACCOUNTID(account.ACCOUNTID)
-                , Model_Checking::TOACCOUNTID(account.ACCOUNTID)))
+            Model_Checking::instance().find_or_each([&](const Model_Checking::Data& tran)
             {
                 dt.ParseDate(tran.TRANSDATE);
                 datesList[dt] = 1;
+                return true;
             }
+            , Model_Checking::ACCOUNTID(account.ACCOUNTID)
+            , Model_Checking::TOACCOUNTID(account.ACCOUNTID));
         }
     }
     return datesList;
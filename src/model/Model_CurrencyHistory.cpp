@@ -37,6 +37,7 @@ Model_CurrencyHistory& Model_CurrencyHistory::instance(wxSQLite3Database* db)
 {
     Model_CurrencyHistory& ins = Singleton<Model_CurrencyHistory>::instance();
     ins.db_ = db;
+    ins.destroy_cache();
     ins.ensure(db);
 
     return ins;
@@ -108,49 +109,66 @@ double Model_CurrencyHistory::getDayRate(int64 currencyID, const wxDate& Date)
     if (!Option::instance().getUseCurrencyHistory())
         return Model_Currency::instance().get(currencyID)->BASECONVRATE;
 
-    Model_CurrencyHistory::Data_Set Data = Model_CurrencyHistory::instance().find(Model_CurrencyHistory::CURRENCYID(currencyID), Model_CurrencyHistory::CURRDATE(Date));
-    if (!Data.empty())
-    {
-        //Rate found for specified day
-        return Data.back().CURRVALUE;
-    }
-    else if (Model_CurrencyHistory::instance().find(Model_CurrencyHistory::CURRENCYID(currencyID)).size() > 0)
-    {
-        //Rate not found for specified day, look at previous and next
-        Model_CurrencyHistory::Data_Set DataPrevious = Model_CurrencyHistory::instance().find(Model_CurrencyHistory::CURRENCYID(currencyID), Model_CurrencyHistory::CURRDATE(Date, LESS_OR_EQUAL));
-        Model_CurrencyHistory::Data_Set DataNext = Model_CurrencyHistory::instance().find(Model_CurrencyHistory::CURRENCYID(currencyID), Model_CurrencyHistory::CURRDATE(Date, GREATER_OR_EQUAL));
-
-        if (!DataPrevious.empty() && !DataNext.empty())
-        {
-            const wxTimeSpan spanPast = Date.Subtract(Model::to_date(DataPrevious.back().CURRDATE));
-            const wxTimeSpan spanFuture = Model::to_date(DataNext[0].CURRDATE).Subtract(Date);
-
-            return spanPast <= spanFuture ? DataPrevious.back().CURRVALUE : DataNext[0].CURRVALUE;
-        }
-        else if (!DataPrevious.empty())
-        {
-            return DataPrevious.back().CURRVALUE;
-        }
-        else if (!DataNext.empty())
-        {
-            return DataNext[0].CURRVALUE;
-        }
-    }
+    const Series::Points& points = Model_CurrencyHistory::instance().series(currencyID);
+    if (!points.empty())
+        return nearestRate(points, Series::upper(points, Date.FormatISODate()), Date);
 
     return Model_Currency::instance().get(currencyID)->BASECONVRATE;
 }
 
+/** Return the rates for a specific currency in each of the days, as getDayRate() */
+std::vector<double> Model_CurrencyHistory::getDayRates(int64 currencyID, const std::vector<wxDate>& Dates)
+{
+    if (currencyID == Model_Currency::GetBaseCurrency()->CURRENCYID || currencyID == -1)
+        return std::vector<double>(Dates.size(), 1);
+
+    if (!Option::instance().getUseCurrencyHistory())
+        return std::vector<double>(Dates.size(), Model_Currency::instance().get(currencyID)->BASECONVRATE);
+
+    const Series::Points& points = Model_CurrencyHistory::instance().series(currencyID);
+    if (points.empty())
+        return std::vector<double>(Dates.size(), Model_Currency::instance().get(currencyID)->BASECONVRATE);
+
+    std::vector<wxString> DatesISO;
+    DatesISO.reserve(Dates.size());
+    for (const auto& Date : Dates)
+        DatesISO.push_back(Date.FormatISODate());
+
+    const std::vector<size_t> upper = Series::upper(points, DatesISO);
+    std::vector<double> rates;
+    rates.reserve(Dates.size());
+    for (size_t i = 0; i < Dates.size(); i++)
+        rates.push_back(nearestRate(points, upper[i], Dates[i]));
+    return rates;
+}
+
+/** Return the rate of the nearest day, the previous one when both are as near */
+double Model_CurrencyHistory::nearestRate(const Series::Points& points, size_t upper, const wxDate& Date)
+{
+    // points[upper - 1] is the rate on or before the day, points[upper] the one after it
+    if (upper == 0)
+        return points[0].value_;
+    if (upper == points.size())
+        return points.back().value_;
+
+    const Series::Point& previous = points[upper - 1];
+    const Series::Point& next = points[upper];
+    const wxTimeSpan spanPast = Date.Subtract(Model::to_date(previous.date_));
+    const wxTimeSpan spanFuture = Model::to_date(next.date_).Subtract(Date);
+
+    return spanPast <= spanFuture ? previous.value_ : next.value_;
+}
+
 /** Return the last rate for specified currency */
 double Model_CurrencyHistory::getLastRate(const int64& currencyID)
 {
     if (!Option::instance().getUseCurrencyHistory())
         return Model_Currency::instance().get(currencyID)->BASECONVRATE;
 
-    Model_CurrencyHistory::Data_Set histData = Model_CurrencyHistory::instance().find(Model_CurrencyHistory::CURRENCYID(currencyID));
-    std::stable_sort(histData.begin(), histData.end(), SorterByCURRDATE());
+    const Series::Points& points = Model_CurrencyHistory::instance().series(currencyID);
 
-    if (!histData.empty())
-        return histData.back().CURRVALUE;
+    if (!points.empty())
+        return points.back().value_;
     else
     {
         Model_Currency::Data* Currency = Model_Currency::instance().get(currencyID);
@@ -60,11 +60,17 @@ public:
     static double getDayRate(int64 currencyID, const wxString& DateISO);
     static double getDayRate(int64 currencyID, const wxDate& Date = wxDate::Today());
 
+    /** Return the rates for a specific currency in each of the days, with one pass over its history */
+    static std::vector<double> getDayRates(int64 currencyID, const std::vector<wxDate>& Dates);
+
     /** Return the last rate for a specific currency */
     static double getLastRate(const int64& currencyID);
     
     /** Clears the currency History table */
     static void ResetCurrencyHistory();
+
+private:
+    static double nearestRate(const Series::Points& points, size_t upper, const wxDate& Date);
 };
 
 #endif // 
@@ -115,16 +115,18 @@ const std::map<wxString, int64> Model_Payee::used_payee()
         cache[p.PAYEEID] = p.PAYEENAME;
 
     std::map<wxString, int64> payees;
-    for (const auto &t : Model_Checking::instance().all())
+    Model_Checking::instance().each([&](const Model_Checking::Data& t)
     {
         if (cache.count(t.PAYEEID) > 0)
             payees[cache[t.PAYEEID]] = t.PAYEEID;
-    }
-    for (const auto& b : Model_Billsdeposits::instance().all())
+        return true;
+    });
+    Model_Billsdeposits::instance().each([&](const Model_Billsdeposits::Data& b)
     {
         if (cache.count(b.PAYEEID) > 0)
             payees[cache[b.PAYEEID]] = b.PAYEEID;
-    }
+        return true;
+    });
     return payees;
 }
 
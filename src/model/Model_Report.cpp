@@ -234,42 +234,121 @@ bool Model_Report::PrepareSQL(wxString& sql, std::map <wxString, wxString>& rep_
 
 int Model_Report::get_html(const Data* r, wxString& out)
 {
-    wxString sql = r->SQLCONTENT;
-    wxString templatecontent = r->TEMPLATECONTENT;
-    if (templatecontent.empty()) {
-        out = _t("Template is empty");
-        return 3;
+    std::shared_ptr<Execution> e = prepare(r);
+    run(*e, this->db_);
+    record(*e);
+    out = e->out;
+    return e->status;
+}
+
+std::shared_ptr<Model_Report::Execution> Model_Report::prepare(const Data* r)
+{
+    std::shared_ptr<Execution> e = std::make_shared<Execution>();
+    e->id = r->REPORTID;
+    e->name = r->REPORTNAME;
+    e->sql = r->SQLCONTENT;
+    e->lua = r->LUACONTENT;
+    e->timeout = Model_Setting::instance().getInt("REPORT_TIMEOUT", 600);
+    if (r->TEMPLATECONTENT.empty()) {
+        e->out = _t("Template is empty");
+        e->status = 3;
+        return e;
+    }
+
+    std::map <wxString, wxString> rep_params;
+    PrepareSQL(e->sql, rep_params);
+
+    e->report.reset(new mm_html_template(r->TEMPLATECONTENT));
+    r->to_template(*e->report);
+    for (const auto& item : rep_params)
+    {
+        e->vars[item.first.Upper().ToStdWstring()] = item.second;
+    }
+    auto p = mmex::getPathAttachment(mmAttachmentManage::InfotablePathSetting());
+    //javascript does not handle backslashs
+    p.Replace("\\", "\\\\");
+    e->vars[L"ATTACHMENTSFOLDER"] = p;
+    auto sep = wxString(wxFileName::GetPathSeparator());
+    sep.Replace("\\", "\\\\");
+    e->vars[L"FILESEPARATOR"] = sep;
+    e->vars[L"LANGUAGE"] = Option::instance().getLanguageCode();
+    e->vars[L"HTMLSCALE"] = wxString::Format("%d", Option::instance().getHtmlScale());
+    return e;
+}
+
+static double elapsed_ms(std::chrono::steady_clock::time_point& since)
+{
+    const auto now = std::chrono::steady_clock::now();
+    const double ms = std::chrono::duration<double, std::milli>(now - since).count();
+    since = now;
+    return ms;
+}
+
+static bool stopped(const Model_Report::Execution& e)
+{
+    return e.cancel || (e.timeout > 0 && std::chrono::steady_clock::now() - e.start > std::chrono::seconds(e.timeout));
+}
+
+/* Abort the statement running when the execution is cancelled or over its time */
+static int on_progress(void* e)
+{
+    return stopped(*static_cast<const Model_Report::Execution*>(e)) ? 1 : 0;
+}
+
+static int stop_status(Model_Report::Execution& e)
+{
+    if (e.cancel) {
+        e.out = _t("The report was cancelled");
+        e.status = Model_Report::ERR_CANCELLED;
+    }
+    else {
+        e.out = wxString::Format(_t("The report did not finish within %d seconds"), e.timeout);
+        e.status = Model_Report::ERR_TIMEOUT;
     }
+    return e.status;
+}
+
+int Model_Report::run(Execution& e, wxSQLite3Database* db)
+{
+    e.start = std::chrono::steady_clock::now();
+    if (e.status != 0) return e.status;
+
+    DB_Trace& trace = DB_Trace::instance();
+    const long long start_ns = trace.now_ns();
+    auto lap = e.start;
+    sqlite3* handle = static_cast<sqlite3*>(db->GetDatabaseHandle());
+    sqlite3_progress_handler(handle, 10000, on_progress, &e);
+    struct Progress_Reset
+    {
+        sqlite3* handle_;
+        ~Progress_Reset() { sqlite3_progress_handler(handle_, 0, nullptr, nullptr); }
+    } progress_reset{handle};
 
+    wxSQLite3Statement stmt;
     wxSQLite3ResultSet q;
     int columnCount = 0;
-    std::map <wxString, wxString> rep_params;
     try
     {
-        PrepareSQL(sql, rep_params);
-
-        wxSQLite3Statement stmt = this->db_->PrepareStatement(sql);
+        stmt = db->PrepareStatement(e.sql);
         if (!stmt.IsReadOnly())
         {
-            out = wxString::Format(_t("The SQL script:\n%s\nwill modify database! Aborted!"), r->SQLCONTENT);
-            return -1;
-        }
-        else
-        {
-            q = stmt.ExecuteQuery();
-            columnCount = q.GetColumnCount();
+            e.out = wxString::Format(_t("The SQL script:\n%s\nwill modify database! Aborted!"), e.sql);
+            e.status = -1;
+            return e.status;
         }
+        q = stmt.ExecuteQuery();
+        columnCount = q.GetColumnCount();
     }
-    catch (const wxSQLite3Exception& e)
+    catch (const wxSQLite3Exception& ex)
     {
-        out = e.GetMessage();
-        return e.GetErrorCode();
+        if (stopped(e)) return stop_status(e);
+        e.out = ex.GetMessage();
+        e.status = ex.GetErrorCode();
+        return e.status;
     }
+    e.timing.query_ms = elapsed_ms(lap);
 
-    std::map <std::wstring, int> colHeaders;
-
-    mm_html_template report(templatecontent);
-    r->to_template(report);
+    html_template& report = *e.report;
     loop_t contents;
     loop_t errors;
     row_t error;
@@ -277,9 +356,7 @@ int Model_Report::get_html(const Data* r, wxString& out)
 
     for (int i = 0; i < columnCount; ++i)
     {
-        int col_type = q.GetColumnType(i);
         const std::wstring col_name = q.GetColumnName(i).ToStdWstring();
-        colHeaders[col_name] = col_type;
         row_t row;
         row(L"COLUMN") = col_name;
         columns += row;
@@ -294,58 +371,80 @@ int Model_Report::get_html(const Data* r, wxString& out)
         method("set", &Record::set).
         end().open().glue();
 
-    bool skip_lua = r->LUACONTENT.IsEmpty();
+    bool skip_lua = e.lua.IsEmpty();
 
-    bool lua_status = state.doString(std::string(r->LUACONTENT.ToUTF8()));
+    bool lua_status = state.doString(std::string(e.lua.ToUTF8()));
     if (!skip_lua && !lua_status)
     {
-        error(L"ERROR") = wxString("failed to doString : ") + r->LUACONTENT + wxString(" err: ") + wxString(state.lastError());
+        error(L"ERROR") = wxString("failed to doString : ") + e.lua + wxString(" err: ") + wxString(state.lastError());
         errors += error;
     }
-    else {
-        //state.doString(R"(sys_locale=os.setlocale("", "numeric"); print(os.setlocale("C", "numeric"));)");
-    }
 
-    while (q.NextRow())
+    // the rows are read by chunks, which then go through handle_record() into the template rows
+    std::vector<Record> chunk;
+    chunk.reserve(ROWS_CHUNK);
+    bool more = true;
+    while (more)
     {
-        Record rec;
-        for (int i = 0; i < columnCount; ++i)
+        chunk.clear();
+        try
         {
-            const wxString column_name = q.GetColumnName(i);
-            rec[column_name.ToStdWstring()] = q.GetAsString(i);
+            while (chunk.size() < ROWS_CHUNK && (more = q.NextRow()))
+            {
+                Record rec;
+                for (int i = 0; i < columnCount; ++i)
+                {
+                    const wxString column_name = q.GetColumnName(i);
+                    rec[column_name.ToStdWstring()] = q.GetAsString(i);
+                }
+                chunk.push_back(std::move(rec));
+            }
+        }
+        catch (const wxSQLite3Exception& ex)
+        {
+            if (stopped(e)) return stop_status(e);
+            e.out = ex.GetMessage();
+            e.status = ex.GetErrorCode();
+            return e.status;
         }
 
-        if (lua_status && !skip_lua)
+        for (auto& rec : chunk)
         {
-            try
-            {
-                state.invokeVoidFunction("handle_record", &rec);
-            }
-            catch (const std::runtime_error& e)
-            {
-                error(L"ERROR") = wxString("failed to call handle_record : ") + wxString(e.what());
-                errors += error;
-            }
-            catch (const std::exception& e)
+            if (lua_status && !skip_lua)
             {
-                error(L"ERROR") = wxString("failed to call handle_record : ") + wxString(e.what());
-                errors += error;
+                try
+                {
+                    state.invokeVoidFunction("handle_record", &rec);
+                }
+                catch (const std::runtime_error& ex)
+                {
+                    error(L"ERROR") = wxString("failed to call handle_record : ") + wxString(ex.what());
+                    errors += error;
+                }
+                catch (const std::exception& ex)
+                {
+                    error(L"ERROR") = wxString("failed to call handle_record : ") + wxString(ex.what());
+                    errors += error;
+                }
+                catch (...)
+                {
+                    error(L"ERROR") = L"failed to call handle_record ";
+                    errors += error;
+                }
             }
-            catch (...)
+            row_t row;
+            for (const auto& item : rec)
             {
-                error(L"ERROR") = L"failed to call handle_record ";
-                errors += error;
+                row(item.first) = item.second;
             }
+            contents += row;
         }
-        row_t row;
-        for (const auto& item : rec)
-        {
-            row(item.first) = item.second;
-        }
-        contents += row;
+        e.timing.rows += chunk.size();
 
+        if (stopped(e)) return stop_status(e);
     }
     q.Finalize();
+    e.timing.rows_ms = elapsed_ms(lap);
 
     Record result;
     if (lua_status && !skip_lua)
@@ -354,14 +453,14 @@ int Model_Report::get_html(const Data* r, wxString& out)
         {
             state.invokeVoidFunction("complete", &result);
         }
-        catch (const std::runtime_error& e)
+        catch (const std::runtime_error& ex)
         {
-            error(L"ERROR") = wxString("failed to call complete: ") + wxString(e.what());
+            error(L"ERROR") = wxString("failed to call complete: ") + wxString(ex.what());
             errors += error;
         }
-        catch (const std::exception& e)
+        catch (const std::exception& ex)
         {
-            error(L"ERROR") = wxString("failed to call complete: ") + wxString(e.what());
+            error(L"ERROR") = wxString("failed to call complete: ") + wxString(ex.what());
             errors += error;
         }
         catch (...)
@@ -374,44 +473,88 @@ int Model_Report::get_html(const Data* r, wxString& out)
     for (const auto& item : result)
         report(item.first) = item.second;
 
-    if (!skip_lua || lua_status) {
-        //state.doString(R"(print(os.setlocale(sys_locale, "numeric"));)");
-    }
-
     report(L"CONTENTS") = contents;
-    {
-        for (const auto& item : rep_params)
-        {
-            report(item.first.Upper().ToStdWstring()) = item.second;
-        }
-        auto p = mmex::getPathAttachment(mmAttachmentManage::InfotablePathSetting());
-        //javascript does not handle backslashs
-        p.Replace("\\", "\\\\");
-        report(L"ATTACHMENTSFOLDER") = p;
-        auto s = wxString(wxFileName::GetPathSeparator());
-        s.Replace("\\", "\\\\");
-        report(L"FILESEPARATOR") = s;
-        report(L"LANGUAGE") = Option::instance().getLanguageCode();
-        report(L"HTMLSCALE") = wxString::Format("%d", Option::instance().getHtmlScale());
-    }
+    for (const auto& item : e.vars)
+        report(item.first) = item.second;
     report(L"ERRORS") = errors;
 
     try
     {
-        out = report.Process();
+        e.out = report.Process();
+        e.status = 0;
     }
-    catch (const syntax_ex& e)
+    catch (const syntax_ex& ex)
     {
-        out = e.what();
-        return 1;
+        e.out = ex.what();
+        e.status = 1;
     }
     catch (...)
     {
-        out = _t("Caught exception");
-        return 2;
+        e.out = _t("Caught exception");
+        e.status = 2;
+    }
+    e.timing.render_ms = elapsed_ms(lap);
+
+    if (trace.enabled_)
+        trace.event(e.name, "report", start_ns, trace.now_ns() - start_ns);
+    return e.status;
+}
+
+class ReportThread : public wxThread
+{
+public:
+    ReportThread(std::shared_ptr<Model_Report::Execution> execution, DB_Reader_Pool* readers)
+        : wxThread(wxTHREAD_JOINABLE), m_execution(execution), m_readers(readers) {}
+
+protected:
+    virtual ExitCode Entry() override
+    {
+        {
+            // one snapshot of the database for the whole report
+            DB_Reader reader(*m_readers);
+            if (reader.ok())
+                Model_Report::run(*m_execution, reader.db());
+            else {
+                m_execution->out = _t("Unable to open the database for the report");
+                m_execution->status = SQLITE_CANTOPEN;
+            }
+        }
+        if (m_execution->done)
+            m_execution->done();
+        return static_cast<ExitCode>(0);
+    }
+
+private:
+    std::shared_ptr<Model_Report::Execution> m_execution;
+    DB_Reader_Pool* m_readers;
+};
+
+wxThread* Model_Report::start(std::shared_ptr<Execution> e, DB_Reader_Pool* readers)
+{
+    if (!readers) return nullptr;
+
+    ReportThread* thread = new ReportThread(e, readers);
+    if (thread->Run() != wxTHREAD_NO_ERROR)
+    {
+        delete thread;
+        return nullptr;
     }
+    return thread;
+}
 
-    return 0;
+void Model_Report::record(const Execution& e)
+{
+    Timing& timing = m_timings[e.id];
+    timing = e.timing;
+    timing.status = e.status;
+    wxLogDebug("Report %s: %d, %zu rows, query %.1f ms, rows %.1f ms, render %.1f ms"
+        , e.name, e.status, timing.rows, timing.query_ms, timing.rows_ms, timing.render_ms);
+}
+
+const Model_Report::Timing* Model_Report::timing(int64 id) const
+{
+    auto it = m_timings.find(id);
+    return it == m_timings.end() ? nullptr : &it->second;
 }
 
 Model_Report::Data* Model_Report::get(const wxString& name)
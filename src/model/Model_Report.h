@@ -21,6 +21,9 @@
 
 #include "Model.h"
 #include "db/DB_Table_Report_V1.h"
+#include <atomic>
+
+class wxThread;
 
 class Model_Report : public Model<DB_Table_REPORT_V1>
 {
@@ -47,10 +50,49 @@ public:
     static Model_Report& instance();
 
 public:
+    /** Timing of one execution of a report */
+    struct Timing
+    {
+        double query_ms = 0;  // preparing the statement and stepping to the first row
+        double rows_ms = 0;   // reading the rows and running handle_record() of the Lua script
+        double render_ms = 0; // complete() of the Lua script and processing the template
+        size_t rows = 0;
+        int status = 0;
+    };
+
+    /**
+    * One execution of a report. prepare() reads the report parameters and the template
+    * context on the UI thread, run() may then execute it on a worker with its own connection.
+    */
+    struct Execution
+    {
+        int64 id = -1;
+        wxString name, sql, lua;
+        std::unique_ptr<html_template> report;
+        std::map<std::wstring, wxString> vars; // the report parameters and settings set after complete()
+        int timeout = 0;                       // seconds, 0 for none
+        std::atomic<bool> cancel{false};
+        std::function<void()> done;            // called from the thread of start() once run() returned
+        wxString out;
+        int status = 0;
+        Timing timing;
+        std::chrono::steady_clock::time_point start;
+    };
+
+    /** Rows read from the query at once, cancellation and timeout are also checked between them */
+    static const int ROWS_CHUNK = 500;
+    enum { ERR_CANCELLED = -2, ERR_TIMEOUT = -3 };
+
     bool get_objects_from_sql(const wxString& query, PrettyWriter<StringBuffer>& json_writer);
     wxArrayString allGroupNames();
     int get_html(const Data* r, wxString& out);
     //wxString get_html(const Data& r);
+    std::shared_ptr<Execution> prepare(const Data* r);
+    static int run(Execution& e, wxSQLite3Database* db);
+    /** Run e on a joinable thread with a connection of readers, nullptr when none could be started */
+    static wxThread* start(std::shared_ptr<Execution> e, DB_Reader_Pool* readers);
+    void record(const Execution& e);
+    const Timing* timing(int64 id) const;
 
 public:
     Data* get(const wxString& name);
@@ -67,6 +109,7 @@ private:
         wxString name;
     };
     static const std::vector<Values> SqlPlaceHolders();
+    std::map<int64, Timing> m_timings;
 };
 
 #endif // 
@@ -108,8 +108,11 @@ int Model_Splittransaction::update(Data_Set& rows, int64 transactionID)
             }
             updateTimestamp = updateTimestamp || !match;
         }
-
-        instance().remove(split_item.SPLITTRANSID);
+    }
+    if (!split.empty())
+    {
+        for (const auto& split_id : instance().delete_by(TRANSID(transactionID)))
+            Model_Taglink::instance().DeleteAllTags(Model_Splittransaction::refTypeName, split_id);
     }
 
     if (!rows.empty())
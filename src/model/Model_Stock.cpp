@@ -118,11 +118,10 @@ Returns the last price date of a given stock
 wxString Model_Stock::lastPriceDate(const Self::Data* entity)
 {
     wxString dtStr = entity->PURCHASEDATE;
-    Model_StockHistory::Data_Set histData = Model_StockHistory::instance().find(SYMBOL(entity->SYMBOL));
+    const auto& histData = Model_StockHistory::instance().series(entity->SYMBOL);
 
-    std::sort(histData.begin(), histData.end(), SorterByDATE());
     if (!histData.empty())
-        dtStr = histData.back().DATE;
+        dtStr = histData.back().date_;
 
     return dtStr;
 }
@@ -139,34 +138,30 @@ double Model_Stock::getDailyBalanceAt(const Model_Account::Data *account, const
     for (const auto & stock : stocks)
     {
         wxString precValueDate, nextValueDate;
-        Model_StockHistory::Data_Set stock_hist = Model_StockHistory::instance().find(SYMBOL(stock.SYMBOL));
-        std::stable_sort(stock_hist.begin(), stock_hist.end(), SorterByDATE());
-        std::reverse(stock_hist.begin(), stock_hist.end());
+        const auto& stock_hist = Model_StockHistory::instance().series(stock.SYMBOL);
+        // stock_hist[upper - 1] is the price on or before the date requested
+        const size_t upper = Model_StockHistory::Series::upper(stock_hist, strDate);
 
         double valueAtDate = 0.0,  precValue = 0.0, nextValue = 0.0;
 
-        for (const auto & hist : stock_hist)
+        // test for the date requested
+        if (upper > 0 && stock_hist[upper - 1].date_ == strDate)
+        {
+            valueAtDate = stock_hist[upper - 1].value_;
+        }
+        else
         {
-            // test for the date requested
-            if (hist.DATE == strDate)
-            {
-                valueAtDate = hist.VALUE;
-                break;
-            }
             // if not found, search for previous and next date
-            if (precValue == 0.0 && hist.DATE < strDate)
+            for (size_t i = upper; i > 0 && precValue == 0.0; i--)
             {
-                precValue = hist.VALUE;
-                precValueDate = hist.DATE;
+                precValue = stock_hist[i - 1].value_;
+                precValueDate = stock_hist[i - 1].date_;
             }
-            if (hist.DATE > strDate)
+            if (upper < stock_hist.size())
             {
-                nextValue = hist.VALUE;
-                nextValueDate = hist.DATE;
+                nextValue = stock_hist[upper].value_;
+                nextValueDate = stock_hist[upper].date_;
             }
-            // end conditions: prec value assigned and price date < requested date
-            if (precValue != 0.0 && hist.DATE < strDate)
-                break;
         }
         if (valueAtDate == 0.0)
         {
@@ -336,12 +331,9 @@ void Model_Stock::UpdateCurrentPrice(const wxString& symbol, const double price)
 {
     double current_price = price;
     if (price == -1) {
-        Model_StockHistory::Data_Set histData = Model_StockHistory::instance().find(Model_StockHistory::SYMBOL(symbol));
+        const auto& histData = Model_StockHistory::instance().series(symbol);
         if (!histData.empty())
-        {
-            std::sort(histData.begin(), histData.end(), SorterByDATE());
-            current_price = histData.back().VALUE;
-        }
+            current_price = histData.back().value_;
     }
     if (current_price != -1)
     {
@@ -36,6 +36,7 @@ Model_StockHistory& Model_StockHistory::instance(wxSQLite3Database* db)
 {
     Model_StockHistory& ins = Singleton<Model_StockHistory>::instance();
     ins.db_ = db;
+    ins.destroy_cache();
     ins.ensure(db);
 
     return ins;
@@ -80,7 +81,8 @@ int64 Model_StockHistory::addUpdate(const wxString& symbol, const wxDate& date,
     stockHist->VALUE = price;
     stockHist->UPDTYPE = type;
 
-    if (Model_StockHistory::instance().find(Model_StockHistory::SYMBOL(symbol), Model_StockHistory::DATE(date, GREATER)).size() == 0) {
+    const Series::Points& points = this->series(symbol);
+    if (points.empty() || points.back().date_ <= stockHist->DATE) {
         Model_Stock::UpdateCurrentPrice(symbol, price);
     }
 
@@ -73,11 +73,7 @@ std::map<wxString, int64> Model_Taglink::get(const wxString& refType, int64 refI
 /* Delete all tags for a REFTYPE + REFID */
 void Model_Taglink::DeleteAllTags(const wxString& refType, int64 refID)
 {
-    const auto& links = instance().find(REFTYPE(refType), REFID(refID));
-    instance().Savepoint();
-    for (const auto& link : links)
-        instance().remove(link.TAGLINKID);
-    instance().ReleaseSavepoint();
+    instance().delete_by(REFTYPE(refType), REFID(refID));
 }
 
 int Model_Taglink::update(const Data_Set& rows, const wxString& refType, int64 refId)
@@ -105,9 +101,9 @@ int Model_Taglink::update(const Data_Set& rows, const wxString& refType, int64 r
             }
             updateTimestamp = updateTimestamp || !match;
         }
-
-        instance().remove(link.TAGLINKID);
     }
+    if (!links.empty())
+        instance().delete_by(REFTYPE(refType), REFID(refId));
 
     if (!rows.empty())
     {
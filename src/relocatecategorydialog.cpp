@@ -157,55 +157,35 @@ void relocateCategoryDialog::OnOk(wxCommandEvent& WXUNUSED(event))
     if (wxMessageBox(_t("Please Confirm:") + "\n" + info
         , _t("Merge categories confirmation"), wxOK | wxCANCEL | wxICON_INFORMATION) == wxOK)
     {
+        // transactions go through save(), so each one changed gets its LASTUPDATEDTIME
         auto transactions = Model_Checking::instance()
             .find(Model_Checking::CATEGID(m_sourceCatID));
-        auto checking_split = Model_Splittransaction::instance()
-            .find(Model_Splittransaction::CATEGID(m_sourceCatID));
-        auto billsdeposits = Model_Billsdeposits::instance()
-            .find(Model_Billsdeposits::CATEGID(m_sourceCatID));
-        auto budget = Model_Budget::instance()
-            .find(Model_Budget::CATEGID(m_sourceCatID));
-        auto budget_split = Model_Budgetsplittransaction::instance()
-            .find(Model_Budgetsplittransaction::CATEGID(m_sourceCatID));
-        auto payees = Model_Payee::instance()
-            .find(Model_Payee::CATEGID(m_sourceCatID));
-
         for (auto &entry : transactions)
         {
             entry.CATEGID = m_destCatID;
         }
         m_changedRecords += Model_Checking::instance().save(transactions);
 
-        for (auto &entry : billsdeposits)
-        {
-            entry.CATEGID = m_destCatID;
-        }
-        m_changedRecords += Model_Billsdeposits::instance().save(billsdeposits);
+        // the other records are moved with one statement per table
+        m_changedRecords += static_cast<int>(Model_Billsdeposits::instance().update_by(
+            std::make_tuple(Model_Billsdeposits::CATEGID(m_destCatID)),
+            Model_Billsdeposits::CATEGID(m_sourceCatID)).size());
 
-        for (auto &entry : checking_split)
-        {
-            entry.CATEGID = m_destCatID;
-        }
-        m_changedRecords += Model_Splittransaction::instance().save(checking_split);
+        m_changedRecords += static_cast<int>(Model_Splittransaction::instance().update_by(
+            std::make_tuple(Model_Splittransaction::CATEGID(m_destCatID)),
+            Model_Splittransaction::CATEGID(m_sourceCatID)).size());
 
-        for (auto &entry : payees)
-        {
-            entry.CATEGID = m_destCatID;
-        }
-        m_changedRecords += Model_Payee::instance().save(payees);
+        m_changedRecords += static_cast<int>(Model_Payee::instance().update_by(
+            std::make_tuple(Model_Payee::CATEGID(m_destCatID)),
+            Model_Payee::CATEGID(m_sourceCatID)).size());
         mmWebApp::MMEX_WebApp_UpdatePayee();
 
-        for (auto &entry : budget_split)
-        {
-            entry.CATEGID = m_destCatID;
-        }
-        m_changedRecords += Model_Budgetsplittransaction::instance().save(budget_split);
+        m_changedRecords += static_cast<int>(Model_Budgetsplittransaction::instance().update_by(
+            std::make_tuple(Model_Budgetsplittransaction::CATEGID(m_destCatID)),
+            Model_Budgetsplittransaction::CATEGID(m_sourceCatID)).size());
 
-        for (auto &entry : budget)
-        {
-            Model_Budget::instance().remove(entry.BUDGETENTRYID);
-            m_changedRecords++;
-        }
+        m_changedRecords += static_cast<int>(Model_Budget::instance().delete_by(
+            Model_Budget::CATEGID(m_sourceCatID)).size());
 
         if (cbDeleteSourceCategory_->IsChecked())
         {
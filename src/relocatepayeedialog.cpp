@@ -166,13 +166,10 @@ void relocatePayeeDialog::OnOk(wxCommandEvent& WXUNUSED(event))
         m_changed_records += Model_Checking::instance().save(transactions);
         Model_Checking::instance().ReleaseSavepoint();
 
-        Model_Billsdeposits::instance().Savepoint();
-        auto billsdeposits = Model_Billsdeposits::instance().find(Model_Billsdeposits::PAYEEID(sourcePayeeID_));
-        for (auto &entry : billsdeposits) {
-            entry.PAYEEID = destPayeeID_;
-        }
-        m_changed_records += Model_Billsdeposits::instance().save(billsdeposits);
-        Model_Billsdeposits::instance().ReleaseSavepoint();
+        m_changed_records += static_cast<int>(Model_Billsdeposits::instance().update_by(
+            std::make_tuple(Model_Billsdeposits::PAYEEID(destPayeeID_)),
+            Model_Billsdeposits::PAYEEID(sourcePayeeID_)
+        ).size());
 
         if (cbDeleteSourcePayee_->IsChecked())
         {
@@ -288,8 +288,15 @@ wxString mmGeneralReport::getHTMLText()
 {
     wxString out;
     int error = Model_Report::instance().get_html(this->m_report, out);
-    if (error != 0) {
-        const char* error_template = R"(
+    if (error != 0)
+        out = getErrorHTML(out);
+
+    return out;
+}
+
+wxString mmGeneralReport::getErrorHTML(const wxString& error)
+{
+    const char* error_template = R"(
 <!DOCTYPE html>
 <html lang="en">
 
@@ -317,12 +324,9 @@ wxString mmGeneralReport::getHTMLText()
     <h1 class="error"><TMPL_VAR ERROR></h1> </body>
 </html>
 )";
-        wxString html = error_template;
-        html.Replace("<TMPL_VAR ERROR>", out);
-        out.swap(html);
-    }
-
-    return out;
+    wxString html = error_template;
+    html.Replace("<TMPL_VAR ERROR>", error);
+    return html;
 }
  
 int mmGeneralReport::report_parameters()
@@ -136,6 +136,7 @@ public:
 public:
     wxString getHTMLText();
     virtual int report_parameters();
+    static wxString getErrorHTML(const wxString& error);
 
 private:
     const Model_Report::Data* m_report;
@@ -24,6 +24,7 @@
 #include "htmlbuilder.h"
 #include "model/allmodel.h"
 #include <algorithm>
+#include <set>
 
 mmHistoryItem::mmHistoryItem()
 {
@@ -190,6 +191,19 @@ wxString mmReportSummaryByDate::getHTMLText()
     }
     std::reverse(arDates.begin(), arDates.end());
 
+    // look up the rates of all the dates at once, with one pass over each currency history
+    std::set<int64> currencies;
+    for (const auto& account : Model_Account::instance().all())
+        currencies.insert(account.CURRENCYID);
+    for (const auto& asset : Model_Asset::instance().all())
+        currencies.insert(asset.CURRENCYID);
+    for (const auto& currencyid : currencies)
+    {
+        const std::vector<double> rates = Model_CurrencyHistory::getDayRates(currencyid, arDates);
+        for (size_t i = 0; i < arDates.size(); i++)
+            currencyDateRateCache[wxString::Format("%lld_%s", currencyid, arDates[i].FormatDate())] = rates[i];
+    }
+
     for (const auto & end_date : arDates)
     {
         double total = 0.0;
@@ -63,18 +63,12 @@ transactionsUpdateDialog::transactionsUpdateDialog(wxWindow* parent
     m_currency = Model_Currency::GetBaseCurrency(); // base currency if we need it
 
     // Determine the mix of transaction that have been selected
+    m_hasSplits = !Model_Splittransaction::instance().find_children<Model_Splittransaction::TRANSID>(m_transaction_id).empty();
     for (const auto& id : m_transaction_id)
     {
         Model_Checking::Data *trx = Model_Checking::instance().get(id);
         const bool isTransfer = Model_Checking::is_transfer(trx);
 
-        if (!m_hasSplits)
-        {
-            Model_Splittransaction::Data_Set split = Model_Splittransaction::instance().find(Model_Splittransaction::TRANSID(id));
-            if (!split.empty())
-                m_hasSplits = true;
-        }
-
         if (!m_hasTransfers && isTransfer)
             m_hasTransfers = true;
 
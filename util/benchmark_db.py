@@ -0,0 +1,441 @@
+#!/usr/bin/env python
+# vi:tabstop=4:expandtab:shiftwidth=4:softtabstop=4:autoindent:smarttab
+'''
+Usage: python benchmark_db.py [options] database [database ...]
+
+Replay the SQL issued by the DB_Table_*.h code generated by sqlite2cpp.py
+against one or more databases (for example files of increasing size made by
+fake.py) and report p50/p95/p99 latency and rows/s per table and operation.
+
+Operations (same SQL shapes as the generated code):
+    get       SELECT <all columns> FROM T WHERE <pk> = ?
+    get_many  SELECT <all columns> FROM T WHERE <pk> IN (?, ... 500 ids)
+    get_one   in memory scan of the cached rows, as done by the generated get_one()
+    all       SELECT <all columns> FROM T
+    all_sort  SELECT <all columns> FROM T ORDER BY <col> [COLLATE NOCASE] ASC
+    page      find_page(): walk the first pages of --page-size rows ordered by <col>, <pk> with keysets
+    find_by   SELECT <all columns> FROM T WHERE <first indexed column> = ?
+    find_each find() of the children of 500 parents one parent at a time, by the first parent key
+    children  find_children() of the same parents: SELECT <all columns> FROM T WHERE <parent> IN (?, ... 500 ids)
+    like      SELECT <pk> FROM T WHERE <text column> LIKE '%word%' OR ..., for the columns of the full-text index
+    search    search(): SELECT rowid FROM T_FTS WHERE T_FTS MATCH '"word"*' ORDER BY rank
+    flows     the flows of every account summed from the transactions, as Model_Account::balance() did
+    balances  balances(): SELECT <key>, FLOW, RECFLOW FROM T_BALANCE, kept by triggers
+    insert    INSERT INTO T(<columns>, <pk>) VALUES(?, ...)
+    save_all  the insert above for --batch rows with one statement in one transaction
+    update    UPDATE T SET <columns> = ? WHERE <pk> = ?
+    narrow    UPDATE T SET <last column> = ? WHERE <pk> = ?, as save() writes a record with one changed column
+    remove    DELETE FROM T WHERE <pk> = ?
+
+Startup (reported as table "startup", each run opens a new connection):
+    ensure       TableExists and CREATE INDEX IF NOT EXISTS for every table, as ensure() does
+    fingerprint  the single SCHEMA_FINGERPRINT lookup in INFOTABLE_V1 that skips them
+
+Writes run in autocommit mode, as the generated save() and remove() do, apart
+from save_all which runs as the generated save_all() does; the rows inserted
+by the run are updated and removed again, so the database ends up unchanged.
+Missing full-text indexes and balance summaries are created and filled first,
+as ensure() does, unless --read-only is given. The inserts, updates and removes
+then include the work of their triggers.
+
+Examples:
+    python benchmark_db.py --save baseline.json bench_1m.mmb bench_10m.mmb
+    python benchmark_db.py --baseline baseline.json bench_1m.mmb bench_10m.mmb
+'''
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import time
+
+from sqlite2cpp import get_table_list, get_table_info, get_index_list, get_parent_keys, is_nocase, fts_columns, fts_sql
+from sqlite2cpp import balance_summary, balance_sql
+
+get_many_chunk = 500 # DB_Table::GET_MANY_CHUNK
+
+default_tables = ('ACCOUNTLIST_V1', 'CATEGORY_V1', 'CHECKINGACCOUNT_V1', 'CURRENCYHISTORY_V1', 'PAYEE_V1',
+                  'SPLITTRANSACTIONS_V1', 'STOCKHISTORY_V1', 'TAGLINK_V1', 'ATTACHMENT_V1')
+
+def percentile(sorted_values, p):
+    """Return the p-th percentile (0-100) of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100.0
+    f = int(k)
+    c = min(f + 1, len(sorted_values) - 1)
+    return sorted_values[f] + (sorted_values[c] - sorted_values[f]) * (k - f)
+
+def summarize(samples, rows):
+    """Latency percentiles in milliseconds and throughput in rows per second"""
+    samples = sorted(samples)
+    total = sum(samples)
+    return {
+        'runs': len(samples),
+        'rows': rows,
+        'p50_ms': round(percentile(samples, 50) * 1000, 4),
+        'p95_ms': round(percentile(samples, 95) * 1000, 4),
+        'p99_ms': round(percentile(samples, 99) * 1000, 4),
+        'rows_per_s': round(rows / total, 1) if total else 0.0,
+    }
+
+def index_columns(sql):
+    """Return the column names of a CREATE INDEX statement"""
+    inside = sql[sql.index('(') + 1:sql.rindex(')')]
+    return [c.strip().split()[0] for c in inside.split(',')]
+
+class Table:
+    """Class: SQL shapes of one generated DB_Table"""
+    def __init__(self, cursor, name, parent_keys=()):
+        self.name = name
+        self.fields = get_table_info(cursor, name)
+        self.pk = [f['name'] for f in self.fields if f['pk']][0]
+        self.columns = [f['name'] for f in self.fields if not f['pk']]
+        self.indexes = [index_columns(sql) for sql in get_index_list(cursor, name)]
+        self.text_columns = [f['name'] for f in self.fields if f['type'] == 'TEXT']
+
+        select = 'SELECT %s FROM %s ' % (', '.join(f['name'] for f in self.fields), name)
+        self.sql_get = select + ' WHERE %s = ?' % self.pk
+        self.sql_get_many = select + ' WHERE %s IN (%s)' % (self.pk, ', '.join('?' * get_many_chunk))
+        self.sql_all = select
+        sort = self.indexes[0][0] if self.indexes else (self.text_columns or [self.pk])[0]
+        self.sql_all_sort = select + ' ORDER BY ' + self.order(sort) + ' ASC '
+        # pages follow a single column index, as a transaction list would follow TRANSDATE
+        sort = ([i[0] for i in self.indexes if len(i) == 1] or [sort])[0]
+        order = self.order(sort)
+        self.sort_position = [f['name'] for f in self.fields].index(sort)
+        self.pk_position = [f['name'] for f in self.fields].index(self.pk)
+        order_by = ' ORDER BY %s ASC, %s ASC LIMIT ? OFFSET ?' % (order, self.pk)
+        self.sql_page_first = select + order_by
+        self.sql_page_next = select + ' WHERE %s >= ? AND (%s > ? OR %s > ?)' % (order, order, self.pk) + order_by
+        # past a NULL, the rest of the NULLs then the values, as find_page() with Page::after_null_
+        self.sql_page_next_null = select + ' WHERE %s IS NULL AND %s > ? UNION ALL ' % (sort, self.pk) \
+            + select + ' WHERE %s IS NOT NULL' % sort + order_by
+        self.find_column = self.indexes[0][0] if self.indexes else None
+        self.sql_find_by = select + ' WHERE ' + self.find_column + ' = ? ' if self.find_column else None
+        self.parent_column = parent_keys[0] if parent_keys else None
+        if self.parent_column:
+            self.sql_find_parent = select + ' WHERE ' + self.parent_column + ' = ? '
+            self.sql_children = select + ' WHERE %s IN (%s)' % (self.parent_column, ', '.join('?' * get_many_chunk))
+        self.sql_insert = 'INSERT INTO %s(%s, %s) VALUES(%s)' % (
+            name, ', '.join(self.columns), self.pk, ', '.join('?' * len(self.fields)))
+        self.sql_update = 'UPDATE %s SET %s WHERE %s = ?' % (
+            name, ', '.join(c + ' = ?' for c in self.columns), self.pk)
+        self.sql_narrow = 'UPDATE %s SET %s = ? WHERE %s = ?' % (name, self.columns[-1], self.pk)
+        self.sql_remove = 'DELETE FROM %s WHERE %s = ?' % (name, self.pk)
+        self.fts = fts_columns.get(name)
+        if self.fts:
+            self.sql_like = 'SELECT %s FROM %s WHERE %s' % (self.pk, name, ' OR '.join(c + ' LIKE ?' for c in self.fts))
+            self.sql_search = 'SELECT rowid FROM %s_FTS WHERE %s_FTS MATCH ? ORDER BY rank' % (name, name)
+        self.balance = balance_summary.get(name)
+        if self.balance:
+            key = self.balance['key']
+            self.sql_flows = ('SELECT %s, TOACCOUNTID, TRANSCODE, STATUS, DELETEDTIME, SUM(TRANSAMOUNT), SUM(TOTRANSAMOUNT)'
+                              ' FROM %s WHERE %s = ? OR TOACCOUNTID = ? GROUP BY 1, 2, 3, 4, 5' % (key, name, key))
+            self.sql_balances = 'SELECT %s, FLOW, RECFLOW FROM %s_BALANCE' % (key, name)
+
+    def order(self, name):
+        """ORDER BY term of a column, as column_to_order() in the generated code"""
+        field = [f for f in self.fields if f['name'] == name][0]
+        return name + (' COLLATE NOCASE' if is_nocase(field) else '')
+
+class Benchmark:
+    """Class: Time the generated access patterns against one database"""
+    def __init__(self, path, args):
+        self._path = path
+        self._args = args
+        self._rng = random.Random(args.seed)
+        self._conn = sqlite3.connect(path, isolation_level=None)
+
+    def timed(self, fn, runs):
+        samples, rows = [], 0
+        for _ in range(runs):
+            started = time.perf_counter()
+            rows += fn()
+            samples.append(time.perf_counter() - started)
+        return summarize(samples, rows)
+
+    def query(self, sql, params=()):
+        return len(self._conn.execute(sql, params).fetchall())
+
+    def update(self, sql, params=()):
+        return self._conn.execute(sql, params).rowcount
+
+    def run_table(self, table):
+        args, rng, conn = self._args, self._rng, self._conn
+        count = conn.execute('SELECT COUNT(*) FROM %s' % table.name).fetchone()[0]
+        if not count:
+            return None
+
+        result = {'row_count': count}
+        ids = [r[0] for r in conn.execute('SELECT %s FROM %s ORDER BY RANDOM() LIMIT ?'
+                                          % (table.pk, table.name), (args.iterations,))]
+
+        pick = iter(rng.choice(ids) for _ in range(args.iterations))
+        result['get'] = self.timed(lambda: self.query(table.sql_get, (next(pick),)), args.iterations)
+
+        # a short chunk repeats its last id, as the generated get_many() does
+        def get_many():
+            chunk = [rng.choice(ids) for _ in range(min(get_many_chunk, len(ids)))]
+            return self.query(table.sql_get_many, chunk + chunk[-1:] * (get_many_chunk - len(chunk)))
+        result['get_many'] = self.timed(get_many, args.scan_iterations)
+
+        # find_page(): each page continues after the last record of the previous one
+        def page():
+            rows = self._conn.execute(table.sql_page_first, (args.page_size, 0)).fetchall()
+            total = len(rows)
+            for _ in range(args.pages - 1):
+                if not rows:
+                    break
+                last = rows[-1]
+                key, pk = last[table.sort_position], last[table.pk_position]
+                if key is None:
+                    rows = self._conn.execute(table.sql_page_next_null, (pk, args.page_size, 0)).fetchall()
+                else:
+                    rows = self._conn.execute(table.sql_page_next, (key, key, pk, args.page_size, 0)).fetchall()
+                total += len(rows)
+            return total
+        result['page'] = self.timed(page, args.scan_iterations)
+
+        result['all'] = self.timed(lambda: self.query(table.sql_all), args.scan_iterations)
+        result['all_sort'] = self.timed(lambda: self.query(table.sql_all_sort), args.scan_iterations)
+
+        if table.find_column:
+            values = [r[0] for r in conn.execute('SELECT %s FROM %s ORDER BY RANDOM() LIMIT ?'
+                                                 % (table.find_column, table.name), (args.iterations,))]
+            pick_value = iter(rng.choice(values) for _ in range(args.iterations))
+            result['find_by'] = self.timed(lambda: self.query(table.sql_find_by, (next(pick_value),)), args.iterations)
+
+            # get_one() walks index_by_id_ and calls match() on each cached row
+            if count <= args.get_one_limit:
+                cached = conn.execute(table.sql_all).fetchall()
+                position = [f['name'] for f in table.fields].index(table.find_column)
+                pick_value = iter(rng.choice(values) for _ in range(args.iterations))
+
+                def get_one():
+                    value = next(pick_value)
+                    key = value.lower() if isinstance(value, str) else value
+                    for row in cached:
+                        field = row[position]
+                        if (field.lower() if isinstance(field, str) else field) == key:
+                            return 1
+                    return 0
+                result['get_one'] = self.timed(get_one, args.iterations)
+
+        # one find() per parent against one find_children() for all of them
+        if table.parent_column:
+            parents = [r[0] for r in conn.execute('SELECT DISTINCT %s FROM %s ORDER BY RANDOM() LIMIT ?'
+                                                  % (table.parent_column, table.name), (get_many_chunk,))]
+            if parents:
+                result['find_each'] = self.timed(
+                    lambda: sum(self.query(table.sql_find_parent, (p,)) for p in parents), args.scan_iterations)
+                padded = parents + parents[-1:] * (get_many_chunk - len(parents))
+                result['children'] = self.timed(lambda: self.query(table.sql_children, padded), args.scan_iterations)
+
+        # a LIKE scan of the text columns against the full-text index, for words of the records
+        if table.fts and conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = ?",
+                                      (table.name + '_FTS',)).fetchone()[0]:
+            texts = conn.execute('SELECT %s FROM %s ORDER BY RANDOM() LIMIT ?'
+                                 % (table.fts[0], table.name), (args.iterations,)).fetchall()
+            words = [w for (t,) in texts for w in (t or '').split() if len(w) > 2 and '"' not in w]
+            if words:
+                pick_word = iter(rng.choice(words) for _ in range(args.iterations))
+                result['like'] = self.timed(
+                    lambda: self.query(table.sql_like, ['%' + next(pick_word) + '%'] * len(table.fts)), args.scan_iterations)
+                pick_word = iter(rng.choice(words) for _ in range(args.iterations))
+                result['search'] = self.timed(
+                    lambda: self.query(table.sql_search, ('"%s"*' % next(pick_word),)), args.iterations)
+
+        # the flows summed per account from the transactions against the summary kept by the triggers
+        if table.balance and conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = ?",
+                                          (table.name + '_BALANCE',)).fetchone()[0]:
+            accounts = [r[0] for r in conn.execute('SELECT DISTINCT %s FROM %s' % (table.balance['key'], table.name))]
+            result['flows'] = self.timed(
+                lambda: sum(self.query(table.sql_flows, (a, a)) for a in accounts), args.scan_iterations)
+            result['balances'] = self.timed(lambda: self.query(table.sql_balances), args.iterations)
+
+        if not args.read_only:
+            template = conn.execute(table.sql_get, (ids[0],)).fetchone()
+            first = conn.execute('SELECT MAX(%s) FROM %s' % (table.pk, table.name)).fetchone()[0] + 1
+            # text values get the new id appended so UNIQUE constraints hold
+            def values(new_id):
+                return [v + '#%d' % new_id if isinstance(v, str) else v
+                        for f, v in zip(table.fields, template) if not f['pk']] + [new_id]
+            try:
+                new_ids = iter(range(first, first + args.write_iterations))
+                result['insert'] = self.timed(lambda: self.update(table.sql_insert, values(next(new_ids))),
+                                              args.write_iterations)
+                new_ids = iter(range(first, first + args.write_iterations))
+                result['update'] = self.timed(lambda: self.update(table.sql_update, values(next(new_ids))),
+                                              args.write_iterations)
+                new_ids = iter(range(first, first + args.write_iterations))
+                result['narrow'] = self.timed(lambda: self.update(table.sql_narrow, values(next(new_ids))[-2:]),
+                                              args.write_iterations)
+                new_ids = iter(range(first, first + args.write_iterations))
+                result['remove'] = self.timed(lambda: self.update(table.sql_remove, (next(new_ids),)),
+                                              args.write_iterations)
+                # save_all(): one statement and one transaction per batch of new rows
+                batches = iter(range(first + args.write_iterations, first + args.write_iterations
+                                     + args.batch * args.scan_iterations, args.batch))
+                def save_all():
+                    start = next(batches)
+                    conn.execute('SAVEPOINT save_all')
+                    conn.executemany(table.sql_insert, (values(i) for i in range(start, start + args.batch)))
+                    conn.execute('RELEASE save_all')
+                    return args.batch
+                result['save_all'] = self.timed(save_all, args.scan_iterations)
+            except sqlite3.IntegrityError as e:
+                sys.stderr.write('%s: writes skipped, %s\n' % (table.name, e))
+            finally:
+                conn.execute('DELETE FROM %s WHERE %s >= ?' % (table.name, table.pk), (first,))
+        return result
+
+    def run_startup(self):
+        """Time the ensure() of every table on open against the schema fingerprint check"""
+        cursor = self._conn.cursor()
+        tables = [name for name, _ in get_table_list(cursor)]
+        indexes = []
+        for name in tables:
+            for sql in get_index_list(cursor, name):
+                words = sql.split()
+                words[2:2] = ['IF', 'NOT', 'EXISTS']
+                indexes.append(' '.join(words))
+
+        def ensure():
+            conn = sqlite3.connect(self._path, isolation_level=None)
+            for name in tables:
+                conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name LIKE ?", (name,)).fetchall()
+            for sql in indexes:
+                conn.execute(sql)
+            conn.close()
+            return len(tables)
+
+        def fingerprint():
+            conn = sqlite3.connect(self._path, isolation_level=None)
+            conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name LIKE ?", ('INFOTABLE_V1',)).fetchall()
+            rows = len(conn.execute("SELECT INFOVALUE FROM INFOTABLE_V1 WHERE INFONAME = 'SCHEMA_FINGERPRINT'").fetchall())
+            conn.close()
+            return rows
+
+        runs = self._args.startup_iterations
+        return {'ensure': self.timed(ensure, runs), 'fingerprint': self.timed(fingerprint, runs)}
+
+    def ensure_search(self, existing):
+        """Create and fill the missing full-text indexes and balance summaries, as the generated ensure() does"""
+        for name, columns in sorted(fts_columns.items()):
+            if name not in existing or name + '_FTS' in existing:
+                continue
+            if not self._args.quiet:
+                sys.stderr.write('%s: %s_FTS\n' % (os.path.basename(self._path), name))
+            pk = [f['name'] for f in get_table_info(self._conn.cursor(), name) if f['pk']][0]
+            for sql in fts_sql(name, pk, columns):
+                self._conn.execute(sql)
+            self._conn.execute("INSERT INTO %s_FTS(%s_FTS) VALUES ('rebuild')" % (name, name))
+        for name, spec in sorted(balance_summary.items()):
+            if name not in existing or name + '_BALANCE' in existing:
+                continue
+            if not self._args.quiet:
+                sys.stderr.write('%s: %s_BALANCE\n' % (os.path.basename(self._path), name))
+            create, fill, _ = balance_sql(name, spec)
+            for sql in create + fill:
+                self._conn.execute(sql)
+
+    def run(self):
+        if not self._args.quiet:
+            sys.stderr.write('%s: startup\n' % os.path.basename(self._path))
+        results = {'startup': self.run_startup()}
+        cursor = self._conn.cursor()
+        tables = get_table_list(cursor)
+        existing = set(name for name, _ in tables)
+        if not self._args.read_only:
+            self.ensure_search(existing)
+        parent_keys = get_parent_keys(cursor, tables)
+        for name in self._args.tables:
+            if name not in existing:
+                continue
+            if not self._args.quiet:
+                sys.stderr.write('%s: %s\n' % (os.path.basename(self._path), name))
+            r = self.run_table(Table(cursor, name, parent_keys[name]))
+            if r:
+                results[name] = r
+        self._conn.close()
+        return results
+
+def compare(baseline, current, threshold):
+    """Print per operation p50 changes, returning the list of regressions above threshold percent"""
+    regressions = []
+    for db, tables in sorted(current['databases'].items()):
+        for table, ops in sorted(tables.items()):
+            for op, now in sorted(ops.items()):
+                if not isinstance(now, dict):
+                    continue
+                before = baseline.get('databases', {}).get(db, {}).get(table, {}).get(op)
+                if not before or not before['p50_ms']:
+                    continue
+                change = (now['p50_ms'] - before['p50_ms']) * 100.0 / before['p50_ms']
+                flag = ''
+                if change > threshold:
+                    flag = '  REGRESSION'
+                    regressions.append((db, table, op, change))
+                print('%-16s %-22s %-9s p50 %10.4f -> %10.4f ms %+7.1f%%%s'
+                      % (db, table, op, before['p50_ms'], now['p50_ms'], change, flag))
+    return regressions
+
+def report(current):
+    for db, tables in sorted(current['databases'].items()):
+        for table, ops in sorted(tables.items()):
+            for op, r in sorted(ops.items()):
+                if not isinstance(r, dict):
+                    continue
+                print('%-16s %-22s %-9s p50 %9.4f p95 %9.4f p99 %9.4f ms %12.0f rows/s'
+                      % (db, table, op, r['p50_ms'], r['p95_ms'], r['p99_ms'], r['rows_per_s']))
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('databases', nargs='+', help='databases to benchmark, e.g. of increasing size')
+    parser.add_argument('--tables', nargs='+', default=default_tables, help='tables to benchmark')
+    parser.add_argument('--iterations', type=int, default=500, help='runs of point queries (default: %(default)s)')
+    parser.add_argument('--scan-iterations', type=int, default=3, help='runs of full table scans (default: %(default)s)')
+    parser.add_argument('--write-iterations', type=int, default=200, help='runs of insert/update/remove (default: %(default)s)')
+    parser.add_argument('--page-size', type=int, default=50, help='rows per find_page() page (default: %(default)s)')
+    parser.add_argument('--pages', type=int, default=20, help='pages walked per page run (default: %(default)s)')
+    parser.add_argument('--startup-iterations', type=int, default=20, help='runs of the startup checks (default: %(default)s)')
+    parser.add_argument('--batch', type=int, default=10000, help='rows per save_all run (default: %(default)s)')
+    parser.add_argument('--get-one-limit', type=int, default=200000, help='largest table for the get_one scan (default: %(default)s)')
+    parser.add_argument('--read-only', action='store_true', help='skip insert/update/remove')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: %(default)s)')
+    parser.add_argument('--save', help='write the results as baseline json')
+    parser.add_argument('--baseline', help='compare against a baseline json, exit 1 on regression')
+    parser.add_argument('--threshold', type=float, default=15.0, help='p50 regression threshold in percent (default: %(default)s)')
+    parser.add_argument('--quiet', action='store_true', help='do not report progress')
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args(sys.argv[1:])
+
+    current = {
+        'meta': {
+            'sqlite': sqlite3.sqlite_version,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'databases': {},
+    }
+    for path in args.databases:
+        current['databases'][os.path.basename(path)] = Benchmark(path, args).run()
+
+    report(current)
+
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump(current, fp, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as fp:
+            baseline = json.load(fp)
+        if compare(baseline, current, args.threshold):
+            sys.exit(1)
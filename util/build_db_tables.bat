@@ -7,18 +7,16 @@ set buildfile_name=sqlite2cpp.py
 set buildfile_location=../database/tables.sql
 @echo Generated DB_Tables files for MMEX
 @echo.
-python %buildfile_name% %buildfile_location% 
+REM Only the headers whose content changed are rewritten in ../src/db
+python %buildfile_name% %buildfile_location% ..\src\db
 @echo.
-@echo Confirm moving the generated files to correct the location
+@echo Confirm moving the generated patch files to correct the location
 @echo.
 @pause
 @cls
 @echo Generated files moved to correct location
 @echo.
-copy DB_Table*.* ..\src\db
-@echo.
 copy *.mmdbg ..\database
-del DB_Table*.*
 del *.mmdbg
 @echo -------------------------------------------
 @echo %buildfile_name% installation completed.
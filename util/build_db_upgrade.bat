@@ -10,14 +10,12 @@ set buildfile_location=../database/incremental_upgrade
 set actual_location=%buildfile_location%
 if not exist %actual_location% set actual_location=../%buildfile_location%
 @echo on
-python %buildfile_name% %actual_location%
+if %buildfile_location%==%actual_location% (
+    REM DB_Upgrade.h is only rewritten in ../src/db when its content changed
+    python %buildfile_name% %actual_location% ..\src\db
+) else (
+    python %buildfile_name% %actual_location%
+)
 @echo off
-if not %buildfile_location%==%actual_location% goto continue
-@echo copy DB_Upgrade.h files to src/db
-pause
-copy DB_Upgrade.h ..\src\db
-del DB_Upgrade.h
-@echo -------------------------------------------
-:continue
 @echo Build Completed for %buildfile_name%.
 pause
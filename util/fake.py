@@ -1,36 +1,377 @@
-import sys
+#!/usr/bin/env python
+# vi:tabstop=4:expandtab:shiftwidth=4:softtabstop=4:autoindent:smarttab
+'''
+Usage: python fake.py [options] path_to_database
+
+Fill a MMEX database with a reproducible, realistic ledger for benchmarking.
+The database is created from ../src/db/sql_tables.sql when it does not exist.
+
+Generated tables:
+    ACCOUNTLIST_V1, PAYEE_V1, TAG_V1, CHECKINGACCOUNT_V1, SPLITTRANSACTIONS_V1,
+    TAGLINK_V1, ATTACHMENT_V1, CURRENCYHISTORY_V1, STOCK_V1, STOCKHISTORY_V1
+
+Examples:
+    python fake.py --transactions 1000000 --seed 42 bench_1m.mmb
+    python fake.py --transactions 50000000 --years 20 --distribution zipf bench_50m.mmb
+'''
+
+import argparse
+import itertools
+import math
+import os
 import random
+import re
 import sqlite3
+import sys
+import time
 from datetime import date, timedelta
 
-conn = sqlite3.connect(sys.argv[1])
-curs = conn.cursor()
-
-curs.execute("select * from ACCOUNTLIST_V1 where ACCOUNTTYPE != 'Investment'")
-all_account = [account[0] for account in curs.fetchall()]
-
-curs.execute("select * from PAYEE_V1")
-all_payee = [payee[0] for payee in curs.fetchall()]
-
-curs.execute("select c.CATEGID, ifnull(s.SUBCATEGID, -1) from CATEGORY_V1 as c left join SUBCATEGORY_V1 as s ON (c.CATEGID = s.CATEGID)")
-all_category = [(c[0], c[1]) for c in curs.fetchall()]
-
-all_type = ("Withdrawal", "Deposit", "Transfer")
-all_status = ("V", "R", "U", "F", "D")
-
-today = date.today()
-
-for x in range(1, 100000):
-    account_id = all_account[random.randint(0, len(all_account) -1)]
-    payee_id = all_payee[random.randint(0, len(all_payee) -1)]
-    transcode = all_type[random.randint(0, len(all_type) - 2)]
-    category = all_category[random.randint(0, len(all_category) -1)]
-    amount = 1000 * random.random()
-    type = all_status[random.randint(0, len(all_status) -1)]
-    transdate = today + timedelta(days = random.randint(-1000,10)) 
-    
-    sql = '''INSERT INTO CHECKINGACCOUNT_V1(ACCOUNTID, TOACCOUNTID, PAYEEID, TRANSCODE, TRANSAMOUNT, STATUS, TRANSACTIONNUMBER, NOTES, CATEGID, SUBCATEGID, TRANSDATE, FOLLOWUPID, TOTRANSAMOUNT)
-    VALUES(%d, -1, %d, "%s", %f, "%s", "%d", "", %d, %d, "%s", -1, %f)''' % (account_id, payee_id, transcode, amount, type, x, category[0], category[1], transdate, amount)
-    curs.execute(sql)
-    
-conn.commit()
+util_dir = os.path.dirname(os.path.abspath(__file__))
+default_schema_filename = os.path.join(util_dir, '..', 'src', 'db', 'sql_tables.sql')
+default_upgrade_filename = os.path.join(util_dir, '..', 'src', 'db', 'DB_Upgrade.h')
+
+# Tables filled by this script; their indexes are dropped during the load
+# and rebuilt once at the end, which is much faster than maintaining them row by row.
+generated_tables = (
+    'ACCOUNTLIST_V1', 'PAYEE_V1', 'TAG_V1', 'CHECKINGACCOUNT_V1', 'SPLITTRANSACTIONS_V1',
+    'TAGLINK_V1', 'ATTACHMENT_V1', 'CURRENCYHISTORY_V1', 'STOCK_V1', 'STOCKHISTORY_V1',
+)
+
+account_types = (('Checking', 5), ('Credit Card', 2), ('Cash', 1), ('Term', 1), ('Loan', 1))
+trans_codes = (('Withdrawal', 70), ('Deposit', 22), ('Transfer', 8))
+trans_status = (('', 35), ('R', 55), ('V', 2), ('F', 5), ('D', 3))
+note_words = ('rent', 'groceries', 'fuel', 'refund', 'salary', 'invoice', 'gift', 'dinner',
+              'coffee', 'insurance', 'school', 'holiday', 'repair', 'subscription', 'bonus',
+              'pharmacy', 'parking', 'taxi', 'books', 'electricity', 'water', 'phone')
+
+def weighted(pairs):
+    """Return (values, cumulative weights) usable by random.choices"""
+    values = [v for v, _ in pairs]
+    return values, list(itertools.accumulate(w for _, w in pairs))
+
+def distribution(count, kind, skew):
+    """Return cumulative weights for count items following the requested distribution"""
+    if kind == 'zipf':
+        return list(itertools.accumulate(1.0 / math.pow(rank, skew) for rank in range(1, count + 1)))
+    return list(itertools.accumulate(itertools.repeat(1.0, count)))
+
+def batched(iterable, size):
+    """Yield lists of at most size items"""
+    it = iter(iterable)
+    while True:
+        batch = list(itertools.islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+def latest_db_version(upgrade_filename):
+    """Read dbLatestVersion from the generated DB_Upgrade.h"""
+    if not os.path.exists(upgrade_filename):
+        return 0
+    with open(upgrade_filename, 'r') as fp:
+        m = re.search(r'dbLatestVersion\s*=\s*(\d+)', fp.read())
+    return int(m.group(1)) if m else 0
+
+class Generator:
+    """Class: Stream fake records into a MMEX database"""
+    def __init__(self, conn, args):
+        self._conn = conn
+        self._args = args
+        self._rng = random.Random(args.seed)
+        self._end = date.today() if args.end_date is None else date.fromisoformat(args.end_date)
+        self._days = max(1, int(args.years * 365.25))
+        self._start = self._end - timedelta(days=self._days - 1)
+        self._counts = {}
+
+    def execute(self, sql, params=()):
+        return self._conn.execute(sql, params)
+
+    def next_id(self, table, pk):
+        return (self.execute('SELECT IFNULL(MAX(%s), 0) FROM %s' % (pk, table)).fetchone()[0]) + 1
+
+    def insert(self, table, columns, rows):
+        """Stream rows into table with one reused parameterized statement per batch"""
+        sql = 'INSERT INTO %s (%s) VALUES (%s)' % (table, ', '.join(columns), ', '.join('?' * len(columns)))
+        # child rows flushed while the parent table streams join the parent transaction
+        own = not self._conn.in_transaction
+        done, pending = 0, 0
+        if own:
+            self.execute('BEGIN')
+        for batch in batched(rows, self._args.batch):
+            self._conn.executemany(sql, batch)
+            done += len(batch)
+            pending += len(batch)
+            if own and pending >= self._args.commit_every:
+                self.execute('COMMIT')
+                self.execute('BEGIN')
+                pending = 0
+                self.progress(table, done)
+        if own:
+            self.execute('COMMIT')
+        self._counts[table] = self._counts.get(table, 0) + done
+        self.progress(table, done, True)
+        return done
+
+    def progress(self, table, done, last=False):
+        if not self._args.quiet:
+            sys.stderr.write('\r%-22s %12d rows%s' % (table, done, '\n' if last else ''))
+
+    def drop_indexes(self):
+        """Drop the indexes of the generated tables, returning their CREATE statements"""
+        placeholders = ', '.join('?' * len(generated_tables))
+        indexes = self.execute('''SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN (%s)''' % placeholders,
+            generated_tables).fetchall()
+        for name, _ in indexes:
+            self.execute('DROP INDEX %s' % name)
+        return [sql for _, sql in indexes]
+
+    def create_indexes(self, indexes):
+        for sql in indexes:
+            self.execute(sql)
+
+    def day(self, offset):
+        return (self._start + timedelta(days=offset)).isoformat()
+
+    def accounts(self):
+        args, rng = self._args, self._rng
+        types, type_weights = weighted(account_types)
+        first = self.next_id('ACCOUNTLIST_V1', 'ACCOUNTID')
+        base_currency = self._base_currency
+        start = self._start.isoformat()
+
+        def rows():
+            for i in range(args.accounts):
+                account_type = rng.choices(types, cum_weights=type_weights)[0]
+                yield (first + i, 'Account %05d' % (first + i), account_type, '%08d' % rng.randrange(10 ** 8),
+                       'Open', '', '', '', '', '', round(rng.uniform(0, 5000), 2), start,
+                       'TRUE' if i < 5 else 'FALSE', base_currency, 0, start, 0, 0, 0, start, 0)
+            for i in range(args.stock_accounts):
+                account_id = first + args.accounts + i
+                yield (account_id, 'Portfolio %05d' % account_id, 'Investment', '', 'Open', '', '', '', '', '',
+                       0, start, 'FALSE', base_currency, 0, start, 0, 0, 0, start, 0)
+
+        self.insert('ACCOUNTLIST_V1', ('ACCOUNTID', 'ACCOUNTNAME', 'ACCOUNTTYPE', 'ACCOUNTNUM', 'STATUS', 'NOTES',
+                    'HELDAT', 'WEBSITE', 'CONTACTINFO', 'ACCESSINFO', 'INITIALBAL', 'INITIALDATE',
+                    'FAVORITEACCT', 'CURRENCYID', 'STATEMENTLOCKED', 'STATEMENTDATE', 'MINIMUMBALANCE',
+                    'CREDITLIMIT', 'INTERESTRATE', 'PAYMENTDUEDATE', 'MINIMUMPAYMENT'), rows())
+        self._account_ids = list(range(first, first + args.accounts))
+        self._stock_account_ids = list(range(first + args.accounts, first + args.accounts + args.stock_accounts))
+
+    def payees(self):
+        args, rng = self._args, self._rng
+        first = self.next_id('PAYEE_V1', 'PAYEEID')
+        categories = self._category_ids
+
+        rows = ((first + i, 'Payee %06d' % (first + i), rng.choice(categories), '', '', '', 1, '')
+                for i in range(args.payees))
+        self.insert('PAYEE_V1', ('PAYEEID', 'PAYEENAME', 'CATEGID', 'NUMBER', 'WEBSITE', 'NOTES', 'ACTIVE', 'PATTERN'), rows)
+        self._payee_ids = list(range(first, first + args.payees))
+
+    def tags(self):
+        args = self._args
+        first = self.next_id('TAG_V1', 'TAGID')
+        rows = ((first + i, 'tag%04d' % (first + i), 1) for i in range(args.tags))
+        self.insert('TAG_V1', ('TAGID', 'TAGNAME', 'ACTIVE'), rows)
+        self._tag_ids = list(range(first, first + args.tags))
+
+    def transactions(self):
+        """Generate CHECKINGACCOUNT_V1 together with its splits, tag links and attachments"""
+        args, rng = self._args, self._rng
+        accounts, payees, categories = self._account_ids, self._payee_ids, self._category_ids
+        account_weights = distribution(len(accounts), args.distribution, args.skew)
+        payee_weights = distribution(len(payees), args.distribution, args.skew)
+        codes, code_weights = weighted(trans_codes)
+        status, status_weights = weighted(trans_status)
+        first = self.next_id('CHECKINGACCOUNT_V1', 'TRANSID')
+        day_stamps = [self.day(d) for d in range(self._days)]
+        splits, taglinks, attachments = [], [], []
+        tag_count = min(len(self._tag_ids), 3)
+
+        def rows():
+            block = args.batch
+            for base in range(0, args.transactions, block):
+                n = min(block, args.transactions - base)
+                account_col = rng.choices(accounts, cum_weights=account_weights, k=n)
+                payee_col = rng.choices(payees, cum_weights=payee_weights, k=n)
+                code_col = rng.choices(codes, cum_weights=code_weights, k=n)
+                status_col = rng.choices(status, cum_weights=status_weights, k=n)
+                category_col = rng.choices(categories, k=n)
+                for i in range(n):
+                    trans_id = first + base + i
+                    account_id, code = account_col[i], code_col[i]
+                    amount = round(rng.lognormvariate(3.5, 1.2), 2)
+                    to_account_id, payee_id, to_amount = -1, payee_col[i], amount
+                    if code == 'Transfer' and len(accounts) < 2:
+                        code = 'Withdrawal'
+                    if code == 'Transfer':
+                        # any account but the one the money leaves
+                        to_account_id = accounts[rng.randrange(len(accounts) - 1)]
+                        if to_account_id >= account_id:
+                            to_account_id += 1
+                        payee_id = -1
+                    category_id = category_col[i]
+                    if code != 'Transfer' and rng.random() < args.split_ratio:
+                        category_id = -1
+                        parts = rng.randint(2, 4)
+                        share = round(amount / parts, 2)
+                        for p in range(parts):
+                            value = share if p < parts - 1 else round(amount - share * (parts - 1), 2)
+                            splits.append((trans_id, rng.choice(categories), value, ''))
+                    if tag_count and rng.random() < args.tag_ratio:
+                        for tag_id in rng.sample(self._tag_ids, rng.randint(1, tag_count)):
+                            taglinks.append(('Transaction', trans_id, tag_id))
+                    if rng.random() < args.attachment_ratio:
+                        attachments.append(('Transaction', trans_id, 'Receipt', 'Transaction_%d_1.pdf' % trans_id))
+                    notes = ' '.join(rng.sample(note_words, rng.randint(1, 4))) if rng.random() < 0.3 else ''
+                    number = str(rng.randrange(1, 100000)) if rng.random() < 0.2 else ''
+                    # ids grow with the date, as in a ledger filled over the years
+                    day = min(self._days - 1, int((base + i + rng.random()) * self._days / args.transactions))
+                    yield (trans_id, account_id, to_account_id, payee_id, code, amount, status_col[i], number,
+                           notes, category_id, day_stamps[day], day_stamps[day] + 'T12:00:00', '', -1, to_amount, -1)
+
+        self.insert('CHECKINGACCOUNT_V1', ('TRANSID', 'ACCOUNTID', 'TOACCOUNTID', 'PAYEEID', 'TRANSCODE',
+                    'TRANSAMOUNT', 'STATUS', 'TRANSACTIONNUMBER', 'NOTES', 'CATEGID', 'TRANSDATE',
+                    'LASTUPDATEDTIME', 'DELETEDTIME', 'FOLLOWUPID', 'TOTRANSAMOUNT', 'COLOR'),
+                    self.drain(rows(), splits, taglinks, attachments))
+
+        self.insert('SPLITTRANSACTIONS_V1', ('TRANSID', 'CATEGID', 'SPLITTRANSAMOUNT', 'NOTES'), self.take(splits))
+        self.insert('TAGLINK_V1', ('REFTYPE', 'REFID', 'TAGID'), self.take(taglinks))
+        self.insert('ATTACHMENT_V1', ('REFTYPE', 'REFID', 'DESCRIPTION', 'FILENAME'), self.take(attachments))
+
+    def drain(self, rows, *children):
+        """Flush child rows whenever they grow large, so memory stays bounded at any scale"""
+        limit = self._args.commit_every
+        for row in rows:
+            yield row
+            if len(children[0]) >= limit:
+                self.insert('SPLITTRANSACTIONS_V1', ('TRANSID', 'CATEGID', 'SPLITTRANSAMOUNT', 'NOTES'), self.take(children[0]))
+            if len(children[1]) >= limit:
+                self.insert('TAGLINK_V1', ('REFTYPE', 'REFID', 'TAGID'), self.take(children[1]))
+            if len(children[2]) >= limit:
+                self.insert('ATTACHMENT_V1', ('REFTYPE', 'REFID', 'DESCRIPTION', 'FILENAME'), self.take(children[2]))
+
+    @staticmethod
+    def take(rows):
+        batch = rows[:]
+        del rows[:]
+        return batch
+
+    def random_walk(self, value, volatility):
+        while True:
+            yield value
+            value = max(0.0001, value * math.exp(self._rng.gauss(0, volatility)))
+
+    def currency_history(self):
+        args, rng = self._args, self._rng
+        currencies = [r[0] for r in self.execute(
+            '''SELECT CURRENCYID FROM CURRENCYFORMATS_V1 WHERE CURRENCYID != ?
+               AND CURRENCYID NOT IN (SELECT CURRENCYID FROM CURRENCYHISTORY_V1) ORDER BY CURRENCYID''',
+            (self._base_currency,)).fetchall()][:args.currencies]
+
+        def rows():
+            for currency_id in currencies:
+                walk = self.random_walk(rng.uniform(0.01, 200.0), 0.004)
+                for d in range(self._days):
+                    yield (currency_id, self.day(d), round(next(walk), 6), 1)
+
+        self.insert('CURRENCYHISTORY_V1', ('CURRENCYID', 'CURRDATE', 'CURRVALUE', 'CURRUPDTYPE'), rows())
+
+    def stocks(self):
+        args, rng = self._args, self._rng
+        first = self.next_id('STOCK_V1', 'STOCKID')
+        symbols = ['SYM%04d' % (first + i) for i in range(args.stocks)]
+        start = self._start.isoformat()
+        holders = self._stock_account_ids or self._account_ids
+
+        rows = ((first + i, holders[i % len(holders)], start, 'Stock %s' % symbols[i], symbols[i],
+                 rng.randint(1, 500), round(rng.uniform(5, 500), 2), '', 0, 0, 0) for i in range(args.stocks))
+        self.insert('STOCK_V1', ('STOCKID', 'HELDAT', 'PURCHASEDATE', 'STOCKNAME', 'SYMBOL', 'NUMSHARES',
+                    'PURCHASEPRICE', 'NOTES', 'CURRENTPRICE', 'VALUE', 'COMMISSION'), rows)
+
+        def history():
+            for symbol in symbols:
+                walk = self.random_walk(rng.uniform(5, 500), 0.015)
+                for d in range(self._days):
+                    if (self._start + timedelta(days=d)).weekday() < 5:
+                        yield (symbol, self.day(d), round(next(walk), 4), 1)
+
+        self.insert('STOCKHISTORY_V1', ('SYMBOL', 'DATE', 'VALUE', 'UPDTYPE'), history())
+
+    def run(self):
+        args = self._args
+        self._category_ids = [r[0] for r in self.execute('SELECT CATEGID FROM CATEGORY_V1').fetchall()] or [-1]
+        row = self.execute("SELECT INFOVALUE FROM INFOTABLE_V1 WHERE INFONAME = 'BASECURRENCYID'").fetchone()
+        self._base_currency = int(row[0]) if row else 1
+
+        indexes = self.drop_indexes()
+        self.accounts()
+        self.payees()
+        self.tags()
+        self.transactions()
+        if args.currencies:
+            self.currency_history()
+        if args.stocks:
+            self.stocks()
+        if not args.quiet:
+            sys.stderr.write('Rebuilding %d indexes\n' % len(indexes))
+        self.create_indexes(indexes)
+        self.execute('ANALYZE')
+        return self._counts
+
+def create_database(conn, schema_filename, upgrade_filename):
+    """Create an empty MMEX database from the clean table definitions"""
+    with open(schema_filename, 'rb') as fp:
+        conn.executescript(fp.read().decode('utf-8'))
+    conn.execute("INSERT OR IGNORE INTO INFOTABLE_V1 (INFONAME, INFOVALUE) VALUES ('DATAVERSION', '3')")
+    conn.execute("INSERT OR IGNORE INTO INFOTABLE_V1 (INFONAME, INFOVALUE) VALUES ('BASECURRENCYID', '1')")
+    conn.execute('PRAGMA user_version = %d' % latest_db_version(upgrade_filename))
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('database', help='database file, created when it does not exist')
+    parser.add_argument('--transactions', type=int, default=100000, help='number of transactions (default: %(default)s)')
+    parser.add_argument('--accounts', type=int, default=20, help='number of bank accounts (default: %(default)s)')
+    parser.add_argument('--stock-accounts', type=int, default=2, help='number of investment accounts (default: %(default)s)')
+    parser.add_argument('--payees', type=int, default=2000, help='number of payees (default: %(default)s)')
+    parser.add_argument('--tags', type=int, default=50, help='number of tags (default: %(default)s)')
+    parser.add_argument('--currencies', type=int, default=10, help='currencies with daily rate history (default: %(default)s)')
+    parser.add_argument('--stocks', type=int, default=50, help='stocks with daily price history (default: %(default)s)')
+    parser.add_argument('--years', type=float, default=10, help='date span of the ledger in years (default: %(default)s)')
+    parser.add_argument('--end-date', help='last date of the ledger as YYYY-MM-DD, fix it for identical files across days (default: today)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed, same seed gives the same ledger (default: %(default)s)')
+    parser.add_argument('--distribution', choices=('uniform', 'zipf'), default='zipf',
+                        help='how transactions spread over accounts and payees (default: %(default)s)')
+    parser.add_argument('--skew', type=float, default=1.1, help='zipf exponent (default: %(default)s)')
+    parser.add_argument('--split-ratio', type=float, default=0.05, help='share of split transactions (default: %(default)s)')
+    parser.add_argument('--tag-ratio', type=float, default=0.15, help='share of tagged transactions (default: %(default)s)')
+    parser.add_argument('--attachment-ratio', type=float, default=0.01, help='share of transactions with attachment (default: %(default)s)')
+    parser.add_argument('--batch', type=int, default=20000, help='rows per executemany batch (default: %(default)s)')
+    parser.add_argument('--commit-every', type=int, default=1000000, help='rows per transaction (default: %(default)s)')
+    parser.add_argument('--schema', default=default_schema_filename, help='table definitions used for a new database')
+    parser.add_argument('--quiet', action='store_true', help='do not report progress')
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args(sys.argv[1:])
+
+    exists = os.path.exists(args.database)
+    conn = sqlite3.connect(args.database, isolation_level=None)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA locking_mode = EXCLUSIVE')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA cache_size = -262144')
+
+    if not exists:
+        create_database(conn, args.schema, default_upgrade_filename)
+
+    started = time.time()
+    counts = Generator(conn, args).run()
+    conn.close()
+
+    elapsed = time.time() - started
+    total = sum(counts.values())
+    print('%d rows in %.1fs (%.0f rows/s)' % (total, elapsed, total / elapsed if elapsed else 0))
+    for table in sorted(counts):
+        print('    %-22s %d' % (table, counts[table]))
@@ -1,19 +1,54 @@
 #!/usr/bin/env python
 # vi:tabstop=4:expandtab:shiftwidth=4:softtabstop=4:autoindent:smarttab
 '''
-Usage: python sqlite2cpp.py path_to_sql_file
+Usage: python sqlite2cpp.py path_to_sql_file [output_folder]
+
+Only the files whose content changed are written, the others keep their timestamp.
 '''
 
 import sys
 import os
 import datetime
 import sqlite3
-import codecs
+import hashlib
 
 currency_unicode_patch_filename = 'currencies_update_patch_unicode_only.mmdbg'
 currency_table_patch_filename = 'currencies_update_patch.mmdbg'
 sql_tables_data_filename = 'sql_tables.sql'
 
+class Code:
+    """Class: Generated code collected in parts and joined once, instead of repeated string concatenation"""
+    def __init__(self, text=''):
+        self._parts = [text]
+
+    def __iadd__(self, text):
+        self._parts.append(text)
+        return self
+
+    def __str__(self):
+        return ''.join(self._parts)
+
+def write_if_changed(path, text, encoding='utf-8'):
+    """Write the text to path unless the file holds the same content already (compared by hash),
+       so an unchanged header keeps its timestamp and does not trigger a rebuild.
+       Return True when the file was written."""
+    data = text.encode(encoding)
+    if os.path.exists(path):
+        with open(path, 'rb') as fp:
+            if hashlib.sha1(fp.read()).digest() == hashlib.sha1(data).digest():
+                print ('Unchanged: %s' % path)
+                return False
+    with open(path, 'wb') as fp:
+        fp.write(data)
+    return True
+
+def generation_year():
+    """Year of the copyright notices, taken from SOURCE_DATE_EPOCH when set for reproducible output"""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        return datetime.datetime.fromtimestamp(int(epoch), datetime.timezone.utc).year
+    return datetime.date.today().year
+
 # http://stackoverflow.com/questions/196345/how-to-check-if-a-string-in-python-is-in-ascii
 def is_ascii(s):
     """Class: Check for Ascii String"""
@@ -76,6 +111,24 @@ def get_table_info(cursor, name):
              'pk': field[5]     # undocumented
             } for field in cursor.fetchall()]
 
+def get_parent_keys(cursor, tables):
+    """Returns for each table its integer columns referring to the primary key of
+       another table: a column named after that key or after the table (as
+       CHECKINGACCOUNTID for CHECKINGACCOUNT_V1), and the REFID of the polymorphic links."""
+    primary_keys = {}
+    for table, _ in tables:
+        for field in get_table_info(cursor, table):
+            if field['pk']:
+                primary_keys[table] = field['name']
+    parents = {}
+    for table, _ in tables:
+        names = set([primary_keys[t] for t in primary_keys if t != table])
+        names |= set([t.rsplit('_', 1)[0] + 'ID' for t in primary_keys if t != table])
+        names.add('REFID')
+        parents[table] = [field['name'] for field in get_table_info(cursor, table)
+                          if not field['pk'] and field['type'] == 'INTEGER' and field['name'] in names]
+    return parents
+
 def get_index_list(cursor, tbl_name):
     "Returns a list of table names in the current database."
     # Skip the sqlite_sequence system table used for autoincrement key
@@ -91,6 +144,123 @@ def get_data_initializer_list(cursor, tbl_name):
     cursor.execute("select * from %s" % tbl_name)
     return cursor.fetchall()
 
+def is_nocase(field):
+    """Text columns sort case-insensitive, except the ISO dates and times whose case never differs"""
+    return field['type'] == 'TEXT' and not field['name'].endswith(('DATE', 'TIME'))
+
+def get_index_columns(index_sql):
+    "Returns the column names of a CREATE INDEX statement."
+    inside = index_sql[index_sql.index('(') + 1:index_sql.rindex(')')]
+    return [column.strip().split()[0] for column in inside.split(',')]
+
+# Tables without in-memory secondary indexes: their cache can hold the whole
+# ledger and they are never searched with get_one().
+memory_index_skip = ('CHECKINGACCOUNT_V1',)
+
+# History tables whose values are looked up by date: the key, date and value
+# columns of the DB_Series kept for them.
+time_series = {
+    'CURRENCYHISTORY_V1': ('CURRENCYID', 'CURRDATE', 'CURRVALUE'),
+    'STOCKHISTORY_V1': ('SYMBOL', 'DATE', 'VALUE'),
+}
+
+# Text columns searched by words: a FTS5 index (external content) is kept for
+# each of these tables by triggers, and searched with search().
+fts_columns = {
+    'CHECKINGACCOUNT_V1': ('NOTES', 'TRANSACTIONNUMBER'),
+    'PAYEE_V1': ('PAYEENAME',),
+    'CATEGORY_V1': ('CATEGNAME',),
+}
+
+def fts_sql(table, pk, columns):
+    """Returns the statements creating the FTS5 index of the columns of table and
+       the triggers keeping it in sync with the table, all of them IF NOT EXISTS."""
+    fts = table + '_FTS'
+    cols = ', '.join(columns)
+    new = ', '.join(['new.' + c for c in columns])
+    old = ', '.join(['old.' + c for c in columns])
+    insert = "INSERT INTO %s(rowid, %s) VALUES (new.%s, %s);" % (fts, cols, pk, new)
+    delete = "INSERT INTO %s(%s, rowid, %s) VALUES ('delete', old.%s, %s);" % (fts, fts, cols, pk, old)
+    return [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS %s USING fts5(%s, content='%s', content_rowid='%s', tokenize='unicode61 remove_diacritics 2')" % (fts, cols, table, pk),
+        "CREATE TRIGGER IF NOT EXISTS %s_AI AFTER INSERT ON %s BEGIN %s END" % (fts, table, insert),
+        "CREATE TRIGGER IF NOT EXISTS %s_AD AFTER DELETE ON %s BEGIN %s END" % (fts, table, delete),
+        "CREATE TRIGGER IF NOT EXISTS %s_AU AFTER UPDATE OF %s ON %s BEGIN %s %s END" % (fts, cols, table, delete, insert),
+    ]
+
+# Per key and per day sums of the flows of the records, kept by triggers in the
+# tables <table>_BALANCE and <table>_BALANCE_DAY: the columns the flows depend
+# on, the day and whether a record is reconciled or left out, and for each of
+# its sides the key column and the amount it adds to that key, as
+# Model_Checking::account_flow(). The record is %(r)s in the expressions.
+balance_summary = {
+    'CHECKINGACCOUNT_V1': {
+        'key': 'ACCOUNTID',
+        'columns': ('ACCOUNTID', 'TOACCOUNTID', 'TRANSCODE', 'STATUS', 'TRANSAMOUNT', 'TOTRANSAMOUNT', 'TRANSDATE', 'DELETEDTIME'),
+        'day': "IFNULL(SUBSTR(%(r)s.TRANSDATE, 1, 10), '')",
+        'reconciled': "UPPER(IFNULL(%(r)s.STATUS, '')) IN ('R', 'RECONCILED')",
+        'ignored': "UPPER(IFNULL(%(r)s.STATUS, '')) IN ('V', 'VOID') OR IFNULL(%(r)s.DELETEDTIME, '') <> ''"
+                   " OR (UPPER(%(r)s.TRANSCODE) = 'TRANSFER' AND %(r)s.ACCOUNTID = %(r)s.TOACCOUNTID)",
+        'sides': (
+            ('ACCOUNTID', "CASE WHEN UPPER(%(r)s.TRANSCODE) = 'DEPOSIT' THEN %(r)s.TRANSAMOUNT ELSE -%(r)s.TRANSAMOUNT END"),
+            ('TOACCOUNTID', "CASE WHEN UPPER(%(r)s.TRANSCODE) = 'TRANSFER' THEN IFNULL(%(r)s.TOTRANSAMOUNT, 0) ELSE 0 END"),
+        ),
+    },
+}
+
+# Largest difference between the summary and a full recompute not reported by verify_balances()
+balance_tolerance = '0.0001'
+
+def balance_flows(spec, r):
+    """Returns the SELECT of (K, D, F, R): key, day, flow and reconciled flow of each side of the records r"""
+    names = {'r': r}
+    selects = []
+    for column, amount in spec['sides']:
+        selects.append("SELECT %s.%s AS K, %s AS D, CASE WHEN %s THEN 0 ELSE %s END AS F, %s AS C%s" % (
+            r, column, spec['day'] % names, spec['ignored'] % names, amount % names, spec['reconciled'] % names,
+            '' if r in ('new', 'old') else ' FROM ' + r))
+    return "SELECT K, D, F, CASE WHEN C THEN F ELSE 0 END AS R FROM (%s) WHERE K IS NOT NULL AND F <> 0" % ' UNION ALL '.join(selects)
+
+def balance_sql(table, spec):
+    """Returns the statements creating the balance summary tables of table and the triggers keeping them
+       in sync, all of them IF NOT EXISTS, the statements filling them, and the query counting the keys
+       and days where they differ from a full recompute."""
+    key = spec['key']
+    total, day = table + '_BALANCE', table + '_BALANCE_DAY'
+
+    def upsert(r, sign):
+        flows = balance_flows(spec, r)
+        return ("INSERT INTO %s (%s, FLOW, RECFLOW) SELECT K, %sSUM(F), %sSUM(R) FROM (%s) GROUP BY K"
+                " ON CONFLICT(%s) DO UPDATE SET FLOW = FLOW + excluded.FLOW, RECFLOW = RECFLOW + excluded.RECFLOW; "
+                "INSERT INTO %s (%s, DAY, FLOW, RECFLOW) SELECT K, D, %sSUM(F), %sSUM(R) FROM (%s) GROUP BY K, D"
+                " ON CONFLICT(%s, DAY) DO UPDATE SET FLOW = FLOW + excluded.FLOW, RECFLOW = RECFLOW + excluded.RECFLOW;"
+                % (total, key, sign, sign, flows, key, day, key, sign, sign, flows, key))
+
+    create = [
+        "CREATE TABLE IF NOT EXISTS %s (%s INTEGER PRIMARY KEY, FLOW NUMERIC NOT NULL, RECFLOW NUMERIC NOT NULL)" % (total, key),
+        "CREATE TABLE IF NOT EXISTS %s (%s INTEGER NOT NULL, DAY TEXT NOT NULL, FLOW NUMERIC NOT NULL, RECFLOW NUMERIC NOT NULL, PRIMARY KEY (%s, DAY)) WITHOUT ROWID" % (day, key, key),
+        "CREATE TRIGGER IF NOT EXISTS %s_AI AFTER INSERT ON %s BEGIN %s END" % (total, table, upsert('new', '')),
+        "CREATE TRIGGER IF NOT EXISTS %s_AD AFTER DELETE ON %s BEGIN %s END" % (total, table, upsert('old', '-')),
+        "CREATE TRIGGER IF NOT EXISTS %s_AU AFTER UPDATE OF %s ON %s BEGIN %s %s END" % (
+            total, ', '.join(spec['columns']), table, upsert('old', '-'), upsert('new', '')),
+    ]
+    fill = [
+        "DELETE FROM %s" % total,
+        "DELETE FROM %s" % day,
+        "INSERT INTO %s (%s, DAY, FLOW, RECFLOW) SELECT K, D, SUM(F), SUM(R) FROM (%s) GROUP BY K, D" % (day, key, balance_flows(spec, table)),
+        "INSERT INTO %s (%s, FLOW, RECFLOW) SELECT %s, SUM(FLOW), SUM(RECFLOW) FROM %s GROUP BY %s" % (total, key, key, day, key),
+    ]
+    flows = balance_flows(spec, table)
+    verify = ("SELECT COUNT(*) FROM ("
+              "SELECT K FROM (SELECT %s AS K, FLOW AS F, RECFLOW AS R FROM %s UNION ALL SELECT K, -F, -R FROM (%s))"
+              " GROUP BY K HAVING ABS(SUM(F)) > %s OR ABS(SUM(R)) > %s"
+              " UNION ALL "
+              "SELECT K FROM (SELECT %s AS K, DAY AS D, FLOW AS F, RECFLOW AS R FROM %s UNION ALL SELECT K, D, -F, -R FROM (%s))"
+              " GROUP BY K, D HAVING ABS(SUM(F)) > %s OR ABS(SUM(R)) > %s)"
+              % (key, total, flows, balance_tolerance, balance_tolerance,
+                 key, day, flows, balance_tolerance, balance_tolerance))
+    return create, fill, verify
+
 base_data_types_reverse = {
     'TEXT': 'wxString',
     'NUMERIC': 'double',
@@ -109,18 +279,29 @@ base_data_types_function = {
 
 class DB_Table:
     """ Class: Defines the database table in SQLite3"""
-    def __init__(self, table, fields, index, data):
+    def __init__(self, table, fields, index, data, parent_keys=()):
         self._table = table
         self._fields = fields
         self._primay_key = [field['name'] for field in self._fields if field['pk']][0]
         self._index = index
         self._data = data
+        self._parent_keys = parent_keys
+        self._series = time_series.get(table)
+        self._fts = fts_columns.get(table)
+        self._balance = balance_summary.get(table)
+        self._memory_index = []
+        if table not in memory_index_skip:
+            for i in index:
+                columns = get_index_columns(i)
+                if columns not in self._memory_index:
+                    self._memory_index.append(columns)
 
     def generate_currency_table_data(self, sf1, utf_only):
         """Extract currency table data from table_v1
            Return string of update commands
            Will only get unicode data line when utf_only is true"""
 
+        sf1 = Code(sf1)
         for row in self._data:
             values = ', '.join(["%s='%s'" % (k, row[k]) for k in row.keys() if k.upper() != 'CURRENCYID' and k.upper() != 'CURRENCY_SYMBOL'])
             values = values.replace('_tr_', '')
@@ -130,42 +311,56 @@ class DB_Table:
 INSERT OR IGNORE INTO %s (CURRENCYNAME, CURRENCY_SYMBOL) VALUES ('%s', '%s');
 UPDATE OR IGNORE %s SET %s WHERE CURRENCY_SYMBOL='%s';''' % (self._table, row['CURRENCYNAME'].replace('_tr_', ''), row['CURRENCY_SYMBOL'], self._table, values, row['CURRENCY_SYMBOL'])
 
-        return sf1
+        return str(sf1)
 
     def generate_unicode_currency_upgrade_patch(self):
         """Write database_version data to file
            Only extract unicode data"""
         if self._table.upper() == 'CURRENCYFORMATS_V1':
             print ('Generate patch file: %s' % currency_unicode_patch_filename)
-            rfp = codecs.open(currency_unicode_patch_filename, 'w', 'utf-8')
             sf1 = '''-- MMEX Debug SQL - Update --
 -- MMEX db version required 10
 -- This script will add missing currencies and will overwrite all currencies params containing UTF8 in your database.'''
-            rfp.write(self.generate_currency_table_data(sf1, True))
-            rfp.close()
+            write_if_changed(currency_unicode_patch_filename, self.generate_currency_table_data(sf1, True))
 
     def generate_currency_upgrade_patch(self):
         """Write currency_table_upgrade_patch file
            Extract all currency data"""
         if self._table.upper() == 'CURRENCYFORMATS_V1':
             print ('Generate patch file: %s' % currency_table_patch_filename)
-            rfp = codecs.open(currency_table_patch_filename, 'w', 'utf-8')
             sf1 = '''-- MMEX Debug SQL - Update --
 -- MMEX db version required 10
 -- This script will add missing currencies and will overwrite all currencies params in your database.'''
-            rfp.write(self.generate_currency_table_data(sf1, False))
-            rfp.close()
+            write_if_changed(currency_table_patch_filename, self.generate_currency_table_data(sf1, False))
 
-    def generate_class(self, header, sql):
+    def generate_class(self, header, sql, folder='.'):
         """ Write the data to the appropriate .h file"""
         print ('Generate Table: %s' % self._table)
-        rfp = codecs.open('DB_Table_' + self._table.title() + '.h', 'w', 'utf-8-sig')
-        rfp.write(header + self.to_string(sql))
-        rfp.close()
+        write_if_changed(os.path.join(folder, 'DB_Table_' + self._table.title() + '.h'),
+                         header + self.to_string(sql), 'utf-8-sig')
+
+    def field_type(self, name):
+        """Return the SQL type of the named column"""
+        return [field['type'] for field in self._fields if field['name'] == name][0]
+
+    def series_args(self, prefix):
+        """Return the key, date, value and id arguments of DB_Series::update() for a record"""
+        return ', '.join([prefix + c for c in self._series] + [prefix + 'id()'])
+
+    def memory_index_name(self, columns):
+        """Return the member name of the in-memory index over columns"""
+        return 'index_by_%s_' % '_'.join(columns).lower()
+
+    def memory_index_key(self, columns, values):
+        """Return the key of an in-memory index, text is compared case-insensitively as in match()"""
+        keys = [v + '.Lower()' if base_data_types_reverse[self.field_type(c)] == 'wxString' else v
+                for c, v in zip(columns, values)]
+        return 'std::make_tuple(%s)' % ', '.join(keys)
 
     def to_string(self, sql=None):
         """Create the data for the .h file"""
-        s = '''#pragma once
+        s = Code()
+        s += '''#pragma once
 
 #include "DB_Table.h"
 
@@ -197,51 +392,94 @@ struct DB_Table_%s : public DB_Table
     };
 
     /** A container to hold a list of Data record pointers for the table in memory*/
-    typedef std::vector<Self::Data*> Cache;
-    typedef std::map<int64, Self::Data*> Index_By_Id;
+    typedef std::unordered_set<Self::Data*> Cache;
+    typedef std::unordered_map<int64, Self::Data*, DB_Hash_Int64> Index_By_Id;
     Cache cache_;
     Index_By_Id index_by_id_;
+    std::vector<int64> clock_; // ids in index_by_id_ in load order, swept by shrink()
+    size_t clock_hand_ = 0;
+    std::vector<Self::Data*> evicted_; // out of the cache but maybe still held by callers
     Data* fake_; // in case the entity not found
+''' % (self._table, self._table)
+
+        for columns in self._memory_index:
+            s += '''    DB_Index<std::tuple<%s>, Self::Data> %s; // %s
+''' % (', '.join([base_data_types_reverse[self.field_type(c)] for c in columns]),
+            self.memory_index_name(columns), ', '.join(columns))
 
+        if self._series:
+            s += '''    typedef DB_Series<%s> Series;
+    Series series_; // %s
+''' % (base_data_types_reverse[self.field_type(self._series[0])], ', '.join(self._series))
+
+        s += '''
     /** Destructor: clears any data records stored in memory */
     ~DB_Table_%s() 
     {
-        delete this->fake_;
         destroy_cache();
     }
      
-    /** Removes all records stored in memory (cache) for the table*/ 
+    /** Removes all records and prepared statements stored in memory (cache) for the table*/ 
     void destroy_cache()
     {
+        finalize_statements();
         std::for_each(cache_.begin(), cache_.end(), std::mem_fn(&Data::destroy));
         cache_.clear();
         index_by_id_.clear(); // no memory release since it just stores pointer and the according objects are in cache
+        clock_.clear();
+        clock_hand_ = 0;
+        resident_bytes_ = 0;
+        release_evicted();''' % self._table
+
+        for columns in self._memory_index:
+            s += '''
+        %s.clear();''' % self.memory_index_name(columns)
+        if self._series:
+            s += '''
+        series_.clear();'''
+
+        s += '''
     }
-''' % (self._table, self._table, self._table)
+'''
 
         s += '''
     /** Creates the database table if the table does not exist*/
     bool ensure(wxSQLite3Database* db)
     {
+        DB_Op_Timer timer(this, DB_OP_ENSURE);
+        if (DB_Schema::verified() == db) return true;
+
         if (!exists(db))
         {
+            // the table and its seed data are created atomically
+            db->Savepoint("ensure");
             try
             {
                 db->ExecuteUpdate("%s");
                 this->ensure_data(db);
+                db->ReleaseSavepoint("ensure");
             }
             catch(const wxSQLite3Exception &e) 
             { 
                 wxLogError("%s: Exception %%s", e.GetMessage().utf8_str());
+                try
+                {
+                    db->RollbackToSavepoint("ensure");
+                    db->ReleaseSavepoint("ensure");
+                }
+                catch(const wxSQLite3Exception &) {}
+                DB_Schema::failed() = true;
                 return false;
             }
         }
 
-        this->ensure_index(db);
+        this->ensure_index(db);%s%s
 
         return true;
     }
-''' % (sql.replace('\n', ''), self._table)
+''' % (sql.replace('\n', ''), self._table, '''
+        this->ensure_search(db);''' if self._fts else '', '''
+        this->ensure_balance(db);''' if self._balance else '')
 
         s += '''
     bool ensure_index(wxSQLite3Database* db)
@@ -262,6 +500,7 @@ struct DB_Table_%s : public DB_Table
         catch(const wxSQLite3Exception &e) 
         { 
             wxLogError("%s: Exception %%s", e.GetMessage().utf8_str());
+            DB_Schema::failed() = true;
             return false;
         }
 
@@ -269,27 +508,124 @@ struct DB_Table_%s : public DB_Table
     }
 ''' % (self._table)
 
-        s += '''
-    void ensure_data(wxSQLite3Database* db)
+        if self._fts:
+            s += '''
+    /**
+    * Create the full-text index of %s and the triggers keeping it in sync,
+    * a new index is filled from the records already in the table.
+    */
+    bool ensure_search(wxSQLite3Database* db)
     {
-        db->Begin();'''
-
-        rf1, rf2, rf3 = '', '', ''
-        for r in self._data:
-            rf2 = ', '.join(["'%s'" if is_trans(i) else "'%s'" % i for i in r])
-            rf3 = ', '.join([translation_for(i) for i in r if is_trans(i)])
-            if rf2.find('%s') >= 0:
-                rf3 = ', ' + rf3
-            rf1 = '"INSERT INTO %s VALUES (%s)"%s' % (self._table, rf2, rf3)
-            if rf2.find('%s') >= 0:
-                rf1 = 'wxString::Format(' + rf1 + ')'
+        const bool fill = !db->TableExists("%s_FTS");
+        db->Savepoint("ensure_search");
+        try
+        {''' % (', '.join(self._fts), self._table)
+            for ddl in fts_sql(self._table, self._primay_key, self._fts):
+                s += '''
+            db->ExecuteUpdate("%s");''' % ddl
             s += '''
-        db->ExecuteUpdate(%s);''' % (rf1)
+            if (fill) db->ExecuteUpdate("INSERT INTO %s_FTS(%s_FTS) VALUES ('rebuild')");
+            db->ReleaseSavepoint("ensure_search");
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %%s", e.GetMessage().utf8_str());
+            try
+            {
+                db->RollbackToSavepoint("ensure_search");
+                db->ReleaseSavepoint("ensure_search");
+            }
+            catch(const wxSQLite3Exception &) {}
+            DB_Schema::failed() = true;
+            return false;
+        }
 
-        s += '''
-        db->Commit();
+        return true;
+    }
+''' % (self._table, self._table, self._table)
+
+        if self._balance:
+            create, fill, verify = balance_sql(self._table, self._balance)
+            s += '''
+    /**
+    * Create the balance summary tables and the triggers keeping them in sync,
+    * new tables are filled from the records already in the table.
+    */
+    bool ensure_balance(wxSQLite3Database* db)
+    {
+        const bool fill = !db->TableExists("%s_BALANCE");
+        db->Savepoint("ensure_balance");
+        try
+        {''' % self._table
+            for ddl in create:
+                s += '''
+            db->ExecuteUpdate("%s");''' % ddl
+            s += '''
+            if (fill) this->fill_balances(db);
+            db->ReleaseSavepoint("ensure_balance");
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %%s", e.GetMessage().utf8_str());
+            try
+            {
+                db->RollbackToSavepoint("ensure_balance");
+                db->ReleaseSavepoint("ensure_balance");
+            }
+            catch(const wxSQLite3Exception &) {}
+            DB_Schema::failed() = true;
+            return false;
+        }
+
+        return true;
+    }
+
+    /** Recompute the balance summary tables from all the records */
+    void fill_balances(wxSQLite3Database* db)
+    {''' % self._table
+            for sql in fill:
+                s += '''
+        db->ExecuteUpdate("%s");''' % sql
+            s += '''
+    }
+'''
+
+        if not self._data:
+            s += '''
+    void ensure_data(wxSQLite3Database* /* db */)
+    {
     }
     '''
+        else:
+            s += '''
+    /** Insert the seed rows with one prepared statement, within the transaction of ensure() */
+    void ensure_data(wxSQLite3Database* db)
+    {
+        const wxString data[][%d] =
+        {''' % len(self._fields)
+            for r in self._data:
+                cells = []
+                for i in r:
+                    if is_trans(i):
+                        cells.append(translation_for(i))
+                    else:
+                        cells.append('"%s"' % i)
+                s += '''
+            {%s},''' % ', '.join(cells)
+            s += '''
+        };
+
+        wxSQLite3Statement stmt = db->PrepareStatement("INSERT INTO %s VALUES (%s)");
+        for (const auto& row : data)
+        {
+            for (int i = 0; i < %d; ++ i)
+                stmt.Bind(i + 1, row[i]);
+            stmt.ExecuteUpdate();
+            stmt.Reset();
+        }
+        stmt.Finalize();
+    }
+    ''' % (self._table, ', '.join(['?' for field in self._fields]), len(self._fields))
 
         for field in self._fields:
             s += '''
@@ -349,6 +685,34 @@ struct DB_Table_%s : public DB_Table
 
         return COLUMN(-1);
     }
+
+    /** Returns the column as ORDER BY term, text columns other than dates sort case-insensitive */
+    static wxString column_to_order(const COLUMN col)
+    {'''
+        nocase = [field['name'] for field in self._fields if is_nocase(field)]
+        if nocase:
+            s += '''
+        switch(col)
+        {'''
+            for name in nocase:
+                s += '''
+            case COL_%s:''' % name.upper()
+            s += '''
+                return column_to_name(col) + " COLLATE NOCASE";
+            default: break;
+        }
+'''
+        s += '''
+        return column_to_name(col);
+    }
+
+    /** Returns the ORDER BY clause for the column */
+    static wxString order_by(const COLUMN col, const bool asc = true)
+    {
+        return " ORDER BY " + column_to_order(col) + (asc ? " ASC " : " DESC ");
+    }
+
+    typedef DB_Page<COLUMN, Self::Data> Page;
     '''
         s += '''
     /** Data is a single record in the database table*/
@@ -357,6 +721,8 @@ struct DB_Table_%s : public DB_Table
         friend struct DB_Table_%s;
         /** This is a instance pointer to itself in memory. */
         Self* table_;
+        /** Set when the record is used from the cache, cleared by the CLOCK hand of shrink() */
+        bool referenced_ = true;
     ''' % self._table.upper()
         for field in self._fields:
             s += '''
@@ -401,6 +767,22 @@ struct DB_Table_%s : public DB_Table
         s += '''
             return true;
         }
+
+        /** Return the columns whose values differ from r, bit i for the i-th column after the primary key */
+        uint64_t diff(const Data* r) const
+        {
+            uint64_t changed = 0;'''
+        for i, field in enumerate([field for field in self._fields if not field['pk']]):
+            ftype = base_data_types_reverse[field['type']]
+            if ftype == 'int64' or ftype == 'double':
+                s += '''
+            if(%s != r->%s) changed |= uint64_t(1) << %d;''' % (field['name'], field['name'], i)
+            elif ftype == 'wxString':
+                s += '''
+            if(!%s.IsSameAs(r->%s)) changed |= uint64_t(1) << %d;''' % (field['name'], field['name'], i)
+        s += '''
+            return changed;
+        }
         
         explicit Data(Self* table = nullptr ) 
         {
@@ -470,6 +852,16 @@ struct DB_Table_%s : public DB_Table
             return this->%s == in.v_;
         }''' % (field['name'], field['name'])
 
+        for field in self._fields:
+            if field['pk']:
+                continue
+            s += '''
+
+        void assign(const Self::%s &in)
+        {
+            this->%s = in.v_;
+        }''' % (field['name'], field['name'])
+
         s += '''
 
         // Return the data record as a json string
@@ -563,8 +955,33 @@ struct DB_Table_%s : public DB_Table
         {
             delete this;
         }
+
+        /** Records are allocated from the slabs of the table's DB_Pool */
+        static void* operator new(size_t size)
+        {
+            return size == sizeof(Data) ? DB_Pool<Data>::instance().allocate() : ::operator new(size);
+        }
+
+        static void operator delete(void* p, size_t size)
+        {
+            if (size == sizeof(Data))
+                DB_Pool<Data>::instance().deallocate(p);
+            else
+                ::operator delete(p);
+        }
+
+        /** Estimated bytes held by the record, including the heap buffers of its strings */
+        size_t memory_usage() const
+        {
+            return sizeof(Data)''' % (self._table.upper(), self._table.upper())
+        for field in self._fields:
+            if base_data_types_reverse[field['type']] == 'wxString':
+                s += '''
+                + db_string_heap(%s)''' % field['name']
+        s += ''';
+        }
     };
-''' % (self._table.upper(), self._table.upper())
+'''
         s += '''
     enum
     {
@@ -580,7 +997,9 @@ struct DB_Table_%s : public DB_Table
 ''' % self._table
 
         s += '''
-    DB_Table_%s() : fake_(new Data())
+    Data fake_record_; // outside of the DB_Pool, so the slabs are released with the cache
+
+    DB_Table_%s() : fake_(&fake_record_)
     {
         query_ = "SELECT %s FROM %s ";
     }
@@ -591,7 +1010,7 @@ struct DB_Table_%s : public DB_Table
     Self::Data* create()
     {
         Self::Data* entity = new Self::Data(this);
-        cache_.push_back(entity);
+        cache_.insert(entity);
         return entity;
     }
     
@@ -604,52 +1023,93 @@ struct DB_Table_%s : public DB_Table
         return entity;
     }
 '''
+        columns = [field['name'] for field in self._fields if not field['pk']]
+        assert len(columns) <= 64, 'Data::diff() holds one bit per column'
         s += '''
+    /** Return "UPDATE %s SET <the columns in changed> = ? WHERE %s = ?", all of them for ~0 */
+    static wxString update_sql(uint64_t changed)
+    {
+        static const char* columns[] = { %s };
+        wxString sql = "UPDATE %s SET ";
+        wxString separator;
+        for (size_t i = 0; i < sizeof(columns) / sizeof(columns[0]); ++ i)
+        {
+            if (!(changed & (uint64_t(1) << i))) continue;
+            sql += separator + columns[i] + " = ?";
+            separator = ", ";
+        }
+        return sql + " WHERE %s = ?";
+    }
+
+    /** Return the cached record of the id of entity holding the values stored in the database, unless it is entity itself */
+    const Self::Data* cached_other(const Self::Data* entity) const
+    {
+        if (entity->id() <= 0) return nullptr;
+        auto it = index_by_id_.find(entity->id());
+        return (it != index_by_id_.end() && it->second != entity) ? it->second : nullptr;
+    }
+
     /**
     * Saves the Data record to the database table.
     * Either create a new record or update the existing record.
+    * A copy of a cached record only writes the columns it changed, nothing when it equals() the cached one.
     * Remove old record from the memory table (cache)
     */
     bool save(Self::Data* entity, wxSQLite3Database* db, bool force_insert = false)
     {
+        DB_Op_Timer timer(this, DB_OP_SAVE);
+        timer.returned_ = 1;
+        uint64_t changed = ~uint64_t(0);
+        if (entity->id() > 0 && !force_insert)
+        {
+            // the cached record holds the values stored in the database
+            auto it = index_by_id_.find(entity->id());
+            if (it != index_by_id_.end() && it->second != entity)
+            {
+                changed = it->second->diff(entity);
+                if (!changed)
+                {
+                    timer.returned_ = 0;
+                    return true;
+                }
+            }
+        }
+
+        const bool insert = entity->id() <= 0 || force_insert;
         wxString sql = wxEmptyString;
-        if (entity->id() <= 0 || force_insert) //  new & insert
+        if (insert) //  new & insert
         {
             sql = "INSERT INTO %s(%s, %s) VALUES(%s)";
-        }''' % (self._table, ', '.join([field['name']\
-                for field in self._fields if not field['pk']]), self._primay_key,
-                ', '.join(['?' for field in self._fields]))
-
-        s += '''
+        }
         else
         {
-            sql = "UPDATE %s SET %s WHERE %s = ?";
+            sql = update_sql(changed);
         }
 
         try
         {
-            wxSQLite3Statement stmt = db->PrepareStatement(sql);
-''' % (self._table, ', '.join([field['name'] + ' = ?'\
-        for field in self._fields if not field['pk']]), self._primay_key)
+            wxSQLite3Statement& stmt = statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            int index = 1;
+''' % (self._table, self._primay_key, ', '.join(['"%s"' % c for c in columns]), self._table, self._primay_key,
+        self._table, ', '.join(columns), self._primay_key, ', '.join(['?' for field in self._fields]))
 
-        for index, name in enumerate([field['name'] for field in self._fields if not field['pk']]):
+        for i, name in enumerate(columns):
             s += '''
-            stmt.Bind(%d, entity->%s);'''% (index + 1, name)
-
+            if (insert || (changed & (uint64_t(1) << %d))) stmt.Bind(index++, entity->%s);''' % (i, name)
 
         s += '''
-            stmt.Bind(%d, entity->id() > 0 ? entity->%s : newId());
+            stmt.Bind(index, entity->id() > 0 ? entity->%s : newId());
 
             stmt.ExecuteUpdate();
-            stmt.Finalize();
 
             if (entity->id() > 0) // existent
             {
-                for(Cache::iterator it = cache_.begin(); it != cache_.end(); ++ it)
+                auto it = index_by_id_.find(entity->id());
+                if (it != index_by_id_.end())
                 {
-                    Self::Data* e = *it;
-                    if (e->id() == entity->id()) 
-                        *e = *entity;  // in-place update
+                    if (it->second != entity) *(it->second) = *entity;  // in-place update
+                    reindex(it->second);
                 }
             }
         }
@@ -662,41 +1122,168 @@ struct DB_Table_%s : public DB_Table
         if (entity->id() <= 0)
         {
             entity->id(db->GetLastRowId());
-            index_by_id_.insert(std::make_pair(entity->id(), entity));
-        }
+            // only records owned by the cache are indexed, copies held by callers are not
+            if (cache_.count(entity))
+            {
+                track(entity);
+                reindex(entity);
+            }
+        }''' % (self._primay_key, self._table)
+        if self._series:
+            s += '''
+        series_.update(%s);''' % self.series_args('entity->')
+        s += '''
         return true;
     }
-''' % (len(self._fields), self._primay_key, self._table)
+'''
 
+        columns = [field['name'] for field in self._fields if not field['pk']]
         s += '''
-    /** Remove the Data record from the database and the memory table (cache) */
-    bool remove(const int64 id, wxSQLite3Database* db)
+    /**
+    * Saves the Data records to the database table in a single transaction,
+    * with one prepared statement for the inserts and one for each set of changed columns of the updates.
+    * As save(), a copy of a cached record only writes the columns it changed from the cached one.
+    * New records take their ids from one block reserved by newIds()
+    * and the memory table (cache) is brought up to date in one pass afterwards.
+    */
+    bool save_all(std::vector<Self::Data*>& entities, wxSQLite3Database* db, bool force_insert = false)
     {
-        if (id <= 0) return false;
+        std::vector<const Self::Data*> stored(entities.size(), nullptr);
+        if (!force_insert)
+        {
+            for (size_t i = 0; i < entities.size(); ++ i)
+                stored[i] = cached_other(entities[i]);
+        }
+        return save_all(entities, db, stored, force_insert);
+    }
+
+    /**
+    * As save_all(), with stored[i] the record entities[i] as held by the database (nullptr if unknown):
+    * only the columns each record changed from it are written, the records equal to it are skipped.
+    */
+    bool save_all(std::vector<Self::Data*>& entities, wxSQLite3Database* db, const std::vector<const Self::Data*>& stored, bool force_insert = false)
+    {
+        DB_Op_Timer timer(this, DB_OP_SAVE);
+        timer.returned_ = entities.size();
+        if (db->IsReadOnly()) return false;
+
+        size_t count = 0;
+        for (const auto* entity : entities)
+            if (entity->id() <= 0) ++ count;
+        int64 next_id = count > 0 ? newIds(count) : int64(0);
+        std::vector<int64> ids; // id of each entity once saved
+        ids.reserve(entities.size());
+
+        db->Savepoint("save_all");
         try
         {
-            wxString sql = "DELETE FROM %s WHERE %s = ?";
-            wxSQLite3Statement stmt = db->PrepareStatement(sql);
-            stmt.Bind(1, id);
-            stmt.ExecuteUpdate();
-            stmt.Finalize();
+            wxSQLite3Statement& insert = statement(db, "INSERT INTO %s(%s, %s) VALUES(%s)");
+            wxSQLite3Statement* update = nullptr;
+            uint64_t update_changed = 0; // the columns update writes
 
-            Cache c;
-            for(Cache::iterator it = cache_.begin(); it != cache_.end(); ++ it)
+            for (size_t i = 0; i < entities.size(); ++ i)
             {
-                Self::Data* entity = *it;
-                if (entity->id() == id) 
+                const Self::Data* entity = entities[i];
+                if (entity->id() > 0)
+                    ids.push_back(entity->%s);
+                else
+                {
+                    ids.push_back(next_id);
+                    next_id += 1;
+                }
+
+                const bool is_insert = entity->id() <= 0 || force_insert;
+                uint64_t changed = ~uint64_t(0);
+                if (!is_insert && i < stored.size() && stored[i] && stored[i] != entity)
+                {
+                    changed = stored[i]->diff(entity);
+                    if (!changed)
+                    {
+                        -- timer.returned_;
+                        continue;
+                    }
+                }
+                if (!is_insert && (!update || changed != update_changed))
                 {
-                    index_by_id_.erase(entity->id());
-                    delete entity;
+                    update = &statement(db, update_sql(changed));
+                    update_changed = changed;
                 }
-                else 
+
+                wxSQLite3Statement& stmt = is_insert ? insert : *update;
+                DB_Statement_Reset reset(stmt);
+                int index = 1;''' % (self._table, ', '.join(columns), self._primay_key, ', '.join(['?' for field in self._fields]),
+        self._primay_key)
+
+        for i, name in enumerate(columns):
+            s += '''
+                if (is_insert || (changed & (uint64_t(1) << %d))) stmt.Bind(index++, entity->%s);''' % (i, name)
+
+        s += '''
+                stmt.Bind(index, ids.back());
+
+                stmt.ExecuteUpdate();
+            }
+            db->ReleaseSavepoint("save_all");
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+            try
+            {
+                db->RollbackToSavepoint("save_all");
+                db->ReleaseSavepoint("save_all");
+            }
+            catch(const wxSQLite3Exception &) {}
+            return false;
+        }
+
+        for (size_t i = 0; i < entities.size(); ++ i)
+        {
+            Self::Data* entity = entities[i];
+            if (entity->id() > 0)
+            {
+                auto it = index_by_id_.find(entity->id());
+                if (it != index_by_id_.end())
                 {
-                    c.push_back(entity);
+                    if (it->second != entity) *(it->second) = *entity;  // in-place update
+                    reindex(it->second);
                 }
             }
-            cache_.clear();
-            cache_.swap(c);
+            else
+            {
+                entity->id(ids[i]);
+                // only records owned by the cache are indexed, copies held by callers are not
+                if (cache_.count(entity))
+                {
+                    track(entity);
+                    reindex(entity);
+                }
+            }'''
+        if self._series:
+            s += '''
+            series_.update(%s);''' % self.series_args('entity->')
+        s += '''
+        }
+
+        return true;
+    }
+'''
+
+        s += '''
+    /** Remove the Data record from the database and the memory table (cache) */
+    bool remove(const int64 id, wxSQLite3Database* db)
+    {
+        if (id <= 0) return false;
+        DB_Op_Timer timer(this, DB_OP_REMOVE);
+        timer.returned_ = 1;
+        try
+        {
+            wxString sql = "DELETE FROM %s WHERE %s = ?";
+            wxSQLite3Statement& stmt = statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            stmt.Bind(1, id);
+            stmt.ExecuteUpdate();
+%s            uncache(id);
         }
         catch(const wxSQLite3Exception &e) 
         { 
@@ -710,75 +1297,312 @@ struct DB_Table_%s : public DB_Table
     /** Remove the Data record from the database and the memory table (cache) */
     bool remove(Self::Data* entity, wxSQLite3Database* db)
     {
+        // the cached instance is deleted together with its cache entry
+        auto it = index_by_id_.find(entity->id());
+        const bool cached = it != index_by_id_.end() && it->second == entity;
         if (remove(entity->id(), db))
         {
-            entity->id(-1);
+            if (!cached) entity->id(-1);
             return true;
         }
 
         return false;
     }
-''' % (self._table, self._primay_key, self._table)
+''' % (self._table, self._primay_key,
+        '            series_.erase(id);\n' if self._series else '', self._table)
 
         s += '''
-    template<typename... Args>
-    Self::Data* get_one(const Args& ... args)
+    /** Drop the removed or changed record of id from the memory table (cache) */
+    void uncache(const int64 id)
     {
-        for (auto& [_, item] : index_by_id_)
+        if (auto it = index_by_id_.find(id); it != index_by_id_.end())
         {
-            if (item->id() > 0 && match(item, args...)) 
-            {
-                ++ hit_;
-                return item;
-            }
+            Self::Data* entity = it->second;
+            index_by_id_.erase(it);
+            unindex(entity);
+            resident_bytes_ -= std::min(resident_bytes_, entity->memory_usage());
+            if (cache_.erase(entity)) delete entity;
         }
+    }
 
-        ++ miss_;
-
-        return 0;
-    }'''
-
-        s += '''
-    
     /**
-    * Search the memory table (Cache) for the data record.
-    * If not found in memory, search the database and update the cache.
+    * Remove the Data records matching the conditions from the database with one DELETE statement,
+    * then drop them from the memory table (cache) in one pass.
+    * Return the ids of the records removed.
     */
-    Self::Data* get(const int64 id, wxSQLite3Database* db)
+    template<typename... Args>
+    std::vector<int64> delete_by(wxSQLite3Database* db, bool op_and, const Args&... args)
     {
-        if (id <= 0) 
-        {
-            ++ skip_;
-            return nullptr;
-        }
-
-        if (auto it = index_by_id_.find(id); it != index_by_id_.end())
-        {
-            ++ hit_;
-            return it->second;
-        }
-        
-        ++ miss_;
-        Self::Data* entity = nullptr;
-        wxString where = wxString::Format(" WHERE %s = ?", PRIMARY::name().utf8_str());
+        static_assert(sizeof...(Args) > 0, "delete_by() without conditions would remove all the records");
+        DB_Op_Timer timer(this, DB_OP_REMOVE);
+        std::vector<int64> ids;
         try
         {
-            wxSQLite3Statement stmt = db->PrepareStatement(this->query() + where);
-            stmt.Bind(1, id);
+            wxString sql = "DELETE FROM %s WHERE ";
+            condition(sql, op_and, args...);
+            sql += " RETURNING %s";
+            wxSQLite3Statement& stmt = statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            bind(stmt, 1, args...);
 
             wxSQLite3ResultSet q = stmt.ExecuteQuery();
-            if(q.NextRow())
-            {
+            while(q.NextRow())
+                ids.push_back(q.GetInt64(0));
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %%s", e.GetMessage().utf8_str());
+            return ids;
+        }
+
+        for (const auto& id : ids)
+        {''' % (self._table, self._primay_key, self._table)
+        if self._series:
+            s += '''
+            series_.erase(id);'''
+        s += '''
+            uncache(id);
+        }
+        timer.returned_ = ids.size();
+
+        return ids;
+    }
+
+    /**
+    * Set the columns of set in the Data records matching the conditions with one UPDATE statement,
+    * then apply them to the cached records in one pass.
+    * Example: update_by(db, std::make_tuple(STATUS("R")), true, ACCOUNTID(2))
+    * produces SQL statement: UPDATE %s SET STATUS = ? WHERE ACCOUNTID = ?
+    * Return the ids of the records changed.
+    */
+    template<typename... Sets, typename... Args>
+    std::vector<int64> update_by(wxSQLite3Database* db, const std::tuple<Sets...>& set, bool op_and, const Args&... args)
+    {
+        static_assert(sizeof...(Sets) > 0, "update_by() without columns to set");
+        static_assert(sizeof...(Args) > 0, "update_by() without conditions would change all the records");
+        DB_Op_Timer timer(this, DB_OP_SAVE);
+        std::vector<int64> ids;
+        try
+        {
+            wxString sql = "UPDATE %s SET ";
+            wxString separator;
+            ((sql += separator + Sets::name() + " = ?", separator = ", "), ...);
+            sql += " WHERE ";
+            condition(sql, op_and, args...);
+            sql += " RETURNING %s";
+            wxSQLite3Statement& stmt = statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            std::apply([&stmt](const auto&... column) { bind(stmt, 1, column...); }, set);
+            bind(stmt, static_cast<int>(sizeof...(Sets) + 1), args...);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+                ids.push_back(q.GetInt64(0));
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %%s", e.GetMessage().utf8_str());
+            return ids;
+        }
+
+        for (const auto& id : ids)
+        {
+            if (auto it = index_by_id_.find(id); it != index_by_id_.end())
+            {
+                Self::Data* entity = it->second;
+                std::apply([entity](const auto&... column) { (entity->assign(column), ...); }, set);
+                reindex(entity);
+            }
+        }''' % (self._table, self._table, self._primay_key, self._table)
+        if self._series:
+            s += '''
+        if (!ids.empty()) series_.clear(); // read again on next use'''
+        s += '''
+        timer.returned_ = ids.size();
+
+        return ids;
+    }
+'''
+
+        s += '''
+    /** Return the cached record matching args with the smallest id, 0 if none */
+    template<typename... Args>
+    Self::Data* get_one(const Args& ... args)
+    {
+        Self::Data* found = 0;
+        for (auto& [_, item] : index_by_id_)
+        {
+            if (item->id() > 0 && (!found || item->id() < found->id()) && match(item, args...))
+                found = item;
+        }
+
+        if (!found)
+        {
+            ++ miss_;
+            return 0;
+        }
+
+        ++ hit_;
+        found->referenced_ = true;
+        return found;
+    }'''
+
+        for columns in self._memory_index:
+            params = ', '.join(['const %s& c%d' % (c, i) for i, c in enumerate(columns)])
+            args = ', '.join(['c%d' % i for i in range(len(columns))])
+            key = self.memory_index_key(columns, ['c%d.v_' % i for i in range(len(columns))])
+            s += '''
+
+    /** Search the cached records through the in-memory index over %s, the match with the smallest id is returned */
+    template<typename... Args>
+    Self::Data* get_one(%s, const Args& ... args)
+    {
+        Self::Data* found = 0;
+        auto range = %s.equal_range(%s);
+        for (auto it = range.first; it != range.second; ++ it)
+        {
+            Self::Data* item = it->second;
+            if (item->id() > 0 && (!found || item->id() < found->id()) && match(item, %s, args...))
+                found = item;
+        }
+
+        if (!found)
+        {
+            ++ miss_;
+            return 0;
+        }
+
+        ++ hit_;
+        found->referenced_ = true;
+        return found;
+    }''' % (', '.join(columns), params, self.memory_index_name(columns), key, args)
+
+        entity = 'entity' if self._memory_index else '/* entity */'
+        s += '''
+
+    /** Add or move the cached record in the in-memory indexes */
+    void reindex(Self::Data* %s)
+    {''' % entity
+        for columns in self._memory_index:
+            s += '''
+        %s.insert(%s, entity);''' % (self.memory_index_name(columns),
+                self.memory_index_key(columns, ['entity->' + c for c in columns]))
+        s += '''
+    }
+
+    /** Remove the cached record from the in-memory indexes */
+    void unindex(Self::Data* %s)
+    {''' % entity
+        for columns in self._memory_index:
+            s += '''
+        %s.erase(entity);''' % self.memory_index_name(columns)
+        s += '''
+    }
+
+    /** Add the cached record to the id index and the CLOCK ring */
+    void track(Self::Data* entity)
+    {
+        index_by_id_.insert(std::make_pair(entity->id(), entity));
+        resident_bytes_ += entity->memory_usage();
+        entity->referenced_ = true;
+        if (clock_.size() > 2 * index_by_id_.size() + 64)
+        {
+            // drop the ids of removed records
+            clock_.clear();
+            clock_hand_ = 0;
+            for (const auto& [id, _] : index_by_id_) clock_.push_back(id);
+        }
+        else
+            clock_.push_back(entity->id());
+    }
+
+    /**
+    * Evict records from the memory table (cache) until it fits the budget set by cache_budget().
+    * The CLOCK hand gives a second chance to the records used since its last sweep.
+    * Evicted records stay allocated until release_evicted(), callers may still hold them.
+    */
+    void shrink()
+    {
+        while (over_budget(index_by_id_.size()) && !clock_.empty())
+        {
+            if (clock_hand_ >= clock_.size()) clock_hand_ = 0;
+            auto it = index_by_id_.find(clock_[clock_hand_]);
+            if (it != index_by_id_.end() && it->second->referenced_)
+            {
+                it->second->referenced_ = false;
+                ++ clock_hand_;
+                continue;
+            }
+
+            clock_[clock_hand_] = clock_.back();
+            clock_.pop_back();
+            if (it == index_by_id_.end()) continue; // removed from the database
+
+            Self::Data* entity = it->second;
+            index_by_id_.erase(it);
+            unindex(entity);
+            cache_.erase(entity);
+            resident_bytes_ -= std::min(resident_bytes_, entity->memory_usage());
+            evicted_.push_back(entity);
+            ++ evict_;
+        }
+    }
+
+    /** Free the evicted records, only when no caller holds a pointer to them anymore */
+    void release_evicted()
+    {
+        std::for_each(evicted_.begin(), evicted_.end(), std::mem_fn(&Data::destroy));
+        evicted_.clear();
+    }'''
+
+        s += '''
+    
+    /**
+    * Search the memory table (Cache) for the data record.
+    * If not found in memory, search the database and update the cache.
+    */
+    Self::Data* get(const int64 id, wxSQLite3Database* db)
+    {
+        DB_Op_Timer timer(this, DB_OP_GET);
+        if (id <= 0) 
+        {
+            ++ skip_;
+            return nullptr;
+        }
+
+        if (auto it = index_by_id_.find(id); it != index_by_id_.end())
+        {
+            ++ hit_;
+            it->second->referenced_ = true;
+            timer.returned_ = 1;
+            return it->second;
+        }
+        
+        ++ miss_;
+        Self::Data* entity = nullptr;
+        wxString where = wxString::Format(" WHERE %s = ?", PRIMARY::name().utf8_str());
+        try
+        {
+            wxSQLite3Statement& stmt = statement(db, this->query() + where);
+            DB_Statement_Reset reset(stmt);
+            stmt.Bind(1, id);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            if(q.NextRow())
+            {
                 entity = new Self::Data(q, this);
-                cache_.push_back(entity);
-                index_by_id_.insert(std::make_pair(id, entity));
+                ++ timer.decoded_;
+                timer.returned_ = 1;
+                cache_.insert(entity);
+                track(entity);
+                reindex(entity);
             }
-            stmt.Finalize();
         }
         catch(const wxSQLite3Exception &e) 
         { 
             wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
         }
+        shrink();
         
         if (!entity) 
         {
@@ -790,9 +1614,11 @@ struct DB_Table_%s : public DB_Table
     }
     /**
     * Search the database for the data record, bypassing the cache.
+    * The caller owns the record returned, nullptr when not found.
     */
     Self::Data* get_record(const int64 id, wxSQLite3Database* db)
     {
+        DB_Op_Timer timer(this, DB_OP_GET);
         if (id <= 0) 
         {
             ++ skip_;
@@ -803,136 +1629,1599 @@ struct DB_Table_%s : public DB_Table
         wxString where = wxString::Format(" WHERE %s = ?", PRIMARY::name().utf8_str());
         try
         {
-            wxSQLite3Statement stmt = db->PrepareStatement(this->query() + where);
+            wxSQLite3Statement& stmt = statement(db, this->query() + where);
+            DB_Statement_Reset reset(stmt);
             stmt.Bind(1, id);
 
             wxSQLite3ResultSet q = stmt.ExecuteQuery();
             if(q.NextRow())
             {
                 entity = new Self::Data(q, this);
+                ++ timer.decoded_;
+                timer.returned_ = 1;
             }
-            stmt.Finalize();
         }
         catch(const wxSQLite3Exception &e) 
         { 
             wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
         }
-        
-        if (!entity) 
+ 
+        return entity;
+    }
+'''
+        pk_column = [field['name'] for field in self._fields].index(self._primay_key)
+        s += '''
+    /**
+    * Load the Data records for the ids into the memory table (cache).
+    * The ids not cached yet are read with IN lists of GET_MANY_CHUNK ids, one round trip per chunk.
+    * Return the records in the order of the ids, as get() would.
+    */
+    std::vector<Self::Data*> get_many(const std::vector<int64>& ids, wxSQLite3Database* db)
+    {
+        DB_Op_Timer timer(this, DB_OP_GET);
+        std::vector<int64> missing;
+        for (const auto& id : ids)
+        {
+            if (id <= 0)
+                ++ skip_;
+            else if (auto it = index_by_id_.find(id); it != index_by_id_.end())
+            {
+                ++ hit_;
+                it->second->referenced_ = true;
+            }
+            else
+                missing.push_back(id);
+        }
+        std::sort(missing.begin(), missing.end());
+        missing.erase(std::unique(missing.begin(), missing.end()), missing.end());
+        miss_ += missing.size();
+
+        static const wxString where = where_in(PRIMARY::name());
+        for (size_t first = 0; first < missing.size(); first += GET_MANY_CHUNK)
+        {
+            try
+            {
+                wxSQLite3Statement& stmt = statement(db, this->query() + where);
+                DB_Statement_Reset reset(stmt);
+                // a short chunk repeats its last id, so all chunks share one statement
+                for (size_t i = 0; i < GET_MANY_CHUNK; ++ i)
+                    stmt.Bind(static_cast<int>(i + 1), missing[std::min(first + i, missing.size() - 1)]);
+
+                wxSQLite3ResultSet q = stmt.ExecuteQuery();
+                while(q.NextRow())
+                {
+                    Self::Data* entity = new Self::Data(q, this);
+                    ++ timer.decoded_;
+                    cache_.insert(entity);
+                    track(entity);
+                    reindex(entity);
+                }
+            }
+            catch(const wxSQLite3Exception &e) 
+            { 
+                wxLogError("%%s: Exception %%s", this->name().utf8_str(), e.GetMessage().utf8_str());
+            }
+        }
+
+        std::vector<Self::Data*> result;
+        result.reserve(ids.size());
+        for (const auto& id : ids)
+        {
+            if (id <= 0)
+                result.push_back(nullptr);
+            else if (auto it = index_by_id_.find(id); it != index_by_id_.end())
+                result.push_back(it->second);
+            else
+                result.push_back(this->fake_);
+        }
+        shrink();
+        timer.returned_ = result.size();
+
+        return result;
+    }
+
+    /**
+    * Return the records of the ids as stored in the database, keyed by id, bypassing the memory table (cache).
+    * The ids are read with IN lists of GET_MANY_CHUNK ids as get_many() does, the ids not found are left out.
+    */
+    std::map<int64, Self::Data> get_records(const std::vector<int64>& ids, wxSQLite3Database* db)
+    {
+        DB_Op_Timer timer(this, DB_OP_GET);
+        std::vector<int64> wanted;
+        for (const auto& id : ids)
+        {
+            if (id <= 0)
+                ++ skip_;
+            else
+                wanted.push_back(id);
+        }
+        std::sort(wanted.begin(), wanted.end());
+        wanted.erase(std::unique(wanted.begin(), wanted.end()), wanted.end());
+
+        std::map<int64, Self::Data> result;
+        static const wxString where = where_in(PRIMARY::name());
+        for (size_t first = 0; first < wanted.size(); first += GET_MANY_CHUNK)
+        {
+            try
+            {
+                wxSQLite3Statement& stmt = statement(db, this->query() + where);
+                DB_Statement_Reset reset(stmt);
+                // a short chunk repeats its last id, so all chunks share one statement
+                for (size_t i = 0; i < GET_MANY_CHUNK; ++ i)
+                    stmt.Bind(static_cast<int>(i + 1), wanted[std::min(first + i, wanted.size() - 1)]);
+
+                wxSQLite3ResultSet q = stmt.ExecuteQuery();
+                while(q.NextRow())
+                {
+                    Self::Data entity(q, this);
+                    ++ timer.decoded_;
+                    result.emplace(entity.id(), std::move(entity));
+                }
+            }
+            catch(const wxSQLite3Exception &e) 
+            { 
+                wxLogError("%%s: Exception %%s", this->name().utf8_str(), e.GetMessage().utf8_str());
+            }
+        }
+        timer.returned_ = result.size();
+
+        return result;
+    }
+
+    /**
+    * Fill the memory table (cache) from a single scan of up to max_num records (-1 for all).
+    * Records already in the cache are kept as they are.
+    */
+    void preload(wxSQLite3Database* db, int max_num = -1)
+    {
+        DB_Op_Timer timer(this, DB_OP_ALL);
+        try
+        {
+            wxSQLite3Statement& stmt = statement(db, this->query() + " LIMIT ?");
+            DB_Statement_Reset reset(stmt);
+            stmt.Bind(1, max_num);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+            {
+                if (index_by_id_.find(q.GetInt64(%d)) != index_by_id_.end()) continue;
+                if (max_records_ > 0 && index_by_id_.size() >= max_records_) break;
+                if (max_bytes_ > 0 && resident_bytes_ >= max_bytes_) break;
+
+                Self::Data* entity = new Self::Data(q, this);
+                ++ timer.decoded_;
+                cache_.insert(entity);
+                track(entity);
+                reindex(entity);
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%%s: Exception %%s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+    }
+''' % pk_column
+
+        if self._parent_keys:
+            s += '''
+    /** The parent id of a record, defined only for the columns find_children() accepts */'''
+            for key in self._parent_keys:
+                s += '''
+    static int64 parent_id(const Self::Data& entity, const %s*) { return entity.%s; }''' % (key, key)
+            s += '''
+
+    /**
+    * Return the Data records of all the parent ids, grouped by parent id, where PARENT
+    * is a column referring to another table (%s).
+    * The ids are read with IN lists of GET_MANY_CHUNK ids, one round trip per chunk instead of
+    * one find() per parent, the conditions args are added to each query.
+    * Example: find_children<%s>(ids, db) produces SQL statement: SELECT ... FROM %s WHERE %s IN (?, ...)
+    */
+    template<class PARENT, typename... Args>
+    std::map<int64, Data_Set> find_children(const std::vector<int64>& parent_ids, wxSQLite3Database* db, const Args&... args)
+    {
+        DB_Op_Timer timer(this, DB_OP_FIND);
+        std::vector<int64> ids(parent_ids);
+        std::sort(ids.begin(), ids.end());
+        ids.erase(std::unique(ids.begin(), ids.end()), ids.end());
+
+        std::map<int64, Data_Set> result;
+        wxString sql = this->query() + where_in(PARENT::name());
+        if constexpr (sizeof...(Args) > 0)
+        {
+            sql += " AND ";
+            condition(sql, true, args...);
+        }
+        for (size_t first = 0; first < ids.size(); first += GET_MANY_CHUNK)
+        {
+            try
+            {
+                wxSQLite3Statement& stmt = statement(db, sql);
+                DB_Statement_Reset reset(stmt);
+                // a short chunk repeats its last id, so all chunks share one statement
+                for (size_t i = 0; i < GET_MANY_CHUNK; ++ i)
+                    stmt.Bind(static_cast<int>(i + 1), ids[std::min(first + i, ids.size() - 1)]);
+                if constexpr (sizeof...(Args) > 0)
+                    bind(stmt, static_cast<int>(GET_MANY_CHUNK + 1), args...);
+
+                wxSQLite3ResultSet q = stmt.ExecuteQuery();
+                while(q.NextRow())
+                {
+                    Self::Data entity(q, this);
+                    ++ timer.decoded_;
+                    ++ timer.returned_;
+                    result[parent_id(entity, static_cast<const PARENT*>(nullptr))].push_back(std::move(entity));
+                }
+            }
+            catch(const wxSQLite3Exception &e) 
+            { 
+                wxLogError("%%s: Exception %%s", this->name().utf8_str(), e.GetMessage().utf8_str());
+            }
+        }
+
+        return result;
+    }
+''' % (', '.join(self._parent_keys), self._parent_keys[0], self._table, self._parent_keys[0])
+
+        if self._fts:
+            s += '''
+    /** The columns search() accepts */
+    static constexpr bool searchable(const void*) { return false; }'''
+            for c in self._fts:
+                s += '''
+    static constexpr bool searchable(const %s*) { return true; }''' % c
+            s += '''
+
+    /**
+    * Return the ids of the records holding words starting with each word of text, best match first,
+    * looked up in the full-text index of %s, or of the columns COLS only.
+    * At most limit ids are returned, all of them for a negative limit.
+    * Example: search<%s>("rent april", db) produces SQL statement:
+    *   SELECT rowid FROM %s_FTS WHERE %s_FTS MATCH '{%s} : ("rent"* "april"*)' ORDER BY rank
+    */
+    template<class... COLS>
+    std::vector<int64> search(const wxString& text, wxSQLite3Database* db, int limit = -1)
+    {
+        static_assert((searchable(static_cast<const COLS*>(nullptr)) && ...), "search() of a column not in the full-text index");
+        DB_Op_Timer timer(this, DB_OP_FIND);
+        std::vector<int64> ids;
+        wxString query = match_query(text);
+        if (query.empty()) return ids;
+        if constexpr (sizeof...(COLS) > 0)
+        {
+            wxString columns;
+            ((columns += (columns.empty() ? "" : " ") + COLS::name()), ...);
+            query = "{" + columns + "} : (" + query + ")";
+        }
+
+        try
+        {
+            wxSQLite3Statement& stmt = statement(db, "SELECT rowid FROM %s_FTS WHERE %s_FTS MATCH ? ORDER BY rank LIMIT ?");
+            DB_Statement_Reset reset(stmt);
+            stmt.Bind(1, query);
+            stmt.Bind(2, limit);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+            {
+                ids.push_back(q.GetInt64(0));
+                ++ timer.returned_;
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%%s: Exception %%s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        return ids;
+    }
+''' % (', '.join(self._fts), self._fts[0], self._table, self._table, self._fts[0],
+            self._table, self._table)
+
+        if self._balance:
+            create, fill, verify = balance_sql(self._table, self._balance)
+            key = self._balance['key']
+            s += '''
+    /** The sums of the flows of the records per %s, kept by the triggers of ensure_balance() */
+    struct Balance
+    {
+        double flow_ = 0.0;
+        double reconciled_ = 0.0; // of the reconciled records only
+    };
+    typedef std::map<int64, Balance> Balances;
+    typedef std::vector<std::pair<wxString, Balance>> Running_Balances;
+
+    /**
+    * Return the Balance of each %s, of all the records or of the records up to and including the ISO day.
+    * One summary row is read per %s, or per %s and day up to day.
+    */
+    Balances balances(wxSQLite3Database* db, const wxString& day = wxEmptyString)
+    {
+        DB_Op_Timer timer(this, DB_OP_SELECT);
+        Balances result;
+        try
+        {
+            wxSQLite3Statement& stmt = day.empty()
+                ? statement(db, "SELECT %s, FLOW, RECFLOW FROM %s_BALANCE")
+                : statement(db, "SELECT %s, SUM(FLOW), SUM(RECFLOW) FROM %s_BALANCE_DAY WHERE DAY <= ? GROUP BY %s");
+            DB_Statement_Reset reset(stmt);
+            if (!day.empty()) stmt.Bind(1, day);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+            {
+                Balance& balance = result[q.GetInt64(0)];
+                balance.flow_ = q.GetDouble(1);
+                balance.reconciled_ = q.GetDouble(2);
+                ++ timer.returned_;
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%%s: Exception %%s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        return result;
+    }
+
+    /** Return the Balance of all the records of the %s key */
+    Balance balance(int64 key, wxSQLite3Database* db)
+    {
+        DB_Op_Timer timer(this, DB_OP_SELECT);
+        Balance balance;
+        try
+        {
+            wxSQLite3Statement& stmt = statement(db, "SELECT FLOW, RECFLOW FROM %s_BALANCE WHERE %s = ?");
+            DB_Statement_Reset reset(stmt);
+            stmt.Bind(1, key);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            if (q.NextRow())
+            {
+                balance.flow_ = q.GetDouble(0);
+                balance.reconciled_ = q.GetDouble(1);
+                ++ timer.returned_;
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%%s: Exception %%s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        return balance;
+    }
+
+    /** Return the running Balance of the %s key at the end of each day it has records, ordered by day */
+    Running_Balances running_balances(int64 key, wxSQLite3Database* db)
+    {
+        DB_Op_Timer timer(this, DB_OP_SELECT);
+        Running_Balances result;
+        try
+        {
+            wxSQLite3Statement& stmt = statement(db, "SELECT DAY, SUM(FLOW) OVER (ORDER BY DAY), SUM(RECFLOW) OVER (ORDER BY DAY)"
+                " FROM %s_BALANCE_DAY WHERE %s = ? ORDER BY DAY");
+            DB_Statement_Reset reset(stmt);
+            stmt.Bind(1, key);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+            {
+                Balance balance;
+                balance.flow_ = q.GetDouble(1);
+                balance.reconciled_ = q.GetDouble(2);
+                result.emplace_back(q.GetString(0), balance);
+                ++ timer.returned_;
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%%s: Exception %%s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        return result;
+    }
+
+    /**
+    * Compare the balance summary tables with a full recompute from the records, and recompute them when repair is set.
+    * Return the number of %s and day pairs where they differ by more than %s, -1 when the check failed.
+    */
+    int verify_balances(wxSQLite3Database* db, bool repair = false)
+    {
+        DB_Op_Timer timer(this, DB_OP_SELECT);
+        int differences = -1;
+        try
+        {
+            differences = db->ExecuteScalar("%s");
+            if (differences > 0)
+            {
+                wxLogError("%s: %%d differences in the balance summary", differences);
+                if (repair)
+                {
+                    db->Savepoint("fill_balances");
+                    this->fill_balances(db);
+                    db->ReleaseSavepoint("fill_balances");
+                }
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%%s: Exception %%s", this->name().utf8_str(), e.GetMessage().utf8_str());
+            try
+            {
+                db->RollbackToSavepoint("fill_balances");
+                db->ReleaseSavepoint("fill_balances");
+            }
+            catch(const wxSQLite3Exception &) {}
+        }
+
+        return differences;
+    }
+''' % (key, key, key, key, key, self._table, key, self._table, key,
+            key, self._table, key, key, self._table, key,
+            key, balance_tolerance, verify, self._table)
+
+        if self._series:
+            key, date, value = self._series
+            key_type = base_data_types_reverse[self.field_type(key)]
+            s += '''
+    /**
+    * Return the %s of the %s ordered by %s, read with one query the first time
+    * and kept up to date by save() and remove() afterwards.
+    */
+    const Series::Points& series(const %s& key, wxSQLite3Database* db)
+    {
+        if (const auto* points = series_.find(key)) return *points;
+
+        DB_Op_Timer timer(this, DB_OP_FIND);
+        Series::Points& points = series_.load(key);
+        try
+        {
+            wxSQLite3Statement& stmt = statement(db, "SELECT %s, %s, %s FROM %s WHERE %s = ? ORDER BY %s");
+            DB_Statement_Reset reset(stmt);
+            stmt.Bind(1, key);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+            {
+                series_.add(points, key, q.GetString(1), q.GetDouble(2), q.GetInt64(0));
+                ++ timer.decoded_;
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%%s: Exception %%s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = points.size();
+        return points;
+    }
+
+    /** Return the point of the %s dated on or before date, nullptr when its series starts later */
+    const Series::Point* on_or_before(const %s& key, const wxString& date, wxSQLite3Database* db)
+    {
+        return Series::on_or_before(series(key, db), date);
+    }
+
+    /** Return the %s of the %s on or before each of the dates, missing where its series starts later */
+    std::vector<double> on_or_before(const %s& key, const std::vector<wxString>& dates, double missing, wxSQLite3Database* db)
+    {
+        const Series::Points& points = series(key, db);
+        std::vector<double> result;
+        result.reserve(dates.size());
+        for (const auto n : Series::upper(points, dates))
+            result.push_back(n > 0 ? points[n - 1].value_ : missing);
+        return result;
+    }
+''' % (value, key, date, key_type, self._primay_key, date, value, self._table, key, date,
+                key, key_type, value, key, key_type)
+
+        s += '''
+    /** Estimated bytes held by the memory table (cache): the records, their strings, the id index and the evicted records */
+    size_t memory_usage() const
+    {
+        size_t bytes = cache_.size() * 2 * sizeof(void*) + index_by_id_.size() * (sizeof(int64) + 3 * sizeof(void*))
+            + clock_.capacity() * sizeof(int64) + evicted_.capacity() * sizeof(void*);
+        for (const auto* entity : cache_)
+            bytes += entity->memory_usage();
+        for (const auto* entity : evicted_)
+            bytes += entity->memory_usage();'''
+        if self._series:
+            s += '''
+        bytes += series_.memory_usage();'''
+        s += '''
+        return bytes;
+    }
+
+    /**
+    * Return a list of Data records (Data_Set) derived directly from the database.
+    * The Data_Set is sorted based on the column number.
+    */
+    Data_Set all(wxSQLite3Database* db, const COLUMN col = COLUMN(0), const bool asc = true)
+    {
+        DB_Op_Timer timer(this, DB_OP_ALL);
+        Data_Set result;
+        try
+        {
+            wxSQLite3Statement& stmt = statement(db, col == COLUMN(0) ? this->query() : this->query() + order_by(col, asc));
+            DB_Statement_Reset reset(stmt);
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+
+            while(q.NextRow())
+            {
+                Self::Data entity(q, this);
+                ++ timer.decoded_;
+                result.push_back(std::move(entity));
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = result.size();
+        return result;
+    }
+
+    /** Binds the value of the column of the Data record to the statement parameter */
+    static void bind_column(wxSQLite3Statement& stmt, int index, const COLUMN col, const Self::Data& entity)
+    {
+        switch(col)
+        {'''
+        for field in self._fields:
+            s += '''
+            case COL_%s: stmt.Bind(index, entity.%s); break;''' % (field['name'].upper(), field['name'])
+        s += '''
+            default: break;
+        }
+    }
+
+    /**
+    * Return one page of the Data records matching the conditions, sorted by the database.
+    * Records are ordered by the page column then by the primary key, so that
+    * keyset pagination (Page::after_, the last record of the previous page) is stable.
+    * NULLs in the page column sort first; as the Data record reads them as '' or 0,
+    * Page::after_null_ is set for the last record returned, and the keyset handles them apart:
+    * where the page crosses from the NULLs to the values (or back when descending) the records
+    * of each side are read by their own SELECT and merged in order, each of them searching the
+    * index over the column.
+    */
+    template<typename... Args>
+    Data_Set find_page(wxSQLite3Database* db, Page& page, bool op_and, const Args&... args)
+    {
+        DB_Op_Timer timer(this, DB_OP_FIND);
+        Data_Set result;
+        try
+        {
+            const bool by_id = page.col_ == COLUMN(0);
+            const wxString dir = page.asc_ ? " ASC" : " DESC";
+            wxString where;
+            if constexpr (sizeof...(Args) > 0)
+                condition(where, op_and, args...);
+            wxString sql = this->query();
+            wxString rest; // the records past the NULLs (or past the values when descending)
+            if (page.after_)
+            {
+                const wxString pk = PRIMARY::name(), name = column_to_name(page.col_), key = column_to_order(page.col_);
+                wxString keyset;
+                if (by_id)
+                    keyset = pk + (page.asc_ ? " > ?" : " < ?");
+                else if (page.after_null_)
+                {
+                    keyset = name + " IS NULL AND " + pk + (page.asc_ ? " > ?" : " < ?");
+                    if (page.asc_) rest = name + " IS NOT NULL";
+                }
+                else
+                {
+                    keyset = page.asc_
+                        ? key + " >= ? AND (" + key + " > ? OR " + pk + " > ?)"
+                        : key + " <= ? AND (" + key + " < ? OR " + pk + " < ?)";
+                    if (!page.asc_) rest = name + " IS NULL";
+                }
+                sql += " WHERE " + (where.empty() ? keyset : "(" + where + ") AND " + keyset);
+                if (!rest.empty())
+                    sql += " UNION ALL " + this->query() + " WHERE " + (where.empty() ? rest : "(" + where + ") AND " + rest);
+            }
+            else if (!where.empty())
+                sql += " WHERE " + where;
+            sql += " ORDER BY " + column_to_order(page.col_) + dir;
+            if (!by_id) sql += ", " + PRIMARY::name() + dir;
+            sql += " LIMIT ? OFFSET ?";
+
+            wxSQLite3Statement& stmt = statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            int index = 1;
+            if constexpr (sizeof...(Args) > 0)
+            {
+                bind(stmt, index, args...);
+                index += sizeof...(Args);
+            }
+            if (page.after_)
+            {
+                if (!by_id && !page.after_null_)
+                {
+                    bind_column(stmt, index++, page.col_, *page.after_);
+                    bind_column(stmt, index++, page.col_, *page.after_);
+                }
+                stmt.Bind(index++, page.after_->id());
+                if constexpr (sizeof...(Args) > 0)
+                {
+                    if (!rest.empty())
+                    {
+                        bind(stmt, index, args...);
+                        index += sizeof...(Args);
+                    }
+                }
+            }
+            stmt.Bind(index++, page.limit_);
+            stmt.Bind(index, page.offset_);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+            {
+                Self::Data entity(q, this);
+                ++ timer.decoded_;
+                page.after_null_ = q.IsNull(static_cast<int>(page.col_));
+                result.push_back(std::move(entity));
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = result.size();
+        return result;
+    }
+
+    /**
+    * Pass the Data records derived directly from the database to the visitor one at a time,
+    * sorted based on the column number, without building a Data_Set.
+    * The visitor returns false to stop the scan.
+    */
+    template<class VISITOR>
+    void each(wxSQLite3Database* db, VISITOR visitor, const COLUMN col = COLUMN(0), const bool asc = true)
+    {
+        DB_Op_Timer timer(this, DB_OP_ALL);
+        try
+        {
+            // not taken from the statement cache, the visitor may query this table again
+            wxSQLite3Statement stmt = db->PrepareStatement(col == COLUMN(0) ? this->query() : this->query() + order_by(col, asc));
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+
+            while(q.NextRow())
+            {
+                const Self::Data entity(q, this);
+                ++ timer.decoded_;
+                ++ timer.returned_;
+                if (!visitor(entity)) break;
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+    }
+'''
+        s += '''};
+
+'''
+        return str(s)
+
+def generate_base_class(header, fields=set, fingerprint='', folder='.'):
+    """Generate the base class"""
+    code = Code(header)
+    code += '''#pragma once
+
+#include <vector>
+#include <map>
+#include <unordered_map>
+#include <unordered_set>
+#include <tuple>
+#include <memory>
+#include <array>
+#include <utility>
+#include <random>
+#include <algorithm>
+#include <functional>
+#include <cwchar>
+#include <cstdint>
+#include <chrono>
+#include <mutex>
+#include <atomic>
+#include <condition_variable>
+#include <typeindex>
+#include <wx/wxsqlite3.h>
+#include <wx/intl.h>
+#include <wx/file.h>
+#if __has_include(<sqlite3mc_amalgamation.h>)
+#include <sqlite3mc_amalgamation.h>
+#elif __has_include(<sqlite3.h>)
+#include <sqlite3.h>
+#endif
+
+#include "rapidjson/document.h"
+#include "rapidjson/pointer.h"
+#include "rapidjson/prettywriter.h"
+#include "rapidjson/stringbuffer.h"
+using namespace rapidjson;
+
+#include "html_template.h"
+using namespace tmpl;
+
+typedef wxLongLong int64;
+
+class wxString;
+enum OP { EQUAL = 0, GREATER, LESS, GREATER_OR_EQUAL, LESS_OR_EQUAL, NOT_EQUAL };
+
+template<class V>
+struct DB_Column
+{
+    typedef V value_type;
+    V v_;
+    OP op_;
+    DB_Column(const V& v, OP op = EQUAL): v_(v), op_(op)
+    {}
+};
+
+/**
+* Ordering and paging for the generated find_page(): sorted by col_, at most limit_ records (-1 for all)
+* skipping offset_ records, or with after_ set, the records following that one (keyset pagination).
+* find_page() sets after_null_ when col_ is NULL in the last record it returns, so after_ is pointed
+* at that record to read the next page.
+*/
+template<class COLUMN, class DATA>
+struct DB_Page
+{
+    COLUMN col_;
+    bool asc_;
+    int limit_;
+    int offset_;
+    const DATA* after_;
+    bool after_null_;
+    DB_Page(COLUMN col = COLUMN(0), bool asc = true, int limit = -1, int offset = 0, const DATA* after = nullptr, bool after_null = false)
+        : col_(col), asc_(asc), limit_(limit), offset_(offset), after_(after), after_null_(after_null)
+    {}
+};
+
+/**
+* Slab allocator for the Data records of one table. Records are carved from slabs of SLAB
+* records and recycled through a free list, the slabs are released once no record is alive
+* (after destroy_cache() on a table whose records are all cached).
+* The pool is shared by the tables of the writer and of the DB_Reader, so it is locked.
+*/
+template<class DATA, size_t SLAB = 256>
+struct DB_Pool
+{
+    union Slot
+    {
+        Slot* next_;
+        alignas(DATA) unsigned char data_[sizeof(DATA)];
+    };
+
+    std::vector<std::unique_ptr<Slot[]>> slabs_;
+    Slot* free_ = nullptr;
+    size_t used_ = SLAB; // slots handed out from the last slab
+    size_t live_ = 0;
+    std::mutex mutex_;
+
+    /** The pool lives until the process ends, records may be deleted during static destruction */
+    static DB_Pool& instance()
+    {
+        static DB_Pool* pool = new DB_Pool();
+        return *pool;
+    }
+
+    void* allocate()
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        ++ live_;
+        if (free_)
+        {
+            Slot* slot = free_;
+            free_ = slot->next_;
+            return slot;
+        }
+        if (used_ == SLAB)
+        {
+            slabs_.emplace_back(new Slot[SLAB]);
+            used_ = 0;
+        }
+        return &slabs_.back()[used_++];
+    }
+
+    void deallocate(void* p)
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        Slot* slot = static_cast<Slot*>(p);
+        slot->next_ = free_;
+        free_ = slot;
+        if (-- live_ == 0)
+        {
+            slabs_.clear();
+            free_ = nullptr;
+            used_ = SLAB;
+        }
+    }
+
+    /** Bytes reserved by the slabs */
+    size_t capacity() const { return slabs_.size() * SLAB * sizeof(Slot); }
+};
+
+/** Bytes a string keeps on the heap, none while it fits in the string object itself */
+inline size_t db_string_heap(const wxString& s)
+{
+    static const size_t inline_capacity = wxString().capacity();
+    return s.capacity() > inline_capacity ? (s.capacity() + 1) * sizeof(wxStringCharType) : 0;
+}
+
+/** Hash for the int64 (wxLongLong) keys of the in-memory indexes */
+struct DB_Hash_Int64
+{
+    size_t operator()(const int64& v) const
+    {
+        return std::hash<wxLongLong_t>()(v.GetValue());
+    }
+};
+
+/** In-memory secondary index over the cached records of a table, kept in key order */
+template<class KEY, class DATA>
+struct DB_Index
+{
+    typedef std::multimap<KEY, DATA*> Map;
+    Map map_;
+    std::unordered_map<const DATA*, typename Map::iterator> pos_; // where each record is stored
+
+    void insert(const KEY& key, DATA* data)
+    {
+        erase(data);
+        pos_[data] = map_.emplace(key, data);
+    }
+
+    void erase(const DATA* data)
+    {
+        auto it = pos_.find(data);
+        if (it == pos_.end()) return;
+        map_.erase(it->second);
+        pos_.erase(it);
+    }
+
+    void clear()
+    {
+        map_.clear();
+        pos_.clear();
+    }
+
+    std::pair<typename Map::const_iterator, typename Map::const_iterator> equal_range(const KEY& key) const
+    {
+        return map_.equal_range(key);
+    }
+
+    size_t size() const { return map_.size(); }
+};
+
+/**
+* Date ordered values of a history table for each key (as the rates of a currency),
+* loaded a key at a time and kept up to date by the save() and remove() of the table.
+*/
+template<class KEY>
+struct DB_Series
+{
+    struct Point
+    {
+        wxString date_;
+        double value_;
+        int64 id_;
+    };
+    typedef std::vector<Point> Points;
+
+    std::map<KEY, Points> series_;
+    std::unordered_map<int64, KEY, DB_Hash_Int64> key_; // key of each loaded id
+
+    /** The points of the key, nullptr until load() */
+    const Points* find(const KEY& key) const
+    {
+        auto it = series_.find(key);
+        return it == series_.end() ? nullptr : &it->second;
+    }
+
+    /** Start the empty series of the key, to be filled by add() in date order */
+    Points& load(const KEY& key)
+    {
+        Points& points = series_[key];
+        points.clear();
+        return points;
+    }
+
+    void add(Points& points, const KEY& key, const wxString& date, double value, int64 id)
+    {
+        points.push_back({date, value, id});
+        key_[id] = key;
+    }
+
+    /** Move the saved record to its place, in the series of its key when that one is loaded */
+    void update(const KEY& key, const wxString& date, double value, int64 id)
+    {
+        erase(id);
+        auto it = series_.find(key);
+        if (it == series_.end()) return;
+        Points& points = it->second;
+        auto pos = std::upper_bound(points.begin(), points.end(), date,
+            [](const wxString& d, const Point& p) { return d < p.date_; });
+        points.insert(pos, {date, value, id});
+        key_[id] = key;
+    }
+
+    void erase(int64 id)
+    {
+        auto it = key_.find(id);
+        if (it == key_.end()) return;
+        auto series = series_.find(it->second);
+        if (series != series_.end())
+        {
+            Points& points = series->second;
+            points.erase(std::remove_if(points.begin(), points.end(),
+                [id](const Point& p) { return p.id_ == id; }), points.end());
+        }
+        key_.erase(it);
+    }
+
+    void clear()
+    {
+        series_.clear();
+        key_.clear();
+    }
+
+    /** Number of points dated on or before date, the point on or before date is the one before them */
+    static size_t upper(const Points& points, const wxString& date)
+    {
+        return std::upper_bound(points.begin(), points.end(), date,
+            [](const wxString& d, const Point& p) { return d < p.date_; }) - points.begin();
+    }
+
+    /** upper() of each of the dates, in one pass over the points once the dates are sorted */
+    static std::vector<size_t> upper(const Points& points, const std::vector<wxString>& dates)
+    {
+        std::vector<size_t> order(dates.size());
+        for (size_t i = 0; i < order.size(); ++ i) order[i] = i;
+        std::sort(order.begin(), order.end(), [&dates](size_t a, size_t b) { return dates[a] < dates[b]; });
+
+        std::vector<size_t> result(dates.size());
+        size_t n = 0;
+        for (const auto i : order)
+        {
+            while (n < points.size() && !(dates[i] < points[n].date_)) ++ n;
+            result[i] = n;
+        }
+        return result;
+    }
+
+    /** The point dated on or before date, nullptr when the series starts later */
+    static const Point* on_or_before(const Points& points, const wxString& date)
+    {
+        size_t n = upper(points, date);
+        return n > 0 ? &points[n - 1] : nullptr;
+    }
+
+    size_t memory_usage() const
+    {
+        size_t bytes = key_.size() * (sizeof(int64) + sizeof(KEY) + 2 * sizeof(void*));
+        for (const auto& [key, points] : series_)
+        {
+            bytes += sizeof(KEY) + 4 * sizeof(void*) + points.capacity() * sizeof(Point);
+            for (const auto& p : points)
+                bytes += db_string_heap(p.date_);
+        }
+        return bytes;
+    }
+};
+
+/** Resets a cached statement when leaving scope, so it holds no read lock between calls */
+struct DB_Statement_Reset
+{
+    wxSQLite3Statement& stmt_;
+    explicit DB_Statement_Reset(wxSQLite3Statement& stmt): stmt_(stmt) {}
+    ~DB_Statement_Reset()
+    {
+        try { stmt_.Reset(); } catch (const wxSQLite3Exception&) {}
+    }
+};
+
+/** Operations of the generated tables timed by DB_Op_Timer */
+enum DB_OP { DB_OP_GET = 0, DB_OP_FIND, DB_OP_ALL, DB_OP_SAVE, DB_OP_REMOVE, DB_OP_ENSURE, DB_OP_SELECT, DB_OP_size };
+
+inline const char* db_op_name(int op)
+{
+    static const char* names[DB_OP_size] = { "get", "find_by", "all", "save", "remove", "ensure", "select" };
+    return names[op];
+}
+
+/** Calls, rows and wall time of one operation, with a histogram of the latencies */
+struct DB_Op_Stats
+{
+    /** Bucket i counts the calls faster than 2^i microseconds, the last bucket all the slower ones */
+    static const size_t BUCKETS = 24;
+
+    size_t calls_ = 0;
+    size_t rows_returned_ = 0; // records handed to the caller
+    size_t rows_decoded_ = 0; // records built from a result set row
+    long long total_ns_ = 0;
+    long long max_ns_ = 0;
+    std::array<size_t, BUCKETS> histogram_ = {};
+
+    void add(long long ns, size_t returned, size_t decoded)
+    {
+        ++ calls_;
+        rows_returned_ += returned;
+        rows_decoded_ += decoded;
+        total_ns_ += ns;
+        if (ns > max_ns_) max_ns_ = ns;
+        size_t bucket = 0;
+        while (bucket < BUCKETS - 1 && (1000LL << bucket) <= ns) ++ bucket;
+        ++ histogram_[bucket];
+    }
+
+    template<typename W>
+    void as_json(W& json_writer) const
+    {
+        json_writer.StartObject();
+        json_writer.Key("calls");
+        json_writer.Uint64(calls_);
+        json_writer.Key("rows_returned");
+        json_writer.Uint64(rows_returned_);
+        json_writer.Key("rows_decoded");
+        json_writer.Uint64(rows_decoded_);
+        json_writer.Key("total_ns");
+        json_writer.Int64(total_ns_);
+        json_writer.Key("max_ns");
+        json_writer.Int64(max_ns_);
+        json_writer.Key("histogram_us");
+        json_writer.StartArray();
+        for (const auto& count : histogram_) json_writer.Uint64(count);
+        json_writer.EndArray();
+        json_writer.EndObject();
+    }
+};
+
+/**
+* Process wide recorder of the timed operations of the tables and, attached to a connection,
+* of its SQL statement timings reported through sqlite3_trace_v2.
+* The recording is saved as JSON statistics or as a Chrome trace (chrome://tracing, Perfetto).
+*/
+struct DB_Trace
+{
+    struct Event
+    {
+        wxString name_;
+        const char* cat_;
+        long long ts_ns_, dur_ns_;
+    };
+    /** Events recorded at most, the statistics keep counting afterwards */
+    static const size_t MAX_EVENTS = 1000000;
+
+    std::atomic<bool> enabled_{false}; // read by the tables of the DB_Reader from their threads
+    std::chrono::steady_clock::time_point start_ = std::chrono::steady_clock::now();
+    std::vector<Event> events_;
+    std::map<wxString, DB_Op_Stats> sql_; // statement timings keyed by their SQL
+    std::map<void*, size_t> rows_; // rows stepped by the statements still running
+    std::mutex mutex_; // guards events_, the tables of the DB_Reader record from their threads
+
+    static DB_Trace& instance()
+    {
+        static DB_Trace trace;
+        return trace;
+    }
+
+    long long now_ns() const
+    {
+        return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now() - start_).count();
+    }
+
+    void event(const wxString& name, const char* cat, long long ts_ns, long long dur_ns)
+    {
+        if (!enabled_) return;
+        std::lock_guard<std::mutex> lock(mutex_);
+        if (events_.size() < MAX_EVENTS)
+            events_.push_back({name, cat, ts_ns, dur_ns});
+    }
+
+    /** Start recording, with the statement timings of db when sqlite3_trace_v2 is available */
+    void attach(wxSQLite3Database* db)
+    {
+        enabled_ = true;
+#ifdef SQLITE_TRACE_PROFILE
+        sqlite3_trace_v2(static_cast<sqlite3*>(db->GetDatabaseHandle()), SQLITE_TRACE_PROFILE | SQLITE_TRACE_ROW, &DB_Trace::on_trace, this);
+#else
+        wxUnusedVar(db);
+#endif
+    }
+
+    /** Stop recording, must be done before the connection is closed */
+    void detach(wxSQLite3Database* db)
+    {
+        enabled_ = false;
+        rows_.clear();
+#ifdef SQLITE_TRACE_PROFILE
+        sqlite3_trace_v2(static_cast<sqlite3*>(db->GetDatabaseHandle()), 0, nullptr, nullptr);
+#else
+        wxUnusedVar(db);
+#endif
+    }
+
+#ifdef SQLITE_TRACE_PROFILE
+    static int on_trace(unsigned type, void* ctx, void* p, void* x)
+    {
+        DB_Trace* trace = static_cast<DB_Trace*>(ctx);
+        if (type == SQLITE_TRACE_ROW)
+            ++ trace->rows_[p];
+        else if (type == SQLITE_TRACE_PROFILE)
+        {
+            const long long ns = *static_cast<sqlite3_int64*>(x);
+            const wxString sql = wxString::FromUTF8(sqlite3_sql(static_cast<sqlite3_stmt*>(p)));
+            size_t rows = 0;
+            if (auto it = trace->rows_.find(p); it != trace->rows_.end())
+            {
+                rows = it->second;
+                trace->rows_.erase(it);
+            }
+            trace->sql_[sql].add(ns, rows, rows);
+            trace->event(sql, "sql", trace->now_ns() - ns, ns);
+        }
+        return 0;
+    }
+#endif
+
+    /** Return the statement timings as a json string */
+    wxString to_json() const
+    {
+        StringBuffer json_buffer;
+        PrettyWriter<StringBuffer> json_writer(json_buffer);
+        json_writer.StartObject();
+        for (const auto& [sql, stats] : sql_)
+        {
+            json_writer.Key(sql.utf8_str());
+            stats.as_json(json_writer);
+        }
+        json_writer.EndObject();
+        return wxString::FromUTF8(json_buffer.GetString());
+    }
+
+    /** Return the events in the Chrome trace event format */
+    wxString to_chrome_trace()
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        StringBuffer json_buffer;
+        Writer<StringBuffer> json_writer(json_buffer);
+        json_writer.StartObject();
+        json_writer.Key("traceEvents");
+        json_writer.StartArray();
+        for (const auto& e : events_)
+        {
+            json_writer.StartObject();
+            json_writer.Key("name");
+            json_writer.String(e.name_.utf8_str());
+            json_writer.Key("cat");
+            json_writer.String(e.cat_);
+            json_writer.Key("ph");
+            json_writer.String("X");
+            json_writer.Key("ts");
+            json_writer.Double(e.ts_ns_ / 1000.0);
+            json_writer.Key("dur");
+            json_writer.Double(e.dur_ns_ / 1000.0);
+            json_writer.Key("pid");
+            json_writer.Int(1);
+            json_writer.Key("tid");
+            json_writer.Int(1);
+            json_writer.EndObject();
+        }
+        json_writer.EndArray();
+        json_writer.EndObject();
+        return wxString::FromUTF8(json_buffer.GetString());
+    }
+
+    static bool save(const wxString& path, const wxString& json)
+    {
+        wxFile file;
+        if (!file.Create(path, true)) return false;
+        return file.Write(json, wxConvUTF8);
+    }
+};
+
+struct DB_Table
+{
+    /** Number of ids bound to each IN list of get_many() */
+    static const size_t GET_MANY_CHUNK = 500;
+
+    DB_Table(): hit_(0), miss_(0), skip_(0), stmt_hit_(0), stmt_compile_(0)
+        , max_records_(0), max_bytes_(0), resident_bytes_(0), evict_(0), stmt_db_(nullptr) {};
+    virtual ~DB_Table() {};
+    wxString query_;
+    size_t hit_, miss_, skip_;
+    size_t stmt_hit_, stmt_compile_;
+    size_t max_records_, max_bytes_; // budget of the memory table (cache), 0 for unbounded
+    size_t resident_bytes_; // estimated bytes of the records in the id index
+    size_t evict_;
+    std::array<DB_Op_Stats, DB_OP_size> op_stats_;
+    wxSQLite3Database* stmt_db_; // connection the cached statements belong to
+    std::map<wxString, wxSQLite3Statement> stmt_cache_; // prepared statements keyed by their SQL
+    virtual wxString query() const { return this->query_; }
+    virtual size_t num_columns() const = 0;
+    virtual wxString name() const = 0;
+
+    /**
+    * Return the prepared statement for sql, compiled once per connection.
+    * A cached statement is reset, the caller binds all of its parameters again.
+    */
+    wxSQLite3Statement& statement(wxSQLite3Database* db, const wxString& sql)
+    {
+        if (db != stmt_db_)
+        {
+            finalize_statements();
+            stmt_db_ = db;
+        }
+
+        auto it = stmt_cache_.find(sql);
+        if (it != stmt_cache_.end())
+        {
+            ++ stmt_hit_;
+            it->second.Reset();
+            return it->second;
+        }
+
+        ++ stmt_compile_;
+        wxSQLite3Statement stmt = db->PrepareStatement(sql);
+        return stmt_cache_.emplace(sql, stmt).first->second;
+    }
+
+    /**
+    * Bound the memory table (cache) by record count and/or estimated bytes, 0 for unbounded.
+    * The budget is enforced on the next load from the database.
+    */
+    void cache_budget(size_t max_records, size_t max_bytes = 0)
+    {
+        max_records_ = max_records;
+        max_bytes_ = max_bytes;
+    }
+
+    bool over_budget(size_t resident) const
+    {
+        return (max_records_ > 0 && resident > max_records_) || (max_bytes_ > 0 && resident_bytes_ > max_bytes_);
+    }
+
+    /** Return " WHERE column IN (?, ...)" with GET_MANY_CHUNK parameters */
+    static wxString where_in(const wxString& column)
+    {
+        wxString where = " WHERE " + column + " IN (?";
+        for (size_t i = 1; i < GET_MANY_CHUNK; ++ i) where += ", ?";
+        return where + ")";
+    }
+
+    /**
+    * Return the FTS5 query of the records holding words starting with each word of text.
+    * The words are quoted, FTS5 operators and punctuation in text are searched as they are.
+    */
+    static wxString match_query(const wxString& text)
+    {
+        wxString query, word;
+        auto add = [&]()
+        {
+            if (word.empty()) return;
+            if (!query.empty()) query += " ";
+            query += "\\"" + word + "\\"*";
+            word.clear();
+        };
+        for (const auto& c : text)
+        {
+            if (wxIsspace(c)) add();
+            else if (c == '"') word += "\\"\\"";
+            else word += c;
+        }
+        add();
+        return query;
+    }
+
+    /** Finalize the cached statements, must be done before their connection is closed */
+    void finalize_statements()
+    {
+        for (auto& [_, stmt] : stmt_cache_)
+        {
+            try { stmt.Finalize(); } catch (const wxSQLite3Exception&) {}
+        }
+        stmt_cache_.clear();
+        stmt_db_ = nullptr;
+    }
+
+    bool exists(wxSQLite3Database* db) const
+    {
+       return db->TableExists(this->name()); 
+    }
+
+    void drop(wxSQLite3Database* db) const
+    {
+        db->ExecuteUpdate("DROP TABLE IF EXISTS " + this->name());
+    }
+
+    static int64 newId()
+    {
+        return newIds(1);
+    }
+
+    /**
+    * Reserve a block of count consecutive ids and return the first one.
+    * Later ids are generated from a following millisecond, so they never fall inside the block.
+    * The last millisecond used is shared by all the tables and threads of the process.
+    */
+    static int64 newIds(size_t count)
+    {
+        static std::mutex mutex;
+        static int64 ticks_last_ = 0;
+        std::lock_guard<std::mutex> lock(mutex);
+        // Get the current time in milliseconds as wxLongLong/int64
+        int64 ticks = wxDateTime::UNow().GetValue();
+        // Ensure uniqueness from last generated value
+        if (ticks <= ticks_last_)
+            ticks = ticks_last_ + 1;
+        // Generate a random 3-digit number (0 to 999), the generator is seeded once
+        static std::mt19937 gen{std::random_device{}()};
+        std::uniform_int_distribution<int> dist(0, 999);
+        int randomSuffix = dist(gen);
+        // Combine ticks and randomSuffix
+        int64 first = (ticks * 1000) + randomSuffix;
+        ticks_last_ = (first + int64(static_cast<wxLongLong_t>(count)) - 1) / 1000;
+        return first;
+    }
+};
+
+/** Times one operation of a table, the operation counts its rows while it runs */
+struct DB_Op_Timer
+{
+    DB_Table* table_;
+    DB_OP op_;
+    size_t returned_ = 0, decoded_ = 0;
+    long long start_ns_;
+
+    DB_Op_Timer(DB_Table* table, DB_OP op): table_(table), op_(op), start_ns_(DB_Trace::instance().now_ns()) {}
+    ~DB_Op_Timer()
+    {
+        DB_Trace& trace = DB_Trace::instance();
+        const long long ns = trace.now_ns() - start_ns_;
+        table_->op_stats_[op_].add(ns, returned_, decoded_);
+        if (trace.enabled_)
+            trace.event(table_->name() + "." + db_op_name(op_), "table", start_ns_, ns);
+    }
+};
+
+/**
+* Read-only connections to the database of the writer, handed to the worker threads.
+* With the writer in WAL mode the readers neither block it nor each other; the connections are
+* opened on demand up to max_size, acquire() waits for a free one beyond.
+*/
+struct DB_Reader_Pool
+{
+    typedef std::function<wxSQLite3Database*()> Opener;
+
+    DB_Reader_Pool(const Opener& opener, size_t max_size): opener_(opener), max_size_(std::max<size_t>(max_size, 1)) {}
+    ~DB_Reader_Pool() { close(); }
+    DB_Reader_Pool(const DB_Reader_Pool&) = delete;
+    DB_Reader_Pool& operator=(const DB_Reader_Pool&) = delete;
+
+    /** Switch the journal of the writer to WAL, return false when the database does not support it (in memory) */
+    static bool enable_wal(wxSQLite3Database* writer)
+    {
+        try
+        {
+            wxSQLite3ResultSet q = writer->ExecuteQuery("PRAGMA journal_mode=WAL");
+            return q.NextRow() && q.GetAsString(0).Lower() == "wal";
+        }
+        catch(const wxSQLite3Exception &e)
+        {
+            wxLogError("DB_Reader_Pool::enable_wal: Exception %s", e.GetMessage().utf8_str());
+        }
+        return false;
+    }
+
+    /** Checkpoint and switch the journal of the writer back to DELETE, leaving a single database file */
+    static void disable_wal(wxSQLite3Database* writer)
+    {
+        try
+        {
+            // a read first, so the writer checkpoints and removes the WAL the readers may have made
+            writer->ExecuteScalar("SELECT COUNT(*) FROM sqlite_master");
+            writer->ExecuteQuery("PRAGMA journal_mode=DELETE");
+        }
+        catch(const wxSQLite3Exception &e)
+        {
+            wxLogError("DB_Reader_Pool::disable_wal: Exception %s", e.GetMessage().utf8_str());
+        }
+    }
+
+    /** Return an idle connection, opening one while below max_size, nullptr when closed or opening failed */
+    wxSQLite3Database* acquire()
+    {
+        std::unique_lock<std::mutex> lock(mutex_);
+        released_.wait(lock, [this] { return closed_ || !idle_.empty() || opened_.size() + opening_ < max_size_; });
+        if (closed_) return nullptr;
+        if (!idle_.empty())
+        {
+            wxSQLite3Database* db = idle_.back();
+            idle_.pop_back();
+            return db;
+        }
+
+        ++ opening_;
+        lock.unlock();
+        std::unique_ptr<wxSQLite3Database> db(opener_());
+        lock.lock();
+        -- opening_;
+        if (!db || closed_)
+        {
+            released_.notify_all();
+            return nullptr;
+        }
+        opened_.push_back(std::move(db));
+        return opened_.back().get();
+    }
+
+    void release(wxSQLite3Database* db)
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        idle_.push_back(db);
+        released_.notify_all();
+    }
+
+    /** Wait for the connections in use to be released and close all of them, acquire() fails from then on */
+    void close()
+    {
+        std::unique_lock<std::mutex> lock(mutex_);
+        closed_ = true;
+        released_.notify_all();
+        released_.wait(lock, [this] { return opening_ == 0 && idle_.size() == opened_.size(); });
+        for (auto& db : opened_)
         {
-            entity = this->fake_;
-            // wxLogError("%s: %d not found", this->name().utf8_str(), id);
+            try { db->Close(); } catch (const wxSQLite3Exception&) {}
         }
- 
-        return entity;
+        opened_.clear();
+        idle_.clear();
     }
-'''
-        s += '''
-    /**
-    * Return a list of Data records (Data_Set) derived directly from the database.
-    * The Data_Set is sorted based on the column number.
-    */
-    const Data_Set all(wxSQLite3Database* db, const COLUMN col = COLUMN(0), const bool asc = true)
+
+    size_t size() const { return max_size_; }
+
+private:
+    Opener opener_;
+    const size_t max_size_;
+    std::mutex mutex_;
+    std::condition_variable released_;
+    std::vector<std::unique_ptr<wxSQLite3Database>> opened_;
+    std::vector<wxSQLite3Database*> idle_;
+    size_t opening_ = 0;
+    bool closed_ = false;
+};
+
+/**
+* One snapshot of the database read through a connection of a DB_Reader_Pool, for use by a single thread.
+* The read transaction is held until the reader is destroyed, so every read sees the same committed state.
+* The shared instance() of the tables and their memory tables belong to the writer (UI) thread;
+* a reader works on tables of its own from table(), whose records live as long as the reader.
+*/
+struct DB_Reader
+{
+    explicit DB_Reader(DB_Reader_Pool& pool): pool_(pool), db_(pool.acquire())
     {
-        Data_Set result;
+        if (!db_) return;
         try
         {
-            wxSQLite3ResultSet q = db->ExecuteQuery(col == COLUMN(0) ? this->query() : this->query() + " ORDER BY " + column_to_name(col) + " COLLATE NOCASE " + (asc ? " ASC " : " DESC "));
-
-            while(q.NextRow())
-            {
-                Self::Data entity(q, this);
-                result.push_back(std::move(entity));
-            }
-
-            q.Finalize();
+            db_->Begin();
+            db_->ExecuteScalar("SELECT COUNT(*) FROM sqlite_master"); // the first read starts the snapshot
         }
-        catch(const wxSQLite3Exception &e) 
-        { 
-            wxLogError("%s: Exception %s", this->name().utf8_str(), e.GetMessage().utf8_str());
+        catch(const wxSQLite3Exception &e)
+        {
+            wxLogError("DB_Reader: Exception %s", e.GetMessage().utf8_str());
+            end();
         }
-
-        return result;
     }
-'''
-        s += '''};
-
-'''
-        return s
+    ~DB_Reader() { end(); }
+    DB_Reader(const DB_Reader&) = delete;
+    DB_Reader& operator=(const DB_Reader&) = delete;
 
-def generate_base_class(header, fields=set):
-    """Generate the base class"""
-    code = header + '''#pragma once
-
-#include <vector>
-#include <map>
-#include <random>
-#include <algorithm>
-#include <functional>
-#include <cwchar>
-#include <wx/wxsqlite3.h>
-#include <wx/intl.h>
+    /** Return false when no connection could be acquired */
+    bool ok() const { return db_ != nullptr; }
+    wxSQLite3Database* db() const { return db_; }
 
-#include "rapidjson/document.h"
-#include "rapidjson/pointer.h"
-#include "rapidjson/prettywriter.h"
-#include "rapidjson/stringbuffer.h"
-using namespace rapidjson;
+    /** Return the instance of TABLE bound to this reader, created on first use */
+    template<class TABLE>
+    TABLE& table()
+    {
+        auto& table = tables_[std::type_index(typeid(TABLE))];
+        if (!table) table.reset(new TABLE());
+        return static_cast<TABLE&>(*table);
+    }
 
-#include "html_template.h"
-using namespace tmpl;
+private:
+    void end()
+    {
+        tables_.clear(); // the cached statements are finalized with their tables
+        if (!db_) return;
+        try
+        {
+            if (!db_->GetAutoCommit()) db_->Rollback();
+        }
+        catch(const wxSQLite3Exception &e)
+        {
+            wxLogError("DB_Reader: Exception %s", e.GetMessage().utf8_str());
+        }
+        pool_.release(db_);
+        db_ = nullptr;
+    }
 
-typedef wxLongLong int64;
+    DB_Reader_Pool& pool_;
+    wxSQLite3Database* db_;
+    std::map<std::type_index, std::unique_ptr<DB_Table>> tables_;
+};
 
-class wxString;
-enum OP { EQUAL = 0, GREATER, LESS, GREATER_OR_EQUAL, LESS_OR_EQUAL, NOT_EQUAL };
+/** SHA-1 of the tables_v1.sql the tables were generated from and of the statements creating their full-text indexes and balance summaries */
+static const char DB_SCHEMA_FINGERPRINT[] = "''' + fingerprint + '''";
 
-template<class V>
-struct DB_Column
+/**
+* The schema fingerprint stored in INFOTABLE_V1 as SCHEMA_FINGERPRINT.
+* A database holding the current fingerprint has all the tables and indexes of the generated code,
+* the ensure() of every table then returns at once for that connection.
+*/
+struct DB_Schema
 {
-    V v_;
-    OP op_;
-    DB_Column(const V& v, OP op = EQUAL): v_(v), op_(op)
-    {}
-};
+    /** The connection found up to date by check() */
+    static wxSQLite3Database*& verified()
+    {
+        static wxSQLite3Database* db = nullptr;
+        return db;
+    }
 
-static int64 ticks_last_ = 0;
-    
-struct DB_Table
-{
-    DB_Table(): hit_(0), miss_(0), skip_(0) {};
-    virtual ~DB_Table() {};
-    wxString query_;
-    size_t hit_, miss_, skip_;
-    virtual wxString query() const { return this->query_; }
-    virtual size_t num_columns() const = 0;
-    virtual wxString name() const = 0;
+    /** Set by a failing ensure(), the fingerprint is not stored then */
+    static bool& failed()
+    {
+        static bool failed = false;
+        return failed;
+    }
 
-    bool exists(wxSQLite3Database* db) const
+    /** Return true when the fingerprint stored in db is current, ensure() is skipped on db from then on */
+    static bool check(wxSQLite3Database* db)
     {
-       return db->TableExists(this->name()); 
+        verified() = nullptr;
+        failed() = false;
+        try
+        {
+            if (!db->TableExists("INFOTABLE_V1")) return false;
+            wxSQLite3Statement stmt = db->PrepareStatement("SELECT INFOVALUE FROM INFOTABLE_V1 WHERE INFONAME = 'SCHEMA_FINGERPRINT'");
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            if (q.NextRow() && q.GetString(0) == DB_SCHEMA_FINGERPRINT) verified() = db;
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("INFOTABLE_V1: Exception %s", e.GetMessage().utf8_str());
+        }
+        return verified() == db;
     }
 
-    void drop(wxSQLite3Database* db) const
+    /** Store the fingerprint once the ensure() of every table succeeded */
+    static void stamp(wxSQLite3Database* db)
     {
-        db->ExecuteUpdate("DROP TABLE IF EXISTS " + this->name());
+        if (failed() || db->IsReadOnly()) return;
+        try
+        {
+            wxSQLite3Statement stmt = db->PrepareStatement("INSERT INTO INFOTABLE_V1 (INFOID, INFONAME, INFOVALUE) VALUES (?, 'SCHEMA_FINGERPRINT', ?)"
+                " ON CONFLICT(INFONAME) DO UPDATE SET INFOVALUE = excluded.INFOVALUE");
+            stmt.Bind(1, DB_Table::newId());
+            stmt.Bind(2, DB_SCHEMA_FINGERPRINT);
+            stmt.ExecuteUpdate();
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("INFOTABLE_V1: Exception %s", e.GetMessage().utf8_str());
+        }
     }
 
-    static int64 newId()
+    /** Forget the connection, before it is closed */
+    static void reset()
     {
-        // Get the current time in milliseconds as wxLongLong/int64
-        int64 ticks = wxDateTime::UNow().GetValue();
-        // Ensure uniqueness from last generated value
-        if (ticks <= ticks_last_)
-            ticks = ticks_last_ + 1;
-        ticks_last_ = ticks;
-        // Generate a random 3-digit number (0 to 999)
-        std::random_device rd;
-        std::mt19937 gen(rd());
-        std::uniform_int_distribution<int> dist(0, 999);
-        int randomSuffix = dist(gen);
-        // Combine ticks and randomSuffix
-        return (ticks * 1000) + randomSuffix;
+        verified() = nullptr;
     }
 };
 
@@ -984,14 +3273,16 @@ void bind(wxSQLite3Statement& stmt, int index, const Arg1& arg1, const Args&...
 }
 
 template<typename TABLE, typename... Args>
-const typename TABLE::Data_Set find_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+typename TABLE::Data_Set find_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
 {
+    DB_Op_Timer timer(table, DB_OP_FIND);
     typename TABLE::Data_Set result;
     try
     {
         wxString query = table->query() + " WHERE ";
         condition(query, op_and, args...);
-        wxSQLite3Statement stmt = db->PrepareStatement(query);
+        wxSQLite3Statement& stmt = table->statement(db, query);
+        DB_Statement_Reset reset(stmt);
         bind(stmt, 1, args...);
 
         wxSQLite3ResultSet q = stmt.ExecuteQuery();
@@ -999,19 +3290,295 @@ const typename TABLE::Data_Set find_by(TABLE* table, wxSQLite3Database* db, bool
         while(q.NextRow())
         {
             typename TABLE::Data entity(q, table);
+            ++ timer.decoded_;
             result.push_back(std::move(entity));
         }
-
-        q.Finalize();
     }
     catch(const wxSQLite3Exception &e) 
     { 
         wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
     }
  
+    timer.returned_ = result.size();
     return result;
 }
 
+/**
+* Pass the Data records matching the conditions to the visitor one at a time,
+* without building a Data_Set. The visitor returns false to stop the scan.
+*/
+template<typename TABLE, typename VISITOR, typename... Args>
+void find_by_each(TABLE* table, wxSQLite3Database* db, bool op_and, VISITOR visitor, const Args&... args)
+{
+    DB_Op_Timer timer(table, DB_OP_FIND);
+    try
+    {
+        wxString query = table->query() + " WHERE ";
+        condition(query, op_and, args...);
+        // not taken from the statement cache, the visitor may query this table again
+        wxSQLite3Statement stmt = db->PrepareStatement(query);
+        bind(stmt, 1, args...);
+
+        wxSQLite3ResultSet q = stmt.ExecuteQuery();
+
+        while(q.NextRow())
+        {
+            const typename TABLE::Data entity(q, table);
+            ++ timer.decoded_;
+            ++ timer.returned_;
+            if (!visitor(entity)) break;
+        }
+    }
+    catch(const wxSQLite3Exception &e) 
+    { 
+        wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+    }
+}
+
+inline void db_value(wxSQLite3ResultSet& q, int index, int64& v) { v = q.GetInt64(index); }
+inline void db_value(wxSQLite3ResultSet& q, int index, double& v) { v = q.GetDouble(index); }
+inline void db_value(wxSQLite3ResultSet& q, int index, wxString& v) { v = q.GetString(index); }
+
+/**
+* Partial records holding only the columns COLS, in the order given.
+* Only those columns are selected and decoded, each row is a std::tuple of their values.
+* Example: DB_Projection<TRANSID, TRANSAMOUNT>::find(table, db, true, ACCOUNTID(id))
+* produces SQL statement: SELECT TRANSID, TRANSAMOUNT FROM CHECKINGACCOUNT_V1 WHERE ACCOUNTID = ?
+*/
+template<class... COLS>
+struct DB_Projection
+{
+    typedef std::tuple<typename COLS::value_type...> Row;
+    typedef std::vector<Row> Row_Set;
+
+    template<class TABLE>
+    static wxString query(const TABLE* table)
+    {
+        wxString columns;
+        ((columns += (columns.empty() ? "" : ", ") + COLS::name()), ...);
+        return "SELECT " + columns + " FROM " + table->name() + " ";
+    }
+
+    template<size_t... I>
+    static void read(wxSQLite3ResultSet& q, Row& row, std::index_sequence<I...>)
+    {
+        (db_value(q, static_cast<int>(I), std::get<I>(row)), ...);
+    }
+
+    static Row row(wxSQLite3ResultSet& q)
+    {
+        Row row;
+        read(q, row, std::index_sequence_for<COLS...>());
+        return row;
+    }
+
+    /** Return the projection of all records of the table */
+    template<class TABLE>
+    static Row_Set all(TABLE* table, wxSQLite3Database* db)
+    {
+        DB_Op_Timer timer(table, DB_OP_SELECT);
+        Row_Set result;
+        try
+        {
+            wxSQLite3Statement& stmt = table->statement(db, query(table));
+            DB_Statement_Reset reset(stmt);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+                result.push_back(row(q));
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = timer.decoded_ = result.size();
+        return result;
+    }
+
+    /** Return the projection of the records matching the conditions */
+    template<class TABLE, typename... Args>
+    static Row_Set find(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+    {
+        DB_Op_Timer timer(table, DB_OP_SELECT);
+        Row_Set result;
+        try
+        {
+            wxString sql = query(table) + " WHERE ";
+            condition(sql, op_and, args...);
+            wxSQLite3Statement& stmt = table->statement(db, sql);
+            DB_Statement_Reset reset(stmt);
+            bind(stmt, 1, args...);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+                result.push_back(row(q));
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = timer.decoded_ = result.size();
+        return result;
+    }
+};
+
+/** Return "SELECT select FROM table [WHERE conditions] [GROUP BY group]" */
+template<typename TABLE, typename... Args>
+wxString aggregate_query(const TABLE* table, const wxString& select, const wxString& group, bool op_and, const Args&... args)
+{
+    wxString query = "SELECT " + select + " FROM " + table->name();
+    if constexpr (sizeof...(Args) > 0)
+    {
+        query += " WHERE ";
+        condition(query, op_and, args...);
+    }
+    if (!group.empty()) query += " GROUP BY " + group;
+    return query;
+}
+
+/** Return the single value of the aggregate expression over the records matching the conditions (all records without) */
+template<typename V, typename TABLE, typename... Args>
+V aggregate_by(TABLE* table, wxSQLite3Database* db, const wxString& expression, bool op_and, const Args&... args)
+{
+    DB_Op_Timer timer(table, DB_OP_SELECT);
+    V value = V();
+    try
+    {
+        wxSQLite3Statement& stmt = table->statement(db, aggregate_query(table, expression, "", op_and, args...));
+        DB_Statement_Reset reset(stmt);
+        if constexpr (sizeof...(Args) > 0)
+            bind(stmt, 1, args...);
+
+        wxSQLite3ResultSet q = stmt.ExecuteQuery();
+        if (q.NextRow())
+        {
+            db_value(q, 0, value);
+            timer.returned_ = timer.decoded_ = 1;
+        }
+    }
+    catch(const wxSQLite3Exception &e) 
+    { 
+        wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+    }
+
+    return value;
+}
+
+/** Return the number of records matching the conditions */
+template<typename TABLE, typename... Args>
+int64 count_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+{
+    return aggregate_by<int64>(table, db, "COUNT(*)", op_and, args...);
+}
+
+/** Return the sum of the column over the records matching the conditions, 0 when none */
+template<class COL, typename TABLE, typename... Args>
+double sum_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+{
+    return aggregate_by<double>(table, db, "TOTAL(" + COL::name() + ")", op_and, args...);
+}
+
+/** Return the smallest value of the column over the records matching the conditions */
+template<class COL, typename TABLE, typename... Args>
+typename COL::value_type min_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+{
+    return aggregate_by<typename COL::value_type>(table, db, "MIN(" + COL::name() + ")", op_and, args...);
+}
+
+/** Return the largest value of the column over the records matching the conditions */
+template<class COL, typename TABLE, typename... Args>
+typename COL::value_type max_by(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+{
+    return aggregate_by<typename COL::value_type>(table, db, "MAX(" + COL::name() + ")", op_and, args...);
+}
+
+/**
+* Aggregates per group of records sharing the values of the columns GROUPS (GROUP BY).
+* Example: DB_Group<ACCOUNTID>::sum<TRANSAMOUNT>(table, db, true, TRANSCODE("Deposit"))
+* produces SQL statement: SELECT ACCOUNTID, TOTAL(TRANSAMOUNT) FROM CHECKINGACCOUNT_V1 WHERE TRANSCODE = ? GROUP BY ACCOUNTID
+*/
+template<class... GROUPS>
+struct DB_Group
+{
+    typedef std::tuple<typename GROUPS::value_type...> Key;
+
+    static wxString columns()
+    {
+        wxString columns;
+        ((columns += (columns.empty() ? "" : ", ") + GROUPS::name()), ...);
+        return columns;
+    }
+
+    template<size_t... I>
+    static Key key(wxSQLite3ResultSet& q, std::index_sequence<I...>)
+    {
+        Key key;
+        (db_value(q, static_cast<int>(I), std::get<I>(key)), ...);
+        return key;
+    }
+
+    /** Return the number of records per group */
+    template<class TABLE, typename... Args>
+    static std::map<Key, int64> count(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+    {
+        DB_Op_Timer timer(table, DB_OP_SELECT);
+        std::map<Key, int64> result;
+        try
+        {
+            wxSQLite3Statement& stmt = table->statement(db, aggregate_query(table, columns() + ", COUNT(*)", columns(), op_and, args...));
+            DB_Statement_Reset reset(stmt);
+            if constexpr (sizeof...(Args) > 0)
+                bind(stmt, 1, args...);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+                result[key(q, std::index_sequence_for<GROUPS...>())] += q.GetInt64(sizeof...(GROUPS));
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = timer.decoded_ = result.size();
+        return result;
+    }
+
+    /** Return the sums of the columns COLS per group, in the order of COLS */
+    template<class... COLS, class TABLE, typename... Args>
+    static std::map<Key, std::array<double, sizeof...(COLS)>> sum(TABLE* table, wxSQLite3Database* db, bool op_and, const Args&... args)
+    {
+        DB_Op_Timer timer(table, DB_OP_SELECT);
+        std::map<Key, std::array<double, sizeof...(COLS)>> result;
+        try
+        {
+            wxString sums;
+            ((sums += ", TOTAL(" + COLS::name() + ")"), ...);
+            wxSQLite3Statement& stmt = table->statement(db, aggregate_query(table, columns() + sums, columns(), op_and, args...));
+            DB_Statement_Reset reset(stmt);
+            if constexpr (sizeof...(Args) > 0)
+                bind(stmt, 1, args...);
+
+            wxSQLite3ResultSet q = stmt.ExecuteQuery();
+            while(q.NextRow())
+            {
+                // keys read alike (a NULL and an empty text) add up in the same group
+                auto& total = result.emplace(key(q, std::index_sequence_for<GROUPS...>()), std::array<double, sizeof...(COLS)>()).first->second;
+                for (size_t i = 0; i < sizeof...(COLS); ++ i)
+                    total[i] += q.GetDouble(static_cast<int>(sizeof...(GROUPS) + i));
+            }
+        }
+        catch(const wxSQLite3Exception &e) 
+        { 
+            wxLogError("%s: Exception %s", table->name().utf8_str(), e.GetMessage().utf8_str());
+        }
+
+        timer.returned_ = timer.decoded_ = result.size();
+        return result;
+    }
+};
+
 template<class DATA, typename Arg1>
 bool match(const DATA* data, const Arg1& arg1)
 {
@@ -1049,9 +3616,7 @@ struct SorterBy%s
 };
 ''' % (field, transl, field, transl, field)
 
-    rfp = open('DB_Table.h', 'w')
-    rfp.write(code)
-    rfp.close()
+    write_if_changed(os.path.join(folder, 'DB_Table.h'), str(code))
 
 if __name__ == '__main__':
     header = '''// -*- C++ -*-
@@ -1068,15 +3633,17 @@ if __name__ == '__main__':
  *      @brief
  *
  *      Revision History:
- *          AUTO GENERATED at %s.
+ *          AUTO GENERATED from %s.
  *          DO NOT EDIT!
  */
 //=============================================================================
-'''% (datetime.date.today().year, os.path.basename(__file__), str(datetime.datetime.now()))
+'''
 
     conn, cur, sql_file = None, None, None
     try:
         sql_file = sys.argv[1]
+        folder = sys.argv[2] if len(sys.argv) > 2 else '.'
+        header = header % (generation_year(), os.path.basename(__file__), os.path.basename(sql_file))
         conn = sqlite3.connect(":memory:")
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
@@ -1084,44 +3651,53 @@ if __name__ == '__main__':
         print (__doc__)
         sys.exit(1)
 
-    sql = ""
-    sql_txt = '''-- NOTE:
+    sql = Code()
+    sql_txt = Code('''-- NOTE:
 -- This file has been AUTO GENERATED from database/tables_v1.sql
 -- All translation identifers "_tr_" have been removed.
 -- This file can be used to manually generate a database.
 
-'''
+''')
 
     for line_bytes in open(sql_file, 'rb'):
         line = line_bytes.decode('utf-8)')
-        sql = sql + line
+        sql += line
 
         if line.find('_tr_') > 0: # Remove _tr_ identifyer for wxTRANSLATE
             line = line.replace('_tr_', '')
 
-        sql_txt = sql_txt + line
+        sql_txt += line
     
     # Generate a table that does not contain translation code identifyer
     print ('Generate SQL file: %s that can generate a clean database.' % sql_tables_data_filename)
-    file_data = codecs.open(sql_tables_data_filename, 'w', 'utf-8')
-    file_data.write(sql_txt)
-    file_data.close()
+    write_if_changed(os.path.join(folder, sql_tables_data_filename), str(sql_txt))
 
+    sql = str(sql)
+    schema = sql
     cur.executescript(sql)
 
     all_fields = set()
-    for table, sql in get_table_list(cur):
+    tables = get_table_list(cur)
+    parent_keys = get_parent_keys(cur, tables)
+    for table, sql in tables:
         fields = get_table_info(cur, table)
         index = get_index_list(cur, table)
         data = get_data_initializer_list(cur, table)
-        table = DB_Table(table, fields, index, data)
-        table.generate_class(header, sql)
+        table = DB_Table(table, fields, index, data, parent_keys[table])
+        table.generate_class(header, sql, folder)
+        # the statements ensure() runs are part of the schema as well
+        if table._fts:
+            schema += ''.join(fts_sql(table._table, table._primay_key, table._fts))
+        if table._balance:
+            create, fill, verify = balance_sql(table._table, table._balance)
+            schema += ''.join(create + fill) + verify
         table.generate_unicode_currency_upgrade_patch()
         table.generate_currency_upgrade_patch()
         for field in fields:
             all_fields.add(field['name'])
 
-    generate_base_class(header, all_fields)
+    fingerprint = hashlib.sha1(schema.encode('utf-8')).hexdigest()
+    generate_base_class(header, all_fields, fingerprint, folder)
 
     conn.close()
     print ('End of Run')
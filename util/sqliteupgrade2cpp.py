@@ -1,15 +1,18 @@
 #!/usr/bin/env python
 # vi:tabstop=4:expandtab:shiftwidth=4:softtabstop=4:autoindent:smarttab
 '''
-Usage: python sqliteupgrade2cpp.py path_to_database_folder
+Usage: python sqliteupgrade2cpp.py path_to_database_folder [output_folder]
+
+DB_Upgrade.h is only written when its content changed.
 '''
 
-import datetime
 import os
 import sys
 import re
 import glob
 
+from sqlite2cpp import write_if_changed, generation_year
+
 numbers = re.compile(r'(\d+)')
 def numericalSort(value):
     parts = numbers.split(value)
@@ -36,11 +39,11 @@ StrHeader = '''//===============================================================
  *      @brief
  *
  *      Revision History:
- *          AUTO GENERATED at %s.
+ *          AUTO GENERATED from %s.
  *          DO NOT EDIT!
  */
 //=============================================================================
-'''% (datetime.date.today().year, os.path.basename(__file__), str(datetime.datetime.now()))
+'''% (generation_year(), os.path.basename(__file__), 'database_version_*.sql')
 
 StrHeader += '''
 #ifndef DB_UPGRADE_H_
@@ -50,25 +53,25 @@ StrHeader += '''
 #include <wx/string.h>
 '''
 
-StrUpgradeQuery = '''
+StrUpgradeQuery = ['''
 const std::vector<wxString> dbUpgradeQuery =
 {
-'''
+''']
 
 LatestVersion = 0
 folder = sys.argv[1]
 for sqlfile in sorted(glob.glob(os.path.join(folder, 'database_version_*.sql')), key=numericalSort):
     FileContent = getFileContent(sqlfile).replace('\n','\n        ')
     LatestVersion = getVersion(sqlfile)
-    StrUpgradeQuery += '''    // Upgrade to version %i
+    StrUpgradeQuery.append('''    // Upgrade to version %i
     R"(
         %s
     )",
 
-'''% (LatestVersion, FileContent)
+'''% (LatestVersion, FileContent))
 
-StrUpgradeQuery += '''};
-'''
+StrUpgradeQuery.append('''};
+''')
 
 StrLatestVersion = '''
 const int dbLatestVersion = %i;
@@ -78,6 +81,5 @@ strEnd = '''
 #endif // DB_UPGRADE_H_
 '''
 
-fp = open('DB_Upgrade.h', 'w')
-fp.write(StrHeader + StrLatestVersion + StrUpgradeQuery + strEnd)
-fp.close
\ No newline at end of file
+output = sys.argv[2] if len(sys.argv) > 2 else '.'
+write_if_changed(os.path.join(output, 'DB_Upgrade.h'), StrHeader + StrLatestVersion + ''.join(StrUpgradeQuery) + strEnd)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# vi:tabstop=4:expandtab:shiftwidth=4:softtabstop=4:autoindent:smarttab
+'''
+Usage: python stress_readers.py [options] database
+
+Run report like queries from 1, 2, 4 ... --max-readers readers at once, each on
+its own read-only connection of a database in WAL mode, as DB_Reader_Pool does
+for the worker threads, and report the queries/s and the speedup over a single
+reader. The database is switched to WAL for the run and back to DELETE after it.
+
+Every reader runs its queries inside one read transaction (a DB_Reader) and
+checks that the transactions count and total read before and after them are
+the same, which holds only when the reader works on a snapshot. With --writer
+a transaction is inserted and removed again on the read-write connection while
+the readers run, so the database ends up unchanged.
+
+Queries:
+    flows     the flows of every account summed from the transactions
+    payees    the 20 payees with the largest total
+    months    the total of every month
+
+The readers are threads (sqlite releases the GIL while it runs a statement)
+or, with --processes, processes.
+
+Examples:
+    python stress_readers.py bench_1m.mmb
+    python stress_readers.py --writer --max-readers 8 --seconds 5 bench_1m.mmb
+'''
+
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+queries = (
+    ('flows', "SELECT ACCOUNTID, TOTAL(CASE WHEN TRANSCODE = 'Deposit' THEN TRANSAMOUNT ELSE -TRANSAMOUNT END)"
+              " FROM CHECKINGACCOUNT_V1 WHERE DELETEDTIME IS NULL OR DELETEDTIME = '' GROUP BY ACCOUNTID"),
+    ('payees', "SELECT p.PAYEENAME, COUNT(*), TOTAL(c.TRANSAMOUNT) FROM CHECKINGACCOUNT_V1 c"
+               " JOIN PAYEE_V1 p ON p.PAYEEID = c.PAYEEID GROUP BY c.PAYEEID ORDER BY 3 DESC LIMIT 20"),
+    ('months', "SELECT SUBSTR(TRANSDATE, 1, 7), TOTAL(TRANSAMOUNT) FROM CHECKINGACCOUNT_V1 GROUP BY 1"),
+)
+
+snapshot_sql = 'SELECT COUNT(*), TOTAL(TRANSAMOUNT) FROM CHECKINGACCOUNT_V1'
+
+def connect_read_only(path):
+    conn = sqlite3.connect('file:%s?mode=ro' % path, uri=True, isolation_level=None, check_same_thread=False)
+    conn.execute('PRAGMA busy_timeout = 2000')
+    return conn
+
+def read(path, seconds):
+    """Run the queries in read transactions for seconds, returning (queries, snapshot mismatches)"""
+    conn = connect_read_only(path)
+    done = mismatches = 0
+    stop = time.perf_counter() + seconds
+    while time.perf_counter() < stop:
+        conn.execute('BEGIN')
+        before = conn.execute(snapshot_sql).fetchone()
+        for _, sql in queries:
+            conn.execute(sql).fetchall()
+            done += 1
+        if conn.execute(snapshot_sql).fetchone() != before:
+            mismatches += 1
+        conn.execute('COMMIT')
+    conn.close()
+    return done, mismatches
+
+def write(path, stop, counts):
+    """Insert a copy of a transaction and remove it again until stop is set"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute('PRAGMA busy_timeout = 2000')
+    columns = [c[1] for c in conn.execute('PRAGMA table_info(CHECKINGACCOUNT_V1)') if not c[5]]
+    insert = 'INSERT INTO CHECKINGACCOUNT_V1 (%s) SELECT %s FROM CHECKINGACCOUNT_V1 LIMIT 1' \
+        % (', '.join(columns), ', '.join(columns))
+    while not stop.is_set():
+        rowid = conn.execute(insert).lastrowid
+        conn.execute('DELETE FROM CHECKINGACCOUNT_V1 WHERE TRANSID = ?', (rowid,))
+        counts[0] += 2
+    conn.close()
+
+def run_threads(path, readers, seconds):
+    results = [None] * readers
+    def reader(i):
+        results[i] = read(path, seconds)
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+def run_processes(path, readers, seconds):
+    with multiprocessing.Pool(readers) as pool:
+        return pool.starmap(read, [(path, seconds)] * readers)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('database', help='database to read, e.g. made by fake.py')
+    parser.add_argument('--max-readers', type=int, default=os.cpu_count() or 1,
+                        help='largest number of readers at once (default: %(default)s)')
+    parser.add_argument('--seconds', type=float, default=3.0, help='run time of each step (default: %(default)s)')
+    parser.add_argument('--writer', action='store_true', help='insert and remove transactions while reading')
+    parser.add_argument('--processes', action='store_true', help='readers are processes instead of threads')
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args(sys.argv[1:])
+    if not os.path.isfile(args.database):
+        sys.exit('%s: no such database' % args.database)
+
+    path = os.path.abspath(args.database)
+    writer_conn = sqlite3.connect(path, isolation_level=None)
+    journal = writer_conn.execute('PRAGMA journal_mode').fetchone()[0]
+    if writer_conn.execute('PRAGMA journal_mode = WAL').fetchone()[0].lower() != 'wal':
+        sys.exit('%s: WAL mode is not available' % args.database)
+
+    steps = []
+    readers = 1
+    while readers < args.max_readers:
+        steps.append(readers)
+        readers *= 2
+    steps.append(args.max_readers)
+
+    failed = False
+    base = None
+    try:
+        for readers in steps:
+            stop = threading.Event()
+            writes = [0]
+            writer = threading.Thread(target=write, args=(path, stop, writes)) if args.writer else None
+            if writer:
+                writer.start()
+            start = time.perf_counter()
+            results = (run_processes if args.processes else run_threads)(path, readers, args.seconds)
+            elapsed = time.perf_counter() - start
+            if writer:
+                stop.set()
+                writer.join()
+            done = sum(r[0] for r in results)
+            mismatches = sum(r[1] for r in results)
+            rate = done / elapsed
+            base = base or rate
+            print('%3d readers %10.1f queries/s  speedup %5.2f  writes/s %8.1f  snapshot mismatches %d'
+                  % (readers, rate, rate / base, writes[0] / elapsed, mismatches))
+            failed = failed or mismatches > 0
+    finally:
+        # a read first, the connection then checkpoints and removes the WAL made by the readers
+        writer_conn.execute(snapshot_sql).fetchone()
+        writer_conn.execute('PRAGMA journal_mode = %s' % journal)
+        writer_conn.close()
+    sys.exit(1 if failed else 0)